@@ -0,0 +1,315 @@
+"""
+Two-tier cache for audio snippet lookups.
+
+L1 is a small in-process LRU with a short TTL; L2 is the shared Django cache
+(``settings.AUDIO_CACHE_ALIAS``). Misses are cached too, as the ``MISSING``
+sentinel, so languages without recordings (the common case for nah/maz/que)
+are served from cache instead of querying every time.
+
+Concurrent misses for the same key are collapsed: threads in one process
+wait on a per-key lock, and processes sharing L2 elect a single loader with
+``cache.add()`` while the others poll briefly for its result.
+
+Keys can be grouped into namespaces (one per content object) carrying a
+generation number: callers embed ``generation(namespace)`` in their keys and
+``bump(namespace)`` invalidates every key of the namespace at once, including
+cached misses, without knowing which keys exist.
+
+Invalidations are broadcast to the other processes' L1 through the shared
+cache itself: ``delete()`` and ``bump()`` append the key to a numbered log
+(``audio_bus:<n>``) and every process replays new log entries at most once
+per ``AUDIO_L1_SYNC_INTERVAL``. This only needs get/set/incr, so it works the
+same on Redis and on the file/database stand-ins.
+
+Usage:
+    from audio.cache import audio_cache
+
+    snippet = audio_cache.get_or_load(key, lambda: AudioSnippet.objects.filter(...).first())
+    audio_cache.stats()   # {'l1_hits': ..., 'l2_hits': ..., 'misses': ..., ...}
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Stored in both tiers for "looked up, nothing there". A plain string so it
+# survives pickling by any cache backend.
+MISSING = '__audio_cache_missing__'
+
+_ABSENT = object()
+
+BUS_SEQ_KEY = 'audio_bus:seq'
+# Replaying more than this many invalidations is slower than starting cold
+BUS_MAX_REPLAY = 500
+
+
+class LocalLRUCache:
+    """Thread-safe LRU with per-entry expiry, used as the per-process L1."""
+
+    def __init__(self, maxsize=2048, ttl=30, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_ABSENT):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= self.clock():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class AudioCache:
+    """
+    L1 (process) + L2 (shared) read-through cache with negative entries.
+
+    Args:
+        alias: Django cache alias used as L2.
+        timeout: L2 timeout in seconds.
+        l1_size: Maximum L1 entries.
+        l1_ttl: L1 entry lifetime in seconds; bounds how stale another
+            process's L1 can be after an invalidation.
+        lock_timeout: Lifetime of the cross-process loader lock.
+        lock_wait: How long a non-loading process polls L2 before loading
+            anyway.
+        sync_interval: Minimum seconds between checks of the invalidation log.
+    """
+
+    COUNTERS = ('l1_hits', 'l2_hits', 'misses', 'negative_hits', 'loads', 'coalesced')
+
+    def __init__(self, alias=None, timeout=None, l1_size=None, l1_ttl=None,
+                 lock_timeout=5, lock_wait=0.5, sync_interval=None):
+        self.alias = alias or getattr(settings, 'AUDIO_CACHE_ALIAS', 'default')
+        self.timeout = timeout if timeout is not None else settings.AUDIO_CACHE_TIMEOUT
+        self.local = LocalLRUCache(
+            maxsize=l1_size or getattr(settings, 'AUDIO_L1_CACHE_SIZE', 2048),
+            ttl=l1_ttl if l1_ttl is not None else getattr(settings, 'AUDIO_L1_CACHE_TTL', 30),
+        )
+        self.lock_timeout = lock_timeout
+        self.lock_wait = lock_wait
+        self._counters = dict.fromkeys(self.COUNTERS, 0)
+        self._counter_lock = threading.Lock()
+        self._key_locks = {}
+        self._key_locks_guard = threading.Lock()
+        self.sync_interval = (
+            sync_interval if sync_interval is not None
+            else getattr(settings, 'AUDIO_L1_SYNC_INTERVAL', 1)
+        )
+        # Invalidations live in the log long enough for every process to see them
+        self.bus_ttl = max(60, self.local.ttl * 2)
+        self._bus_seen = None
+        self._next_sync = 0
+        self._sync_lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _count(self, name, value=None):
+        with self._counter_lock:
+            self._counters[name] += 1
+        if value == MISSING:
+            with self._counter_lock:
+                self._counters['negative_hits'] += 1
+
+    def _lookup(self, key):
+        value = self.local.get(key)
+        if value is not _ABSENT:
+            self._count('l1_hits', value)
+            return value
+        value = self.shared.get(key, _ABSENT)
+        if value is not _ABSENT:
+            self.local.set(key, value)
+            self._count('l2_hits', value)
+            return value
+        return _ABSENT
+
+    def _key_lock(self, key):
+        with self._key_locks_guard:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = [threading.Lock(), 0]
+            lock[1] += 1
+            return lock
+
+    def _release_key_lock(self, key, lock):
+        with self._key_locks_guard:
+            lock[1] -= 1
+            if lock[1] == 0:
+                self._key_locks.pop(key, None)
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for ``key``, calling ``loader()`` on a miss.
+
+        ``loader`` returning None is cached as a negative entry; callers
+        always get None back for it.
+        """
+        self.sync()
+        value = self._lookup(key)
+        if value is not _ABSENT:
+            return None if value == MISSING else value
+
+        lock = self._key_lock(key)
+        try:
+            with lock[0]:
+                # Another thread may have loaded it while we waited
+                value = self._lookup(key)
+                if value is not _ABSENT:
+                    self._count('coalesced')
+                    return None if value == MISSING else value
+                self._count('misses')
+                value = self._load_once(key, loader)
+        finally:
+            self._release_key_lock(key, lock)
+        return None if value == MISSING else value
+
+    def _load_once(self, key, loader):
+        """Load across processes: one process loads, the others wait for L2."""
+        lock_key = f'{key}:loading'
+        shared = self.shared
+        acquired = shared.add(lock_key, 1, self.lock_timeout)
+        if not acquired:
+            deadline = time.monotonic() + self.lock_wait
+            while time.monotonic() < deadline:
+                time.sleep(0.02)
+                value = shared.get(key, _ABSENT)
+                if value is not _ABSENT:
+                    self.local.set(key, value)
+                    self._count('coalesced')
+                    return value
+        try:
+            loaded = loader()
+            value = MISSING if loaded is None else loaded
+            self._count('loads')
+            shared.set(key, value, self.timeout)
+            self.local.set(key, value)
+            return value
+        finally:
+            if acquired:
+                shared.delete(lock_key)
+
+    def set(self, key, value):
+        """Store ``value`` in both tiers (None is stored as a cached miss)."""
+        value = MISSING if value is None else value
+        self.shared.set(key, value, self.timeout)
+        self.local.set(key, value)
+
+    def delete(self, key):
+        self.local.delete(key)
+        self.shared.delete(key)
+        self.publish(key)
+
+    def generation(self, namespace):
+        """Current generation of ``namespace``, creating it if needed."""
+        self.sync()
+        gen_key = f'audio_gen:{namespace}'
+        value = self.local.get(gen_key)
+        if value is not _ABSENT:
+            return value
+        shared = self.shared
+        value = shared.get(gen_key)
+        if value is None:
+            # Seed from the clock rather than 1 so a counter that was evicted
+            # never comes back at a generation whose keys are still cached
+            shared.add(gen_key, time.time_ns() // 1000, None)
+            value = shared.get(gen_key)
+        self.local.set(gen_key, value)
+        return value
+
+    def bump(self, namespace):
+        """Invalidate every key built with the namespace's current generation."""
+        gen_key = f'audio_gen:{namespace}'
+        shared = self.shared
+        try:
+            value = shared.incr(gen_key)
+        except ValueError:
+            value = time.time_ns() // 1000
+            shared.set(gen_key, value, None)
+        self.local.set(gen_key, value)
+        self.publish(gen_key)
+        return value
+
+    def publish(self, key):
+        """Tell other processes to drop ``key`` from their L1."""
+        shared = self.shared
+        try:
+            seq = shared.incr(BUS_SEQ_KEY)
+        except ValueError:
+            seq = 1 if shared.add(BUS_SEQ_KEY, 1, None) else shared.incr(BUS_SEQ_KEY)
+        shared.set(f'audio_bus:{seq}', key, self.bus_ttl)
+
+    def sync(self, force=False):
+        """Replay invalidations published since the last sync into L1."""
+        now = time.monotonic()
+        if not force and now < self._next_sync:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_sync = now + self.sync_interval
+            seq = self.shared.get(BUS_SEQ_KEY, 0)
+            seen, self._bus_seen = self._bus_seen, seq
+            if seen is None or seq == seen:
+                return
+            if seq < seen or seq - seen > BUS_MAX_REPLAY:
+                # Log was reset (evicted) or we fell too far behind
+                self.local.clear()
+                return
+            log_keys = [f'audio_bus:{n}' for n in range(seen + 1, seq + 1)]
+            messages = self.shared.get_many(log_keys)
+            if len(messages) < len(log_keys):
+                # Some entries expired before we read them
+                self.local.clear()
+                return
+            for key in messages.values():
+                self.local.delete(key)
+        finally:
+            self._sync_lock.release()
+
+    def clear_local(self):
+        self.local.clear()
+
+    def stats(self):
+        """Counters since process start plus derived hit ratio."""
+        with self._counter_lock:
+            data = dict(self._counters)
+        lookups = data['l1_hits'] + data['l2_hits'] + data['misses']
+        data['hit_ratio'] = round((data['l1_hits'] + data['l2_hits']) / lookups, 4) if lookups else 0.0
+        data['l1_size'] = len(self.local)
+        return data
+
+    def reset_stats(self):
+        with self._counter_lock:
+            self._counters = dict.fromkeys(self.COUNTERS, 0)
+
+
+audio_cache = AudioCache()
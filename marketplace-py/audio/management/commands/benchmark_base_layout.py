@@ -0,0 +1,73 @@
+"""
+Management command to measure base layout render time with and without
+fragment caching of the navigation/audio chrome.
+"""
+import statistics
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from audio.cache import audio_cache
+
+
+class Command(BaseCommand):
+    help = 'Benchmark rendering templates/base.html with fragment caching off and on'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Renders per measurement (default: 200)',
+        )
+        parser.add_argument(
+            '--language',
+            default='es',
+            help='UI language to render in (default: es)',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        factory = RequestFactory()
+
+        def render():
+            request = factory.get('/')
+            request.user = AnonymousUser()
+            request.LANGUAGE_CODE = options['language']
+            return render_to_string('base.html', request=request)
+
+        def measure():
+            cache.clear()
+            audio_cache.clear_local()
+            render()  # warm template loaders and the audio cache
+            timings = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    render()
+                    timings.append((time.perf_counter() - start) * 1000)
+            return timings, len(queries) / iterations
+
+        # A timeout of 0 makes every {% cache %} block render as if uncached
+        with override_settings(FRAGMENT_CACHE_TIMEOUT=0):
+            before, before_queries = measure()
+        after, after_queries = measure()
+
+        for label, timings, queries in (
+            ('without fragment cache', before, before_queries),
+            ('with fragment cache', after, after_queries),
+        ):
+            self.stdout.write(
+                f'{label:>24}: mean {statistics.mean(timings):.2f} ms, '
+                f'median {statistics.median(timings):.2f} ms, '
+                f'{queries:.1f} queries/render'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Speedup: {statistics.mean(before) / statistics.mean(after):.1f}x'
+        ))
@@ -0,0 +1,48 @@
+"""
+Management command to preload the audio cache at deploy time.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from audio.cache import audio_cache
+from audio.mixins import static_ui_cache_key, warm_audio_cache
+from audio.models import StaticUIElement
+from jobs.models import Job
+
+# Statuses shown on the public job list
+HOT_JOB_STATUSES = ['recruiting', 'open', 'submitting']
+
+
+class Command(BaseCommand):
+    help = 'Preload static UI audio and the newest job cards into the shared audio cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=50,
+            help='Number of newest listed jobs to warm (default: 50)',
+        )
+        parser.add_argument(
+            '--languages',
+            nargs='+',
+            default=None,
+            help='Language codes to warm (default: all LANGUAGES)',
+        )
+
+    def handle(self, *args, **options):
+        language_codes = options['languages'] or [code for code, _name in settings.LANGUAGES]
+
+        elements = list(StaticUIElement.objects.all())
+        for element in elements:
+            audio_cache.set(static_ui_cache_key(element.slug), element)
+        ui_entries = warm_audio_cache(elements, ['label'], language_codes)
+        self.stdout.write(f'Static UI: {len(elements)} elements, {ui_entries} audio entries')
+
+        jobs = list(
+            Job.objects.filter(status__in=HOT_JOB_STATUSES).order_by('-created_at')[:options['jobs']]
+        )
+        job_entries = warm_audio_cache(jobs, ['title'], language_codes)
+        self.stdout.write(f'Jobs: {len(jobs)} cards, {job_entries} audio entries')
+
+        self.stdout.write(self.style.SUCCESS('Audio cache warmed'))
@@ -0,0 +1,159 @@
+"""
+Per-language manifests and offline packs of static UI audio.
+
+The static UI voice (``StaticUIElement`` labels and their ``AudioSnippet``
+recordings) is a small catalog per language. ``get_manifest()`` describes
+one language's catalog as JSON (slug -> field -> URL and content hash) with
+an ETag derived from the hashes, and ``get_pack()`` bundles the same clips
+in a zip so a service worker can pre-cache the whole voice at once.
+
+Both are regenerated lazily and per language: saving or deleting a static UI
+snippet bumps only its language's manifest generation in the audio cache,
+and a pack is rebuilt only when its manifest's ETag changes.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .cache import audio_cache
+from .mixins import get_language_fallback_chain
+from .models import AudioSnippet, StaticUIElement
+
+PACK_DIRECTORY = 'audio/packs'
+
+
+def manifest_namespace(language_code):
+    return f'manifest:{language_code}'
+
+
+def invalidate_manifest(language_code=None):
+    """Mark one language's manifest (or all of them) as stale."""
+    language_codes = [language_code] if language_code else [code for code, _name in settings.LANGUAGES]
+    for code in language_codes:
+        audio_cache.bump(manifest_namespace(code))
+
+
+def build_manifest(language_code):
+    """
+    Build the manifest for ``language_code`` from the database (two queries).
+
+    Returns:
+        dict with ``language_code``, ``etag``, ``fallback_languages``,
+        ``generated_at`` and ``clips`` ({slug: {target_field: {url, hash}}}).
+    """
+    content_type = ContentType.objects.get_for_model(StaticUIElement)
+    snippets = list(
+        AudioSnippet.objects.filter(
+            content_type=content_type, language_code=language_code, status='ready'
+        ).exclude(file='').order_by().values('object_id', 'target_field', 'file', 'content_hash')
+    )
+    slugs = dict(
+        StaticUIElement.objects.filter(pk__in={row['object_id'] for row in snippets})
+        .order_by().values_list('pk', 'slug')
+    )
+
+    clips = {}
+    for row in snippets:
+        slug = slugs.get(row['object_id'])
+        if slug is None:
+            continue
+        clips.setdefault(slug, {})[row['target_field']] = {
+            'url': default_storage.url(row['file']),
+            'file': row['file'],
+            # Fall back to the file name so unhashed clips still change the ETag
+            'hash': row['content_hash'] or row['file'],
+        }
+
+    digest = hashlib.sha256(language_code.encode())
+    for slug in sorted(clips):
+        for target_field in sorted(clips[slug]):
+            digest.update(f'\n{slug}:{target_field}:{clips[slug][target_field]["hash"]}'.encode())
+
+    return {
+        'language_code': language_code,
+        'etag': digest.hexdigest()[:32],
+        'fallback_languages': get_language_fallback_chain(language_code)[1:],
+        'generated_at': timezone.now().isoformat(),
+        'clips': clips,
+    }
+
+
+def get_manifest(language_code):
+    """Cached manifest for ``language_code``; rebuilt after its clips change."""
+    generation = audio_cache.generation(manifest_namespace(language_code))
+    return audio_cache.get_or_load(
+        f'audio_manifest:{language_code}:v{generation}',
+        lambda: build_manifest(language_code),
+    )
+
+
+def public_manifest(manifest):
+    """The manifest as served to clients (without storage paths)."""
+    return {
+        **manifest,
+        'clips': {
+            slug: {
+                target_field: {'url': clip['url'], 'hash': clip['hash']}
+                for target_field, clip in fields.items()
+            }
+            for slug, fields in manifest['clips'].items()
+        },
+    }
+
+
+def pack_name(manifest):
+    return f'{PACK_DIRECTORY}/{manifest["language_code"]}-{manifest["etag"]}.zip'
+
+
+def get_pack(language_code):
+    """
+    Storage name of the zip pack for ``language_code``, building it if needed.
+
+    The zip holds ``manifest.json`` plus one entry per clip at
+    ``<slug>/<target_field><ext>``; the manifest inside gives each clip's
+    path in the zip as ``path``. Older packs of the language are removed.
+    """
+    manifest = get_manifest(language_code)
+    name = pack_name(manifest)
+    if default_storage.exists(name):
+        return name
+
+    packed = {}
+    with tempfile.TemporaryFile() as buffer:
+        # Audio is already compressed, so store entries as-is
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+            for slug, fields in manifest['clips'].items():
+                for target_field, clip in fields.items():
+                    path = f'{slug}/{target_field}{os.path.splitext(clip["file"])[1]}'
+                    try:
+                        with default_storage.open(clip['file'], 'rb') as audio_file:
+                            archive.writestr(path, audio_file.read())
+                    except FileNotFoundError:
+                        continue
+                    packed.setdefault(slug, {})[target_field] = {'path': path, 'hash': clip['hash']}
+            archive.writestr('manifest.json', json.dumps({**public_manifest(manifest), 'clips': packed}))
+        buffer.seek(0)
+        if not default_storage.exists(name):
+            default_storage.save(name, File(buffer))
+
+    _remove_stale_packs(language_code, keep=name)
+    return name
+
+
+def _remove_stale_packs(language_code, keep):
+    try:
+        _directories, files = default_storage.listdir(PACK_DIRECTORY)
+    except FileNotFoundError:
+        return
+    for filename in files:
+        name = f'{PACK_DIRECTORY}/{filename}'
+        if filename.startswith(f'{language_code}-') and name != keep:
+            default_storage.delete(name)
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:44
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def compute_file_hash(field_file):
+    """SHA-256 hex digest of a FieldFile's contents ('' if the file is missing)."""
+    # Frozen copy of audio.models.compute_file_hash at the time of this migration
+    digest = hashlib.sha256()
+    try:
+        field_file.open('rb')
+        try:
+            for chunk in field_file.chunks():
+                digest.update(chunk)
+        finally:
+            field_file.close()
+    except (FileNotFoundError, ValueError):
+        return ''
+    return digest.hexdigest()
+
+
+def backfill_content_hash(apps, schema_editor):
+    """Hash existing audio files (rows whose file is missing stay blank)."""
+    AudioSnippet = apps.get_model('audio', 'AudioSnippet')
+    for snippet in AudioSnippet.objects.exclude(file='').iterator():
+        content_hash = compute_file_hash(snippet.file)
+        if content_hash:
+            AudioSnippet.objects.filter(pk=snippet.pk).update(content_hash=content_hash)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audio', '0003_staticuielement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='audiosnippet',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Content Hash'),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+    ]
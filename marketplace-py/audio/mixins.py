@@ -4,11 +4,47 @@ Audio mixin and helper functions for models that support audio snippets.
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from django.core.cache import cache
 from django.conf import settings
+from marketplace.config import get_site_config
+from .cache import audio_cache
 from .models import AudioSnippet, AudioRequest, StaticUIElement
 
 
+def audio_cache_namespace(model_label, object_id):
+    """Cache namespace holding every audio lookup for one content object."""
+    return f'{model_label}:{object_id}'
+
+
+def audio_snippet_cache_key(model_label, object_id, target_field, language_code, status):
+    """Cache key for one (object, field, language, status) lookup in the object's current generation."""
+    namespace = audio_cache_namespace(model_label, object_id)
+    generation = audio_cache.generation(namespace)
+    return f'audio_snippet:{namespace}:v{generation}:{target_field}:{language_code}:{status}'
+
+
+def _load_audio_snippet(content_object, target_field, language_code, status):
+    content_type = ContentType.objects.get_for_model(content_object.__class__)
+    return AudioSnippet.objects.filter(
+        content_type=content_type,
+        object_id=content_object.pk,
+        target_field=target_field,
+        language_code=language_code,
+        status=status
+    ).first()
+
+
+def _cached_audio_snippet(content_object, target_field, language_code, status, use_cache):
+    """Look a snippet up through the two-tier audio cache (misses are cached too)."""
+    if not use_cache:
+        return _load_audio_snippet(content_object, target_field, language_code, status)
+    return audio_cache.get_or_load(
+        audio_snippet_cache_key(
+            content_object._meta.label, content_object.pk, target_field, language_code, status
+        ),
+        lambda: _load_audio_snippet(content_object, target_field, language_code, status),
+    )
+
+
 class AudioMixin:
     """
     Mixin to add audio functionality to any model.
@@ -37,28 +73,7 @@ class AudioMixin:
         Returns:
             AudioSnippet instance or None
         """
-        if use_cache:
-            cache_key = f'audio_snippet:{self._meta.label}:{self.pk}:{target_field}:{language_code}:{status}'
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return cached
-        
-        content_type = ContentType.objects.get_for_model(self)
-        try:
-            snippet = AudioSnippet.objects.get(
-                content_type=content_type,
-                object_id=self.pk,
-                target_field=target_field,
-                language_code=language_code,
-                status=status
-            )
-            if use_cache:
-                cache.set(cache_key, snippet, settings.AUDIO_CACHE_TIMEOUT)
-            return snippet
-        except AudioSnippet.DoesNotExist:
-            if use_cache:
-                cache.set(cache_key, None, settings.AUDIO_CACHE_TIMEOUT)
-            return None
+        return _cached_audio_snippet(self, target_field, language_code, status, use_cache)
     
     def get_all_audio_snippets(self, language_code=None, status='ready'):
         """
@@ -158,15 +173,8 @@ class AudioMixin:
             return None
     
     def clear_audio_cache(self):
-        """Clear all cached audio snippets for this object."""
-        content_type = ContentType.objects.get_for_model(self)
-        # Clear cache for all possible combinations
-        for snippet in AudioSnippet.objects.filter(
-            content_type=content_type,
-            object_id=self.pk
-        ):
-            cache_key = f'audio_snippet:{self._meta.label}:{self.pk}:{snippet.target_field}:{snippet.language_code}:{snippet.status}'
-            cache.delete(cache_key)
+        """Invalidate every cached audio lookup for this object, including cached misses."""
+        audio_cache.bump(audio_cache_namespace(self._meta.label, self.pk))
 
 
 def get_audio_for_content(content_object, target_field, language_code, status='ready', use_cache=True):
@@ -186,28 +194,15 @@ def get_audio_for_content(content_object, target_field, language_code, status='r
     if hasattr(content_object, 'get_audio_snippet'):
         return content_object.get_audio_snippet(target_field, language_code, status, use_cache)
     
-    if use_cache:
-        cache_key = f'audio_snippet:{content_object._meta.label}:{content_object.pk}:{target_field}:{language_code}:{status}'
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-    
-    content_type = ContentType.objects.get_for_model(content_object.__class__)
-    try:
-        snippet = AudioSnippet.objects.get(
-            content_type=content_type,
-            object_id=content_object.pk,
-            target_field=target_field,
-            language_code=language_code,
-            status=status
-        )
-        if use_cache:
-            cache.set(cache_key, snippet, settings.AUDIO_CACHE_TIMEOUT)
-        return snippet
-    except AudioSnippet.DoesNotExist:
-        if use_cache:
-            cache.set(cache_key, None, settings.AUDIO_CACHE_TIMEOUT)
-        return None
+    return _cached_audio_snippet(content_object, target_field, language_code, status, use_cache)
+
+
+def get_language_fallback_chain(preferred_language_code=None):
+    """
+    Languages to try for audio, in order: the preferred language,
+    FALLBACK_TEXT_LANGUAGE, then LANGUAGE_CODE (without duplicates).
+    """
+    return list(get_site_config().language_chain(preferred_language_code))
 
 
 def get_audio_with_fallback(content_object, target_field, preferred_language_code=None, status='ready', use_cache=True):
@@ -229,22 +224,7 @@ def get_audio_with_fallback(content_object, target_field, preferred_language_cod
     Returns:
         Tuple of (AudioSnippet instance or None, actual_language_code_used)
     """
-    # Build fallback chain
-    fallback_chain = []
-    
-    # 1. User's preferred language
-    if preferred_language_code:
-        fallback_chain.append(preferred_language_code)
-    
-    # 2. Language fallback from settings
-    fallback_language = getattr(settings, 'FALLBACK_TEXT_LANGUAGE', None)
-    if fallback_language and fallback_language not in fallback_chain:
-        fallback_chain.append(fallback_language)
-    
-    # 3. Final fallback (default language)
-    final_fallback = settings.LANGUAGE_CODE
-    if final_fallback not in fallback_chain:
-        fallback_chain.append(final_fallback)
+    fallback_chain = get_language_fallback_chain(preferred_language_code)
     
     # Try each language in the fallback chain
     for lang_code in fallback_chain:
@@ -291,6 +271,159 @@ def get_fallback_audio_url(language_code=None, request=None):
         return static(fallback_path)
 
 
+def static_ui_slug_candidates(content_type_id, object_id):
+    """
+    Slugs a static UI audio target may refer to, most specific first.
+    
+    Dashboard targets are sent as ("dashboard", "page_2") and may be stored
+    as "page_2", "dashboard_page_2" or "<content_type_id>_page_2".
+    """
+    if content_type_id.lower() == 'dashboard' and object_id:
+        return [object_id, f'dashboard_{object_id}', f'{content_type_id}_{object_id}']
+    return [object_id]
+
+
+def is_static_ui_target(content_type_id):
+    """Whether an API target names a StaticUIElement slug rather than a numeric content type."""
+    return content_type_id.lower() == 'static_ui' or (
+        not content_type_id.isdigit() and content_type_id.lower() != 'none'
+    )
+
+
+def get_audio_batch(targets, language_chain, status='ready'):
+    """
+    Resolve many audio targets at once with a bounded number of queries.
+    
+    One query finds every referenced StaticUIElement slug, one loads the
+    content types, one per content type checks that the numeric objects
+    exist and one loads every candidate snippet in the language chain; the
+    fallback chain is then walked in memory.
+    
+    Args:
+        targets: Iterable of (content_type_id, object_id, target_field)
+            string tuples, as used by the single-target GET endpoint.
+        language_chain: Languages to try, in order.
+        status: Snippet status to match (default: 'ready').
+    
+    Returns:
+        Dict mapping each target tuple to a dict with ``found`` (whether the
+        content object exists), ``content_type_id``,
+        ``object_id``, ``snippet`` (or None) and ``language_code``.
+    """
+    targets = list(dict.fromkeys(targets))
+    
+    slugs = set()
+    numeric_type_ids = set()
+    for content_type_id, object_id, _target_field in targets:
+        if is_static_ui_target(content_type_id):
+            slugs.update(static_ui_slug_candidates(content_type_id, object_id))
+        elif content_type_id.isdigit() and object_id.isdigit():
+            numeric_type_ids.add(int(content_type_id))
+    
+    elements = {element.slug: element for element in StaticUIElement.objects.filter(slug__in=slugs).order_by()} if slugs else {}
+    content_types = {ct.pk: ct for ct in ContentType.objects.filter(pk__in=numeric_type_ids)} if numeric_type_ids else {}
+    static_ui_type = ContentType.objects.get_for_model(StaticUIElement) if elements else None
+    
+    # Numeric targets only resolve if the object exists, as for the GET
+    # endpoint: one query per content type
+    object_ids = {}
+    for content_type_id, object_id, _target_field in targets:
+        if not is_static_ui_target(content_type_id) and content_type_id.isdigit() and object_id.isdigit():
+            object_ids.setdefault(int(content_type_id), set()).add(int(object_id))
+    existing = set()
+    for content_type_pk, pks in object_ids.items():
+        content_type = content_types.get(content_type_pk)
+        model_class = content_type.model_class() if content_type else None
+        if model_class is not None:
+            existing.update(
+                (content_type_pk, pk)
+                for pk in model_class._default_manager.filter(pk__in=pks).order_by().values_list('pk', flat=True)
+            )
+    
+    # Resolve each target to (content_type_pk, object_pk)
+    resolved = {}
+    for target in targets:
+        content_type_id, object_id, _target_field = target
+        if is_static_ui_target(content_type_id):
+            element = next(
+                (elements[slug] for slug in static_ui_slug_candidates(content_type_id, object_id) if slug in elements),
+                None,
+            )
+            if element is not None:
+                resolved[target] = (static_ui_type.pk, element.pk)
+        elif content_type_id.isdigit() and object_id.isdigit() and (int(content_type_id), int(object_id)) in existing:
+            resolved[target] = (int(content_type_id), int(object_id))
+    
+    snippets = {}
+    if resolved:
+        object_pks = {}
+        fields = {}
+        for target, (content_type_pk, object_pk) in resolved.items():
+            object_pks.setdefault(content_type_pk, set()).add(object_pk)
+            fields.setdefault(content_type_pk, set()).add(target[2])
+        condition = models.Q()
+        for content_type_pk in object_pks:
+            condition |= models.Q(
+                content_type_id=content_type_pk,
+                object_id__in=object_pks[content_type_pk],
+                target_field__in=fields[content_type_pk],
+            )
+        for snippet in AudioSnippet.objects.filter(condition, language_code__in=language_chain, status=status).order_by():
+            snippets[(snippet.content_type_id, snippet.object_id, snippet.target_field, snippet.language_code)] = snippet
+    
+    results = {}
+    for target in targets:
+        content_type_id, object_id, target_field = target
+        location = resolved.get(target)
+        result = {
+            'found': location is not None,
+            'content_type_id': location[0] if location else None,
+            'object_id': location[1] if location else None,
+            'snippet': None,
+            'language_code': language_chain[0] if language_chain else settings.LANGUAGE_CODE,
+        }
+        if location:
+            for language_code in language_chain:
+                snippet = snippets.get((location[0], location[1], target_field, language_code))
+                if snippet:
+                    result['snippet'] = snippet
+                    result['language_code'] = language_code
+                    break
+        results[target] = result
+    return results
+
+
+def static_ui_cache_key(slug):
+    return f'audio_static_ui:{slug}'
+
+
+STATIC_UI_NAMESPACE = 'static_ui'
+
+
+def get_static_ui_version():
+    """
+    Version of the static UI catalog (elements and their audio).
+    
+    Template fragments that render static UI audio include it in their cache
+    key, so any change to a StaticUIElement or its snippets re-renders them.
+    """
+    return audio_cache.generation(STATIC_UI_NAMESPACE)
+
+
+def bump_static_ui_version():
+    return audio_cache.bump(STATIC_UI_NAMESPACE)
+
+
+def get_static_ui_element(slug, use_cache=True):
+    """Return the StaticUIElement with ``slug`` (cached, misses included), or None."""
+    if not use_cache:
+        return StaticUIElement.objects.filter(slug=slug).first()
+    return audio_cache.get_or_load(
+        static_ui_cache_key(slug),
+        lambda: StaticUIElement.objects.filter(slug=slug).first(),
+    )
+
+
 def get_audio_for_static_ui(slug, target_field='label', language_code=None, preferred_language_code=None, status='ready', use_cache=True):
     """
     Get audio snippet for a static UI element by slug.
@@ -306,13 +439,10 @@ def get_audio_for_static_ui(slug, target_field='label', language_code=None, pref
     Returns:
         AudioSnippet instance or None (or tuple with language_code if preferred_language_code provided)
     """
-    try:
-        ui_element = StaticUIElement.objects.get(slug=slug)
-    except StaticUIElement.DoesNotExist:
+    ui_element = get_static_ui_element(slug, use_cache)
+    if ui_element is None:
         return None if not preferred_language_code else (None, None)
     
-    content_type = ContentType.objects.get_for_model(StaticUIElement)
-    
     if language_code:
         # Use specific language code
         return get_audio_for_content(ui_element, target_field, language_code, status, use_cache)
@@ -322,3 +452,41 @@ def get_audio_for_static_ui(slug, target_field='label', language_code=None, pref
     else:
         # Try with fallback chain using settings
         return get_audio_with_fallback(ui_element, target_field, None, status, use_cache)
+
+
+def warm_audio_cache(objects, target_fields, language_codes, status='ready'):
+    """
+    Preload the audio cache for ``objects`` (all of one model).
+
+    Loads every matching snippet in one query and stores a hit or a cached
+    miss for each (object, field, language) combination, so the first page
+    views after a deploy do not each query the database.
+
+    Returns:
+        Number of cache entries written.
+    """
+    objects = list(objects)
+    if not objects:
+        return 0
+    model = objects[0].__class__
+    content_type = ContentType.objects.get_for_model(model)
+    snippets = {
+        (snippet.object_id, snippet.target_field, snippet.language_code): snippet
+        for snippet in AudioSnippet.objects.filter(
+            content_type=content_type,
+            object_id__in=[obj.pk for obj in objects],
+            target_field__in=target_fields,
+            language_code__in=language_codes,
+            status=status,
+        )
+    }
+    written = 0
+    for obj in objects:
+        for target_field in target_fields:
+            for language_code in language_codes:
+                audio_cache.set(
+                    audio_snippet_cache_key(model._meta.label, obj.pk, target_field, language_code, status),
+                    snippets.get((obj.pk, target_field, language_code)),
+                )
+                written += 1
+    return written
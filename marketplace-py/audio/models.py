@@ -1,3 +1,5 @@
+import hashlib
+
 from django.db import models
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -63,6 +65,14 @@ class AudioSnippet(models.Model):
         help_text=_('Audio file (MP3, OGG, etc.)')
     )
     
+    # SHA-256 of the file contents, used by the offline audio manifest
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        verbose_name=_('Content Hash')
+    )
+    
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -94,6 +104,43 @@ class AudioSnippet(models.Model):
         if self.file:
             return self.file.url
         return None
+    
+    # File name as loaded from the database, to tell when ``file`` changed
+    _loaded_file_name = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The raw column value; FileDescriptor wraps it on first access
+        instance._loaded_file_name = instance.__dict__.get('file')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # Hash only when the file changed: a new upload or another stored file.
+        # A row whose file is missing keeps its blank hash instead of being
+        # re-read on every save.
+        if self.file and (not self.file._committed or self.file.name != self._loaded_file_name):
+            self.content_hash = compute_file_hash(self.file)
+        super().save(*args, **kwargs)
+        self._loaded_file_name = self.file.name if self.file else None
+
+
+def compute_file_hash(field_file):
+    """SHA-256 hex digest of a FieldFile's contents ('' if the file is missing)."""
+    digest = hashlib.sha256()
+    try:
+        field_file.open('rb')
+        try:
+            for chunk in field_file.chunks():
+                digest.update(chunk)
+        finally:
+            if field_file._committed:
+                field_file.close()
+            else:
+                field_file.seek(0)
+    except (FileNotFoundError, ValueError):
+        return ''
+    return digest.hexdigest()
 
 
 class AudioRequest(models.Model):
@@ -1,10 +1,13 @@
 """
 Signals for the audio app.
-Auto-close AudioRequests when AudioSnippets are created.
+Auto-close AudioRequests when AudioSnippets are created, and drop cached
+lookups (including cached misses) when snippets or UI elements change.
 """
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import AudioSnippet, AudioRequest
+from .cache import audio_cache
+from .models import AudioSnippet, AudioRequest, StaticUIElement
 
 
 @receiver(post_save, sender=AudioSnippet)
@@ -27,3 +30,53 @@ def auto_close_audio_requests(sender, instance, created, **kwargs):
             language_code=language_code,
             status__in=['open', 'in_progress']
         ).update(status='fulfilled')
+
+
+@receiver(post_save, sender=AudioSnippet)
+@receiver(post_delete, sender=AudioSnippet)
+def invalidate_audio_snippet_cache(sender, instance, **kwargs):
+    """Bump the content object's cache generation so all its lookups reload."""
+    from .manifest import invalidate_manifest
+    from .mixins import audio_cache_namespace, bump_static_ui_version
+
+    model = instance.content_type.model_class()
+    if model is None:
+        return
+    namespace = audio_cache_namespace(model._meta.label, instance.object_id)
+    language_code = instance.language_code
+
+    # After commit, like jobs.page_cache.invalidate: a reader between the bump
+    # and the commit would otherwise cache the old rows under the new generation
+    def bump():
+        audio_cache.bump(namespace)
+        if model is StaticUIElement:
+            invalidate_manifest(language_code)
+            bump_static_ui_version()
+    transaction.on_commit(bump)
+
+
+@receiver(pre_save, sender=StaticUIElement)
+def remember_static_ui_slug(sender, instance, raw=False, **kwargs):
+    instance._previous_slug = None
+    if instance.pk and not raw:
+        instance._previous_slug = (
+            StaticUIElement.objects.filter(pk=instance.pk).values_list('slug', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=StaticUIElement)
+@receiver(post_delete, sender=StaticUIElement)
+def invalidate_static_ui_cache(sender, instance, **kwargs):
+    from .manifest import invalidate_manifest
+    from .mixins import bump_static_ui_version, static_ui_cache_key
+
+    # A renamed element leaves its old slug's cached lookup behind otherwise
+    slugs = {instance.slug, getattr(instance, '_previous_slug', None)} - {None}
+
+    def bump():
+        for slug in slugs:
+            audio_cache.delete(static_ui_cache_key(slug))
+        bump_static_ui_version()
+        # Slugs are the manifest keys in every language
+        invalidate_manifest()
+    transaction.on_commit(bump)
@@ -1,32 +1,29 @@
 """
 Template tags for audio functionality.
 """
-import json
 from django import template
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.templatetags.static import static
-from audio.mixins import get_audio_for_content, get_audio_with_fallback, get_audio_for_static_ui, get_fallback_audio_url
+from marketplace.config import get_language_preferences, get_site_config
+from audio.mixins import get_audio_for_content, get_audio_with_fallback, get_audio_for_static_ui, get_fallback_audio_url, get_static_ui_element
 
 register = template.Library()
 
 
+def get_preferred_audio_from_context(context):
+    """Preferred audio language from the context processor, or resolved from the request."""
+    preferred_audio = context.get('preferred_audio_language')
+    if preferred_audio:
+        return preferred_audio
+    request = context.get('request')
+    return get_language_preferences(request).preferred_audio_language if request else None
+
+
 def get_audio_config_from_context_or_settings(context):
-    """Get audio_config from context or construct from settings."""
-    audio_config = context.get('audio_config')
-    if audio_config:
-        return audio_config
-    
-    # Fallback: construct from settings if not in context
-    return {
-        'icon_inactive': (settings.MEDIA_URL.rstrip('/') + '/' + getattr(settings, 'AUDIO_ICON_INACTIVE', 'listen-inactive.png')).replace('//', '/'),
-        'icon_active': (settings.MEDIA_URL.rstrip('/') + '/' + getattr(settings, 'AUDIO_ICON_ACTIVE', 'listen-active.png')).replace('//', '/'),
-        'fallback_audio': json.dumps(getattr(settings, 'AUDIO_FALLBACK_BY_LANGUAGE', {})),
-        'fallback_file': getattr(settings, 'AUDIO_FALLBACK_FILE', 'audio/fallback.mp3'),
-        'media_url': settings.MEDIA_URL,
-        'static_url': settings.STATIC_URL,
-    }
+    """Get audio_config from context, or the process-wide one from settings."""
+    return context.get('audio_config') or get_site_config().audio_config
 
 
 @register.inclusion_tag('audio/audio_player.html', takes_context=True)
@@ -49,7 +46,7 @@ def audio_player(context, content_object, target_field, language_code=None):
         language_code: Optional language code (if provided, uses that instead of fallback chain)
     """
     # Get user's preferred language from context
-    preferred_audio = context.get('preferred_audio_language')
+    preferred_audio = get_preferred_audio_from_context(context)
     
     # If language_code is explicitly provided, use it directly
     # Otherwise, use fallback chain with user's preferred language
@@ -136,12 +133,11 @@ def audio_player_static_ui(context, slug, target_field='label', language_code=No
     from audio.models import StaticUIElement
     
     # Get user's preferred language from context
-    preferred_audio = context.get('preferred_audio_language')
+    preferred_audio = get_preferred_audio_from_context(context)
     
-    # Get the StaticUIElement
-    try:
-        ui_element = StaticUIElement.objects.get(slug=slug)
-    except StaticUIElement.DoesNotExist:
+    # Get the StaticUIElement (cached, so pages with many UI labels don't query per slug)
+    ui_element = get_static_ui_element(slug)
+    if ui_element is None:
         return {
             'audio_snippet': None,
             'content_object': None,
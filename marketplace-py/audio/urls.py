@@ -3,7 +3,9 @@ URL configuration for audio app API.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AudioSnippetViewSet, AudioRequestViewSet, upload_audio_contribution
+from .views import (
+    AudioSnippetViewSet, AudioRequestViewSet, audio_manifest_view, audio_pack_view, upload_audio_contribution,
+)
 
 router = DefaultRouter()
 router.register(r'snippets', AudioSnippetViewSet, basename='audiosnippet')
@@ -12,4 +14,6 @@ router.register(r'requests', AudioRequestViewSet, basename='audiorequest')
 urlpatterns = [
     path('', include(router.urls)),
     path('contributions/upload/', upload_audio_contribution, name='upload_contribution'),
+    path('manifest/<str:language_code>/', audio_manifest_view, name='audio_manifest'),
+    path('manifest/<str:language_code>/pack.zip', audio_pack_view, name='audio_pack'),
 ]
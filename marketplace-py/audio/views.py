@@ -4,19 +4,92 @@ REST API views for audio app.
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny, IsAdminUser
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.http import FileResponse, Http404, JsonResponse
-from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
+from . import manifest as audio_manifest
+from marketplace.conditional import Validators, conditional_view
+from marketplace.config import get_language_preferences, get_site_config
+from marketplace.replicas import read_from_replica
+from .cache import audio_cache
 from .models import AudioSnippet, AudioRequest, AudioContribution
 from .serializers import AudioSnippetSerializer, AudioRequestSerializer, AudioSnippetCreateSerializer
-from .mixins import get_audio_for_content, get_audio_with_fallback, get_fallback_audio_url
+from .mixins import (
+    get_audio_batch, get_audio_for_content, get_audio_with_fallback, get_fallback_audio_url,
+    get_language_fallback_chain, is_static_ui_target, static_ui_slug_candidates,
+)
 
+# Upper bound on targets per batch lookup request
+AUDIO_BATCH_MAX_TARGETS = 500
 
+
+def get_preferred_audio_language(request):
+    """Language the user wants to hear audio in (resolved once per request)."""
+    return get_language_preferences(request).preferred_audio_language
+
+
+def _table_stats(queryset):
+    stats = queryset.order_by().aggregate(count=Count('pk'), updated=Max('updated_at'))
+    return stats['count'], stats['updated']
+
+
+def _snippet_list_validators(request, *args, **kwargs):
+    count, updated = _table_stats(AudioSnippet.objects.all())
+    return Validators(parts=(count, updated), last_modified=updated)
+
+
+def _snippet_validators(request, pk=None, **kwargs):
+    try:
+        row = AudioSnippet.objects.filter(pk=pk).values('updated_at', 'content_hash').first()
+    except (ValueError, TypeError):
+        return None
+    if row is None:
+        return None
+    return Validators(parts=(row['updated_at'], row['content_hash']), last_modified=row['updated_at'])
+
+
+def _by_content_validators(request, *args, **kwargs):
+    params = request.query_params
+    try:
+        queryset = AudioSnippet.objects.filter(
+            content_type_id=int(params['content_type_id']),
+            object_id=int(params['object_id']),
+            status=params.get('status', 'ready'),
+        )
+    except (KeyError, ValueError):
+        return None
+    if params.get('language_code'):
+        queryset = queryset.filter(language_code=params['language_code'])
+    count, updated = _table_stats(queryset)
+    return Validators(parts=(count, updated), last_modified=updated)
+
+
+def _request_list_validators(request, *args, **kwargs):
+    # has_audio reads snippets, and fulfilling requests does not touch updated_at
+    parts = _table_stats(AudioRequest.objects.all()) + _table_stats(AudioSnippet.objects.all())
+    return Validators(parts=parts)
+
+
+def _request_validators(request, pk=None, **kwargs):
+    try:
+        row = AudioRequest.objects.filter(pk=pk).values('updated_at', 'status').first()
+    except (ValueError, TypeError):
+        return None
+    if row is None:
+        return None
+    return Validators(parts=(row['updated_at'], row['status'], *_table_stats(AudioSnippet.objects.all())))
+
+
+@method_decorator(conditional_view(_snippet_list_validators), name='list')
+@method_decorator(conditional_view(_snippet_validators), name='retrieve')
+@method_decorator(read_from_replica, name='dispatch')
 class AudioSnippetViewSet(viewsets.ModelViewSet):
     """
     ViewSet for AudioSnippet.
@@ -41,6 +114,7 @@ class AudioSnippetViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
     
     @action(detail=False, methods=['get'])
+    @method_decorator(conditional_view(_by_content_validators))
     def by_content(self, request):
         """
         Get audio snippets for a specific content object.
@@ -77,6 +151,86 @@ class AudioSnippetViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """
+        Hit/miss counters of this process's audio cache (staff only).
+        URL: /api/audio/snippets/cache_stats/
+        """
+        return Response(audio_cache.stats())
+    
+    @action(detail=False, methods=['post'], permission_classes=[AllowAny])
+    def batch(self, request):
+        """
+        Resolve many audio targets in one request.
+        
+        Body (JSON):
+            targets: List of {content_type_id, object_id, target_field}, using the
+                same identifiers as the single-target GET endpoint (numeric ids,
+                or "static_ui"/"dashboard" plus a slug).
+            languages: Optional language chain to try in order; defaults to the
+                viewer's audio language chain, like the GET endpoint.
+        
+        Returns one result per target, in request order. The number of
+        queries does not depend on the number of targets.
+        
+        URL: /api/audio/snippets/batch/
+        """
+        raw_targets = request.data.get('targets')
+        if not isinstance(raw_targets, list) or not raw_targets:
+            return Response({'error': 'targets must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(raw_targets) > AUDIO_BATCH_MAX_TARGETS:
+            return Response(
+                {'error': f'At most {AUDIO_BATCH_MAX_TARGETS} targets per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        targets = []
+        for raw in raw_targets:
+            if not isinstance(raw, dict):
+                return Response({'error': 'Each target must be an object'}, status=status.HTTP_400_BAD_REQUEST)
+            target = tuple(str(raw.get(key) or '') for key in ('content_type_id', 'object_id', 'target_field'))
+            if not all(target):
+                return Response(
+                    {'error': 'Each target needs content_type_id, object_id and target_field'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            targets.append(target)
+        
+        languages = request.data.get('languages')
+        if languages is None:
+            language_chain = list(get_language_preferences(request).audio_language_chain)
+        elif isinstance(languages, list) and languages and all(isinstance(code, str) and code for code in languages):
+            language_chain = list(dict.fromkeys(languages))
+        else:
+            return Response({'error': 'languages must be a list of language codes'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        resolved = get_audio_batch(targets, language_chain)
+        fallback_urls = {}
+        results = []
+        for content_type_id, object_id, target_field in targets:
+            result = resolved[(content_type_id, object_id, target_field)]
+            snippet = result['snippet']
+            item = {
+                'content_type_id': content_type_id,
+                'object_id': object_id,
+                'target_field': target_field,
+                'available': bool(snippet and snippet.file),
+                'language_code': result['language_code'],
+            }
+            if item['available']:
+                item['audio_url'] = request.build_absolute_uri(snippet.file.url)
+                item['fallback_used'] = result['language_code'] != language_chain[0]
+            else:
+                language_code = result['language_code']
+                if language_code not in fallback_urls:
+                    fallback_urls[language_code] = get_fallback_audio_url(language_code, request)
+                item['fallback_audio_url'] = fallback_urls[language_code]
+                item['found'] = result['found']
+            results.append(item)
+        
+        return Response({'languages': language_chain, 'results': results})
+    
     @action(detail=False, methods=['get'], url_path='get/(?P<content_type_id>[^/.]+)/(?P<object_id>[^/.]+)/(?P<target_field>[^/.]+)/(?P<language_code>[^/.]+)')
     def get_audio(self, request, content_type_id, object_id, target_field, language_code):
         """
@@ -97,31 +251,12 @@ class AudioSnippetViewSet(viewsets.ModelViewSet):
         
         # Handle slug-based lookup for StaticUIElement
         # If content_type_id is "static_ui" or a non-numeric string, try slug lookup
-        if content_type_id.lower() == 'static_ui' or (not content_type_id.isdigit() and content_type_id.lower() != 'none'):
+        if is_static_ui_target(content_type_id):
             # Try to find StaticUIElement by slug
             # object_id should be the slug (e.g., "page_2", "dashboard_my_money")
-            ui_element = None
-            slug_candidates = []
-            
-            # If content_type_id is "dashboard" or similar, construct slug from both
-            if content_type_id.lower() == 'dashboard' and object_id:
-                # Try different slug formats
-                slug_candidates = [
-                    object_id,  # Try as-is (e.g., "page_2")
-                    f'dashboard_{object_id}',  # Try with dashboard prefix (e.g., "dashboard_page_2")
-                    f'{content_type_id}_{object_id}',  # Try with content_type prefix
-                ]
-            else:
-                # Use object_id directly as slug
-                slug_candidates = [object_id]
-            
-            # Try each slug candidate
-            for slug in slug_candidates:
-                try:
-                    ui_element = StaticUIElement.objects.get(slug=slug)
-                    break
-                except StaticUIElement.DoesNotExist:
-                    continue
+            slug_candidates = static_ui_slug_candidates(content_type_id, object_id)
+            elements = {element.slug: element for element in StaticUIElement.objects.filter(slug__in=slug_candidates)}
+            ui_element = next((elements[slug] for slug in slug_candidates if slug in elements), None)
             
             if ui_element is None:
                 # StaticUIElement doesn't exist yet - return fallback audio URL
@@ -186,21 +321,7 @@ class AudioSnippetViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
         
-        # Get user's preferred language from cookie/context
-        # This is the language the user wants to hear audio in
-        preferred_audio = request.COOKIES.get(
-            getattr(settings, 'PREFERRED_AUDIO_LANGUAGE_COOKIE_NAME', 'preferred_audio_language')
-        )
-        
-        # If no preferred audio language in cookie, try LANGUAGE_COOKIE_NAME
-        if not preferred_audio:
-            preferred_audio = request.COOKIES.get(
-                getattr(settings, 'LANGUAGE_COOKIE_NAME', 'django_language')
-            )
-        
-        # If still no preferred language, use request language
-        if not preferred_audio:
-            preferred_audio = getattr(request, 'LANGUAGE_CODE', None)
+        preferred_audio = get_preferred_audio_language(request)
         
         # Use fallback chain: prioritize user's preferred language
         # The function will try: preferred -> fallback_text_language -> language_code
@@ -223,16 +344,7 @@ class AudioSnippetViewSet(viewsets.ModelViewSet):
             fallback_url = get_fallback_audio_url(actual_language_code, self.request)
             
             # Build fallback chain for debugging info
-            fallback_chain = []
-            preferred_lang = preferred_audio or language_code
-            if preferred_lang:
-                fallback_chain.append(preferred_lang)
-            fallback_language = getattr(settings, 'FALLBACK_TEXT_LANGUAGE', None)
-            if fallback_language and fallback_language not in fallback_chain:
-                fallback_chain.append(fallback_language)
-            final_fallback = settings.LANGUAGE_CODE
-            if final_fallback not in fallback_chain:
-                fallback_chain.append(final_fallback)
+            fallback_chain = get_language_fallback_chain(preferred_audio or language_code)
             
             return Response(
                 {
@@ -249,6 +361,7 @@ class AudioSnippetViewSet(viewsets.ModelViewSet):
             )
     
     @action(detail=True, methods=['get'])
+    @method_decorator(conditional_view(_snippet_validators))
     def stream(self, request, pk=None):
         """
         Stream audio file directly.
@@ -267,6 +380,9 @@ class AudioSnippetViewSet(viewsets.ModelViewSet):
         )
 
 
+@method_decorator(conditional_view(_request_list_validators), name='list')
+@method_decorator(conditional_view(_request_validators), name='retrieve')
+@method_decorator(read_from_replica, name='dispatch')
 class AudioRequestViewSet(viewsets.ModelViewSet):
     """
     ViewSet for AudioRequest.
@@ -427,3 +543,49 @@ def upload_audio_contribution(request):
             {'error': f'Error uploading audio: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+def _manifest_language(language_code):
+    if language_code not in get_site_config().language_codes:
+        raise Http404('Unknown language')
+    return language_code
+
+
+def _manifest_etag(request, language_code):
+    return audio_manifest.get_manifest(_manifest_language(language_code))['etag']
+
+
+@require_http_methods(['GET', 'HEAD'])
+@condition(etag_func=_manifest_etag)
+def audio_manifest_view(request, language_code):
+    """
+    Manifest of every static UI clip recorded in ``language_code``.
+    Answers 304 when If-None-Match matches the current ETag.
+    
+    URL: /api/audio/manifest/<language_code>/
+    """
+    manifest = audio_manifest.get_manifest(_manifest_language(language_code))
+    data = audio_manifest.public_manifest(manifest)
+    data['pack_url'] = request.build_absolute_uri(reverse('audio:audio_pack', args=[language_code]))
+    response = JsonResponse(data)
+    response['Cache-Control'] = 'public, max-age=300'
+    return response
+
+
+@require_http_methods(['GET', 'HEAD'])
+@condition(etag_func=_manifest_etag)
+def audio_pack_view(request, language_code):
+    """
+    Zip of every static UI clip recorded in ``language_code``, for offline use.
+    
+    URL: /api/audio/manifest/<language_code>/pack.zip
+    """
+    name = audio_manifest.get_pack(_manifest_language(language_code))
+    response = FileResponse(
+        default_storage.open(name, 'rb'),
+        as_attachment=True,
+        filename=f'audio-{language_code}.zip',
+        content_type='application/zip',
+    )
+    response['Cache-Control'] = 'public, max-age=300'
+    return response
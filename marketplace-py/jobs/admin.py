@@ -1,6 +1,12 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
-from .models import Job, JobSubmission, JobApplication
+from . import reviews
+from .models import Job, JobSubmission, JobApplication, JobStatusTransition, LedgerEntry, MoneyBalance, RequestProfile
 
 
 @admin.register(Job)
@@ -8,7 +14,13 @@ class JobAdmin(admin.ModelAdmin):
     list_display = ['title', 'funder', 'target_language', 'status', 'budget', 'created_at']
     list_filter = ['status', 'target_language', 'created_at']
     search_fields = ['title', 'description']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['accepted_count', 'created_at', 'updated_at']
+    actions = ['recount_accepted_submissions']
+
+    @admin.action(description=_('Recount accepted submissions'))
+    def recount_accepted_submissions(self, request, queryset):
+        for job in queryset:
+            reviews.recount_accepted(job)
 
 
 @admin.register(JobSubmission)
@@ -25,3 +37,80 @@ class JobApplicationAdmin(admin.ModelAdmin):
     list_filter = ['status', 'created_at']
     search_fields = ['job__title', 'applicant__username', 'profile_note']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(JobStatusTransition)
+class JobStatusTransitionAdmin(admin.ModelAdmin):
+    list_display = ['job', 'transition', 'from_status', 'to_status', 'actor', 'created_at']
+    list_filter = ['transition', 'to_status', 'created_at']
+    search_fields = ['job__title', 'actor__username', 'reason']
+    readonly_fields = ['job', 'transition', 'from_status', 'to_status', 'actor', 'reason', 'created_at']
+
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'kind', 'amount', 'job', 'reference', 'created_at']
+    list_filter = ['kind', 'created_at']
+    search_fields = ['user__username', 'job__title', 'reference', 'key']
+    readonly_fields = ['user', 'job', 'kind', 'amount', 'key', 'reference', 'memo', 'created_at']
+
+    # Append-only: entries are written by jobs.ledger
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MoneyBalance)
+class MoneyBalanceAdmin(admin.ModelAdmin):
+    list_display = ['user', 'total_earned', 'total_spent', 'total_refunded', 'balance', 'entries_count', 'updated_at']
+    search_fields = ['user__username']
+    readonly_fields = ['user', 'total_earned', 'total_spent', 'total_refunded', 'balance', 'entries_count', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'method', 'path', 'view', 'user', 'status_code', 'duration_ms', 'samples', 'download_link']
+    list_filter = ['view', 'method', 'created_at']
+    search_fields = ['path', 'view', 'user__username']
+    readonly_fields = [
+        'method', 'path', 'view', 'user', 'status_code', 'duration_ms', 'samples', 'interval_ms',
+        'created_at', 'download_link', 'stacks',
+    ]
+
+    # Written by marketplace.profiling.ProfilingMiddleware
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download),
+                name='jobs_requestprofile_download',
+            ),
+        ] + super().get_urls()
+
+    @admin.display(description=_('Flame graph'))
+    def download_link(self, obj):
+        url = reverse('admin:jobs_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">{}</a>', url, _('Download'))
+
+    def download(self, request, pk):
+        """The folded stacks as a file for flamegraph.pl, speedscope or inferno."""
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if not self.has_view_permission(request, profile):
+            raise PermissionDenied
+        response = HttpResponse(profile.stacks + '\n', content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{profile.filename}"'
+        return response
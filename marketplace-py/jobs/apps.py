@@ -19,5 +19,7 @@ class JobsConfig(AppConfig):
     def ready(self):
         # Connect signal to load default jobs after migrations
         post_migrate.connect(load_default_jobs_handler, sender=self)
+        import jobs.signals  # noqa
+        import marketplace.db  # noqa
 
 
@@ -0,0 +1,155 @@
+"""
+Money ledger.
+
+Payment flows append ``LedgerEntry`` rows through ``record()``, which updates
+the user's ``MoneyBalance`` with ``F()`` increments in the same transaction.
+Reading a user's totals is therefore a single primary-key lookup instead of
+summing jobs in Python, and the full history stays available for paging and
+date-range totals.
+"""
+import logging
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+
+from .models import JobSubmission, LedgerEntry, MoneyBalance
+
+logger = logging.getLogger(__name__)
+
+# Which balance column each kind of entry feeds (amounts stored signed)
+BALANCE_FIELDS = {
+    'contract_funded': 'total_spent',
+    'payout_sent': 'total_earned',
+    'refund': 'total_refunded',
+}
+
+
+def record(user, kind, amount, key, job=None, reference='', memo=''):
+    """
+    Append one ledger entry and apply it to the user's balance.
+
+    Args:
+        user: User whose money moved.
+        kind: One of ``LedgerEntry.KIND_CHOICES``.
+        amount: Signed Decimal; negative when money leaves the user.
+        key: Idempotency key; a second call with the same key is a no-op.
+        job: Related job, if any.
+        reference: External payment id.
+        memo: Short description.
+
+    Returns:
+        The new LedgerEntry, or None if ``key`` was already recorded.
+    """
+    amount = Decimal(amount)
+    total_field = BALANCE_FIELDS[kind]
+    try:
+        with transaction.atomic():
+            entry = LedgerEntry.objects.create(
+                user=user, job=job, kind=kind, amount=amount,
+                key=key, reference=reference or '', memo=memo,
+            )
+            MoneyBalance.objects.get_or_create(user=user)
+            MoneyBalance.objects.filter(pk=user.pk).update(**{
+                total_field: F(total_field) + abs(amount),
+                'balance': F('balance') + amount,
+                'entries_count': F('entries_count') + 1,
+            })
+    except IntegrityError:
+        if LedgerEntry.objects.filter(key=key).exists():
+            logger.info(f"[ledger] Skipping duplicate entry {key}")
+            return None
+        raise
+    return entry
+
+
+def record_contract_funding(job, reference=''):
+    """
+    Debit the funder the job budget once the contract's funds are committed.
+
+    Called when the funder authorizes the contract payment, so a funded job
+    counts towards ``total_spent`` before it is settled.
+
+    Returns:
+        The new LedgerEntry, or None if the funding was already recorded.
+    """
+    return record(
+        job.funder, 'contract_funded', -(job.budget or Decimal('0')), f'job:{job.pk}:funded',
+        job=job, reference=reference, memo=job.title[:255],
+    )
+
+
+def record_contract_settlement(job, reference=''):
+    """
+    Record the money movements of a paid contract.
+
+    Each accepted (non-draft) submission's creator is credited
+    ``amount_per_person`` and any unspent budget is refunded to the funder;
+    the budget itself was debited by ``record_contract_funding``. Safe to
+    call from both the complete-contract view and the payment webhook.
+
+    Returns:
+        List of entries created by this call.
+    """
+    with transaction.atomic():
+        created = []
+        budget = job.budget or Decimal('0')
+        per_person = job.amount_per_person or Decimal('0')
+
+        accepted = JobSubmission.objects.filter(
+            job=job, status='accepted', is_draft=False
+        ).select_related('creator').order_by('pk')
+        paid_out = Decimal('0')
+        for submission in accepted:
+            entry = record(
+                submission.creator, 'payout_sent', per_person,
+                f'job:{job.pk}:payout:{submission.pk}',
+                job=job, reference=reference, memo=job.title[:255],
+            )
+            created.append(entry)
+            paid_out += per_person
+
+        unspent = budget - paid_out
+        if unspent > 0:
+            created.append(record(
+                job.funder, 'refund', unspent, f'job:{job.pk}:refund',
+                job=job, reference=reference, memo=job.title[:255],
+            ))
+    return [entry for entry in created if entry is not None]
+
+
+def get_balance(user):
+    """Return the user's MoneyBalance (unsaved and zeroed if they have no entries)."""
+    return MoneyBalance.objects.filter(user=user).first() or MoneyBalance(user=user)
+
+
+def entries_for(user):
+    """Queryset of the user's entries, newest first."""
+    return LedgerEntry.objects.filter(user=user).select_related('job')
+
+
+def totals_between(user, start=None, end=None):
+    """
+    Sum the user's entries created in ``[start, end)``.
+
+    Returns:
+        dict with ``earned``, ``spent``, ``refunded`` and ``net`` Decimals.
+    """
+    entries = LedgerEntry.objects.filter(user=user)
+    if start:
+        entries = entries.filter(created_at__gte=start)
+    if end:
+        entries = entries.filter(created_at__lt=end)
+    sums = entries.aggregate(
+        earned=Sum('amount', filter=Q(kind='payout_sent')),
+        spent=Sum('amount', filter=Q(kind='contract_funded')),
+        refunded=Sum('amount', filter=Q(kind='refund')),
+        net=Sum('amount'),
+    )
+    zero = Decimal('0.00')
+    return {
+        'earned': sums['earned'] or zero,
+        'spent': -(sums['spent'] or zero),
+        'refunded': sums['refunded'] or zero,
+        'net': sums['net'] or zero,
+    }
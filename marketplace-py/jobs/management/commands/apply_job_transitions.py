@@ -0,0 +1,31 @@
+"""
+Management command that applies the automatic transitions of jobs whose
+recruit deadline, submit deadline or expiry date has passed. Run it from
+cron (or with --interval) so the job pages never have to write on a GET.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.state_machine import apply_due_transitions
+
+
+class Command(BaseCommand):
+    help = 'Apply deadline transitions (close recruiting, begin review, expire) that are due (once or every --interval seconds)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep sweeping every N seconds (default: sweep once)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            applied = apply_due_transitions()
+            summary = ', '.join(f'{name}: {count}' for name, count in sorted(applied.items()))
+            self.stdout.write(f'Applied transitions: {summary or "none due"}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,213 @@
+"""
+Management command to measure write concurrency on the apply, submit and
+payment webhook paths. On SQLite it compares the production profile with
+SQLite's defaults; on PostgreSQL it measures the configured connection setup.
+
+Runs against a scratch database (see marketplace.db.scratch_database); the
+configured database is never written to.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.test import Client
+from django.urls import reverse
+
+from jobs.models import Job, JobApplication, JobSubmission
+from marketplace.db import scratch_database
+from users.models import User
+
+PROFILES = ('default', 'production')
+
+
+class WebhookErrorLog(logging.Handler):
+    """Remembers, per thread, whether the webhook last logged a lock error."""
+
+    def __init__(self):
+        super().__init__()
+        self.local = threading.local()
+
+    def emit(self, record):
+        error = record.exc_info[1] if record.exc_info else None
+        self.local.locked = isinstance(error, OperationalError) and 'locked' in str(error)
+
+    def pop_locked(self):
+        locked = getattr(self.local, 'locked', False)
+        self.local.locked = False
+        return locked
+
+
+class Command(BaseCommand):
+    help = 'Hammer apply/submit/webhook from many threads and report lock errors and throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=16,
+            help='Concurrent clients, one worker account each (default: 16)',
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=10,
+            help='Apply + submit + webhook rounds per thread (default: 10)',
+        )
+        parser.add_argument(
+            '--profile',
+            choices=[*PROFILES, 'both'],
+            default='both',
+            help='SQLite profile to measure (default: both; ignored on other backends)',
+        )
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            profiles = [connections['default'].vendor]
+        elif options['profile'] == 'both':
+            profiles = PROFILES
+        else:
+            profiles = [options['profile']]
+        with self.quiet_request_logs() as webhook_errors:
+            for profile in profiles:
+                result = self.run_profile(profile, options['threads'], options['rounds'], webhook_errors)
+                self.stdout.write(
+                    f'{profile:>10}: {result["ok"]}/{result["total"]} ok, '
+                    f'{result["locked"]} lock errors, {result["failed"]} other failures, '
+                    f'{result["total"] / result["seconds"]:.1f} requests/s'
+                )
+
+    @contextmanager
+    def quiet_request_logs(self):
+        """
+        Keep per-request error logs off the console. The webhook turns every
+        exception into a 500, so its log records tell lock errors apart.
+        """
+        webhook_errors = WebhookErrorLog()
+        loggers = [logging.getLogger('django.request'), logging.getLogger('jobs.webhooks')]
+        saved = [(logger.handlers, logger.propagate) for logger in loggers]
+        loggers[0].handlers, loggers[1].handlers = [logging.NullHandler()], [webhook_errors]
+        for logger in loggers:
+            logger.propagate = False
+        try:
+            yield webhook_errors
+        finally:
+            for logger, (handlers, propagate) in zip(loggers, saved):
+                logger.handlers, logger.propagate = handlers, propagate
+
+    def profile_database(self, profile):
+        if profile == 'default':
+            return scratch_database(options={}, pragmas={})
+        if profile == 'production':
+            return scratch_database(
+                options=dict(settings.SQLITE_PRODUCTION_OPTIONS), pragmas=settings.SQLITE_PRODUCTION_PRAGMAS,
+            )
+        return scratch_database()
+
+    def seed(self, threads, rounds):
+        funder = User.objects.create_user(username='bench_funder', password='bench', role='funder')
+        workers = [
+            User.objects.create_user(username=f'bench_worker{i}', password='bench', role='creator')
+            for i in range(threads)
+        ]
+
+        def create_jobs(status):
+            return [
+                Job.objects.create(
+                    title=f'Benchmark {status} {i}',
+                    description='Benchmark job',
+                    target_language='nah',
+                    deliverable_types='text',
+                    amount_per_person=Decimal('1.00'),
+                    budget=Decimal(threads),
+                    funder=funder,
+                    status=status,
+                    max_responses=threads,
+                    recruit_limit=threads,
+                    submit_limit=threads,
+                )
+                for i in range(rounds)
+            ]
+
+        recruiting = create_jobs('recruiting')
+        submitting = create_jobs('submitting')
+        reviewing = create_jobs('reviewing')
+        for job in submitting:
+            JobApplication.objects.bulk_create([
+                JobApplication(job=job, applicant=worker, status='selected') for worker in workers
+            ])
+        for job in reviewing:
+            JobSubmission.objects.bulk_create([
+                JobSubmission(job=job, creator=worker, status='accepted', is_complete=True) for worker in workers
+            ])
+        return workers, recruiting, submitting, reviewing
+
+    def run_profile(self, profile, threads, rounds, webhook_errors):
+        with self.profile_database(profile):
+            call_command('migrate', verbosity=0, interactive=False)
+            workers, recruiting, submitting, reviewing = self.seed(threads, rounds)
+            connections.close_all()
+
+            counts = {'ok': 0, 'locked': 0, 'failed': 0}
+            lock = threading.Lock()
+            start_barrier = threading.Barrier(threads)
+
+            def count(outcome):
+                with lock:
+                    counts[outcome] += 1
+
+            def call(send, expected_status):
+                webhook_errors.pop_locked()
+                try:
+                    response = send()
+                except OperationalError as e:
+                    count('locked' if 'locked' in str(e) else 'failed')
+                    return
+                except Exception:
+                    count('failed')
+                    return
+                if response.status_code == expected_status:
+                    count('ok')
+                else:
+                    count('locked' if webhook_errors.pop_locked() else 'failed')
+
+            def worker_thread(worker):
+                client = Client()
+                client.force_login(worker)
+                start_barrier.wait()
+                try:
+                    for i in range(rounds):
+                        call(lambda: client.post(
+                            reverse('jobs:apply_to_job', args=[recruiting[i].pk]),
+                            {'profile_note': 'Benchmark application'},
+                        ), 302)
+                        call(lambda: client.post(
+                            reverse('jobs:submit', args=[submitting[i].pk]),
+                            {'note': 'Benchmark', 'text_content': 'Benchmark submission'},
+                        ), 302)
+                        call(lambda: client.post(
+                            reverse('payment_webhook'),
+                            json.dumps({
+                                'type': 'payment.completed', 'pendingId': f'bench-{i}',
+                                'offerId': str(reviewing[i].pk), 'status': 'paid',
+                            }),
+                            content_type='application/json',
+                        ), 200)
+                finally:
+                    connections.close_all()
+
+            pool = [threading.Thread(target=worker_thread, args=(worker,)) for worker in workers]
+            started = time.perf_counter()
+            for thread in pool:
+                thread.start()
+            for thread in pool:
+                thread.join()
+            seconds = time.perf_counter() - started
+
+        return {**counts, 'total': sum(counts.values()), 'seconds': seconds}
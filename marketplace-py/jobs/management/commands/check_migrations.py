@@ -0,0 +1,60 @@
+"""
+Management command to check that every migration, data migrations included,
+runs on the configured database backend.
+
+Runs against a scratch database (see marketplace.db.scratch_database): it
+migrates to just before the amount-per-person backfill, seeds jobs the way
+they looked then, applies everything else and verifies the backfilled data.
+Run it once per backend, e.g. with DATABASE_ENGINE=postgres.
+"""
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.migrations.executor import MigrationExecutor
+
+from marketplace.db import scratch_database
+
+BEFORE_BACKFILL = ('jobs', '0007_add_amount_per_person')
+
+# (status, budget, max_responses) -> (status, amount_per_person) after migrating
+SEED_JOBS = {
+    ('open', Decimal('30.00'), 3): ('recruiting', Decimal('10.00')),
+    ('completed', Decimal('12.50'), 0): ('complete', Decimal('12.50')),
+}
+
+
+class Command(BaseCommand):
+    help = 'Apply all migrations on a scratch database of the configured backend and verify data migrations'
+
+    def handle(self, *args, **options):
+        with scratch_database() as connection:
+            executor = MigrationExecutor(connection)
+            executor.migrate([BEFORE_BACKFILL])
+            apps = executor.loader.project_state([BEFORE_BACKFILL]).apps
+            funder = apps.get_model('users', 'User').objects.create(username='migration_check')
+            Job = apps.get_model('jobs', 'Job')
+            seeded = {}
+            for (status, budget, max_responses), expected in SEED_JOBS.items():
+                job = Job.objects.create(
+                    title=f'Migration check {status}', description='Seeded before 0008',
+                    target_language='nah', deliverable_types='audio', status=status,
+                    budget=budget, max_responses=max_responses, funder=funder,
+                )
+                seeded[job.pk] = expected
+
+            executor = MigrationExecutor(connection)
+            targets = executor.loader.graph.leaf_nodes()
+            executor.migrate(targets)
+            Job = executor.loader.project_state(targets).apps.get_model('jobs', 'Job')
+            migrated = {
+                pk: (status, amount)
+                for pk, status, amount in Job.objects.values_list('pk', 'status', 'amount_per_person')
+            }
+            applied = len(MigrationExecutor(connection).loader.applied_migrations)
+
+        for pk, expected in seeded.items():
+            if migrated.get(pk) != expected:
+                raise CommandError(f'Job {pk} migrated to {migrated.get(pk)}, expected {expected}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{applied} migrations applied on {connection.vendor}; seeded jobs migrated as expected'
+        ))
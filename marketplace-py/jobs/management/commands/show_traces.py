@@ -0,0 +1,86 @@
+"""
+Management command that prints traces written by the file exporter
+(TRACING_EXPORTER=file, see marketplace.tracing) as span trees with
+durations, slowest first, e.g. to see where a slow start_contract spent its
+time:
+
+    python manage.py show_traces --match start_contract --limit 3
+"""
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _attributes(span):
+    return {item['key']: next(iter(item['value'].values())) for item in span.get('attributes', [])}
+
+
+def _duration_ms(span):
+    return (int(span['endTimeUnixNano']) - int(span['startTimeUnixNano'])) / 1e6
+
+
+class Command(BaseCommand):
+    help = 'Print traces from the tracing file as span trees, slowest first'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='Trace file (default: TRACING_FILE)')
+        parser.add_argument('--trace', help='Only this trace id')
+        parser.add_argument('--match', help='Only traces with a span whose name contains this text')
+        parser.add_argument('--limit', type=int, default=5, help='Number of traces to print (default: 5)')
+
+    def handle(self, *args, **options):
+        path = options['file'] or settings.TRACING_FILE
+        traces = defaultdict(list)
+        try:
+            with open(path) as fh:
+                for line in fh:
+                    for resource in json.loads(line)['resourceSpans']:
+                        for scope in resource['scopeSpans']:
+                            for span in scope['spans']:
+                                traces[span['traceId']].append(span)
+        except OSError as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+
+        selected = [
+            spans for trace_id, spans in traces.items()
+            if (not options['trace'] or trace_id == options['trace'])
+            and (not options['match'] or any(options['match'] in span['name'] for span in spans))
+        ]
+        selected.sort(key=lambda spans: sum(_duration_ms(span) for span in self.roots(spans)), reverse=True)
+        for spans in selected[:options['limit']]:
+            self.print_trace(spans)
+
+    def roots(self, spans):
+        ids = {span['spanId'] for span in spans}
+        return [span for span in spans if span.get('parentSpanId') not in ids]
+
+    def print_trace(self, spans):
+        total = sum(_duration_ms(span) for span in self.roots(spans))
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Trace {spans[0]['traceId']} ({total:.1f} ms)"))
+        links = {link['traceId'] for span in spans for link in span.get('links', [])}
+        if links:
+            self.stdout.write(f"  linked to: {', '.join(sorted(links))}")
+
+        children = defaultdict(list)
+        for span in spans:
+            children[span.get('parentSpanId')].append(span)
+
+        def walk(span, depth):
+            attributes = _attributes(span)
+            label = span['name']
+            if 'db.statement' in attributes:
+                label += f" x{attributes['db.query_count']}: {attributes['db.statement'][:80]}"
+            elif 'http.url' in attributes:
+                label += f" {attributes['http.method']} {attributes['http.url']}"
+            elif 'model' in attributes:
+                label += f" {attributes['model']}"
+            if span.get('status', {}).get('code') == 'STATUS_CODE_ERROR':
+                label += f" [error: {span['status'].get('message', '')}]"
+            self.stdout.write(f"{_duration_ms(span):10.1f} ms  {'  ' * depth}{label}")
+            for child in sorted(children[span['spanId']], key=lambda s: int(s['startTimeUnixNano'])):
+                walk(child, depth + 1)
+
+        for root in sorted(self.roots(spans), key=lambda s: int(s['startTimeUnixNano'])):
+            walk(root, 0)
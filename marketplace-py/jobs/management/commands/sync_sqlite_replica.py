@@ -0,0 +1,50 @@
+"""
+Management command that copies the primary SQLite database into the replica
+file named by SQLITE_REPLICA_PATH: a local stand-in for streaming
+replication, for trying out marketplace.replicas with two SQLite files.
+"""
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the SQLite read replica (once or every --interval seconds)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep syncing every N seconds, emulating replication lag (default: sync once)',
+        )
+
+    def handle(self, *args, **options):
+        primary = connections['default'].settings_dict
+        replicas = [connections[alias].settings_dict for alias in settings.DATABASE_REPLICAS]
+        if primary['ENGINE'] != 'django.db.backends.sqlite3' or not replicas:
+            raise CommandError('Set SQLITE_REPLICA_PATH (with the SQLite backend) to use a replica file.')
+
+        while True:
+            started = time.perf_counter()
+            for replica in replicas:
+                self.copy(primary['NAME'], replica['NAME'])
+            self.stdout.write(
+                f'Replica synced in {(time.perf_counter() - started) * 1000:.1f} ms'
+            )
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, source_path, target_path):
+        # The backup API takes a consistent snapshot even while workers write
+        source = sqlite3.connect(source_path, timeout=settings.SQLITE_BUSY_TIMEOUT)
+        target = sqlite3.connect(target_path, timeout=settings.SQLITE_BUSY_TIMEOUT)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
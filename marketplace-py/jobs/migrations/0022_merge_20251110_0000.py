@@ -0,0 +1,14 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0020_add_payment_url'),
+        ('jobs', '0021_add_interact_ref_and_hash_to_pending_transaction'),
+    ]
+
+    operations = [
+    ]
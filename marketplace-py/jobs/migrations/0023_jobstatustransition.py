@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0022_merge_20251110_0000'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transition', models.CharField(max_length=50, verbose_name='Transition')),
+                ('from_status', models.CharField(choices=[('draft', 'Draft'), ('recruiting', 'Recruiting'), ('selecting', 'Selecting'), ('submitting', 'Submitting'), ('reviewing', 'Reviewing'), ('expired', 'Expired'), ('canceled', 'Canceled'), ('complete', 'Complete')], max_length=20, verbose_name='From Status')),
+                ('to_status', models.CharField(choices=[('draft', 'Draft'), ('recruiting', 'Recruiting'), ('selecting', 'Selecting'), ('submitting', 'Submitting'), ('reviewing', 'Reviewing'), ('expired', 'Expired'), ('canceled', 'Canceled'), ('complete', 'Complete')], max_length=20, verbose_name='To Status')),
+                ('reason', models.CharField(blank=True, max_length=255, verbose_name='Reason')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, help_text='User who triggered the transition; empty for automatic transitions', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job_status_transitions', to=settings.AUTH_USER_MODEL, verbose_name='Actor')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='jobs.job', verbose_name='Job')),
+            ],
+            options={
+                'verbose_name': 'Job Status Transition',
+                'verbose_name_plural': 'Job Status Transitions',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:25
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_accepted_count(apps, schema_editor):
+    """Initialise the counter from existing accepted, non-draft submissions."""
+    Job = apps.get_model('jobs', 'Job')
+    JobSubmission = apps.get_model('jobs', 'JobSubmission')
+
+    accepted = JobSubmission.objects.filter(
+        job=OuterRef('pk'), status='accepted', is_draft=False
+    ).values('job').annotate(total=Count('pk')).values('total')
+    Job.objects.update(accepted_count=Coalesce(Subquery(accepted), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0023_jobstatustransition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='accepted_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of accepted (non-draft) submissions, maintained by jobs.reviews', verbose_name='Accepted Submissions'),
+        ),
+        migrations.RunPython(backfill_accepted_count, migrations.RunPython.noop),
+    ]
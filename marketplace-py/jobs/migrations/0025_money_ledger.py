@@ -0,0 +1,98 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:33
+
+import django.db.models.deletion
+from django.conf import settings
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_settled_contracts(apps, schema_editor):
+    """Seed the ledger from contracts that were already paid out."""
+    Job = apps.get_model('jobs', 'Job')
+    JobSubmission = apps.get_model('jobs', 'JobSubmission')
+    LedgerEntry = apps.get_model('jobs', 'LedgerEntry')
+    MoneyBalance = apps.get_model('jobs', 'MoneyBalance')
+
+    entries = []
+    for job in Job.objects.filter(contract_completed=True):
+        budget = job.budget or Decimal('0')
+        per_person = job.amount_per_person or Decimal('0')
+        reference = job.payment_id or ''
+        entries.append(LedgerEntry(
+            user_id=job.funder_id, job=job, kind='contract_funded', amount=-budget,
+            key=f'job:{job.pk}:funded', reference=reference, memo=job.title[:255],
+        ))
+        paid_out = Decimal('0')
+        accepted = JobSubmission.objects.filter(job=job, status='accepted', is_draft=False).order_by('pk')
+        for submission in accepted:
+            entries.append(LedgerEntry(
+                user_id=submission.creator_id, job=job, kind='payout_sent', amount=per_person,
+                key=f'job:{job.pk}:payout:{submission.pk}', reference=reference, memo=job.title[:255],
+            ))
+            paid_out += per_person
+        if budget - paid_out > 0:
+            entries.append(LedgerEntry(
+                user_id=job.funder_id, job=job, kind='refund', amount=budget - paid_out,
+                key=f'job:{job.pk}:refund', reference=reference, memo=job.title[:255],
+            ))
+    LedgerEntry.objects.bulk_create(entries)
+
+    fields = {'contract_funded': 'total_spent', 'payout_sent': 'total_earned', 'refund': 'total_refunded'}
+    balances = {}
+    for entry in entries:
+        balance = balances.setdefault(entry.user_id, MoneyBalance(user_id=entry.user_id))
+        total_field = fields[entry.kind]
+        setattr(balance, total_field, getattr(balance, total_field) + abs(entry.amount))
+        balance.balance += entry.amount
+        balance.entries_count += 1
+    MoneyBalance.objects.bulk_create(balances.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0024_job_accepted_count'),
+        ('users', '0007_remove_wallet_endpoint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MoneyBalance',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='money_balance', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='User')),
+                ('total_earned', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total Earned')),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total Spent')),
+                ('total_refunded', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total Refunded')),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Balance')),
+                ('entries_count', models.PositiveIntegerField(default=0, verbose_name='Entries')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Money Balance',
+                'verbose_name_plural': 'Money Balances',
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('contract_funded', 'Contract funded'), ('payout_sent', 'Payout sent'), ('refund', 'Refund')], max_length=20, verbose_name='Kind')),
+                ('amount', models.DecimalField(decimal_places=2, help_text='Signed amount in pesos (negative when money leaves the user)', max_digits=12, verbose_name='Amount')),
+                ('key', models.CharField(max_length=255, unique=True, verbose_name='Idempotency Key')),
+                ('reference', models.CharField(blank=True, help_text='Payment id from the payments service or wallet, if any', max_length=255, verbose_name='Reference')),
+                ('memo', models.CharField(blank=True, max_length=255, verbose_name='Memo')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='jobs.job', verbose_name='Job')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Ledger Entry',
+                'verbose_name_plural': 'Ledger Entries',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='ledger_user_created_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_settled_contracts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0025_money_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', '-created_at'], name='job_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['target_language', 'status'], name='job_language_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['funder', '-created_at'], name='job_funder_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['applicant', 'status'], name='jobapp_applicant_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobsubmission',
+            index=models.Index(fields=['job', 'status'], name='jobsub_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobsubmission',
+            index=models.Index(fields=['creator', 'status'], name='jobsub_creator_status_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0026_hot_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='jobapp_applicant_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(condition=models.Q(('status', 'selected')), fields=['applicant', 'job'], name='jobapp_selected_applicant_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='jobsubmission',
+            name='jobsub_job_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='jobsubmission',
+            index=models.Index(condition=models.Q(('is_draft', False)), fields=['job', 'status'], name='jobsub_final_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobsubmission',
+            index=models.Index(fields=['job', 'creator', 'is_draft'], name='jobsub_job_creator_draft_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0027_partial_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10, verbose_name='Method')),
+                ('path', models.CharField(max_length=500, verbose_name='URL')),
+                ('view', models.CharField(max_length=100, verbose_name='View')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='Status Code')),
+                ('duration_ms', models.FloatField(verbose_name='Duration (ms)')),
+                ('samples', models.PositiveIntegerField(verbose_name='Samples')),
+                ('interval_ms', models.FloatField(verbose_name='Sampling Interval (ms)')),
+                ('stacks', models.TextField(blank=True, verbose_name='Stacks')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_profiles', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Request Profile',
+                'verbose_name_plural': 'Request Profiles',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
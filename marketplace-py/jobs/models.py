@@ -2,14 +2,15 @@ from decimal import Decimal
 from datetime import timedelta
 
 from django.db import models
-from django.db.models import Sum
+from django.db.models import Q, Sum
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.urls import reverse
 from users.models import User
+from utilities.dirty_fields import DirtyFieldsMixin
 
 
-class Job(models.Model):
+class Job(DirtyFieldsMixin, models.Model):
     """Job/Brief model for funders to post work."""
     
     STATUS_CHOICES = [
@@ -187,6 +188,12 @@ class Job(models.Model):
         verbose_name=_('Maximum Responses'),
         help_text=_('Number of responses/submissions needed for this job (e.g., if you want 20 people to do the same voice or picture set)')
     )
+    accepted_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Accepted Submissions'),
+        help_text=_('Number of accepted (non-draft) submissions, maintained by jobs.reviews')
+    )
     
     # Recruiting limits
     recruit_limit = models.PositiveIntegerField(
@@ -233,6 +240,13 @@ class Job(models.Model):
         verbose_name = _('Job')
         verbose_name_plural = _('Jobs')
         ordering = ['-created_at']
+        indexes = [
+            # Public list and pending pages: status filter, newest first
+            models.Index(fields=['status', '-created_at'], name='job_status_created_idx'),
+            models.Index(fields=['target_language', 'status'], name='job_language_status_idx'),
+            # Funder pages (my jobs, owner dashboard)
+            models.Index(fields=['funder', '-created_at'], name='job_funder_created_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -259,7 +273,7 @@ class Job(models.Model):
     
     def get_accepted_submissions_count(self):
         """Get count of accepted submissions (excluding drafts)."""
-        return self.submissions.filter(status='accepted', is_draft=False).count()
+        return self.accepted_count
     
     def get_pending_submissions_count(self):
         """Get count of pending submissions (excluding drafts)."""
@@ -285,6 +299,8 @@ class Job(models.Model):
     
     def get_applications_count(self):
         """Get count of all applications for this job."""
+        if hasattr(self, 'applications_total'):  # annotated by jobs.view_models
+            return self.applications_total
         return self.applications.count()
     
     def has_reached_recruit_limit(self):
@@ -305,6 +321,8 @@ class Job(models.Model):
     
     def get_submissions_count(self):
         """Get count of all submissions for this job (excluding drafts)."""
+        if hasattr(self, 'submissions_total'):  # annotated by jobs.view_models
+            return self.submissions_total
         return self.submissions.filter(is_draft=False).count()
     
     def has_reached_submit_limit(self):
@@ -344,6 +362,16 @@ class Job(models.Model):
         
         return False
     
+    def apply_transition(self, name, actor=None, reason='', strict=False, **fields):
+        """Perform a named status transition (see ``jobs.state_machine``)."""
+        from .state_machine import transition
+        return transition(self, name, actor=actor, reason=reason, strict=strict, **fields)
+    
+    def apply_automatic_transitions(self, changed_fields=None):
+        """Apply any limit/deadline transition that is due; returns its name or None."""
+        from .state_machine import apply_automatic_transitions
+        return apply_automatic_transitions(self, changed_fields=changed_fields)
+    
     def save(self, *args, **kwargs):
         """Override save to set default deadlines if not provided."""
         # Set default recruit_deadline to 7 days from creation if not set and this is a new job
@@ -351,45 +379,74 @@ class Job(models.Model):
         if is_new and not self.recruit_deadline:
             self.recruit_deadline = timezone.now() + timedelta(days=7)
         
-        # Set default submit_deadline when transitioning to submitting state
-        # Check if status is being changed to 'submitting'
-        if self.pk:
-            old_job = Job.objects.filter(pk=self.pk).first()
-            if old_job and old_job.status != 'submitting' and self.status == 'submitting':
-                # Transitioning to submitting state - set deadline if not already set
-                if not self.submit_deadline:
-                    # Use submit_deadline_days to calculate the deadline
-                    days = self.submit_deadline_days if self.submit_deadline_days else 7
-                    self.submit_deadline = timezone.now() + timedelta(days=days)
-        elif self.status == 'submitting' and not self.submit_deadline:
-            # New job created directly in submitting state
+        # A job in submitting state always needs a submit deadline. Transitions
+        # made through the state machine set it in their UPDATE; this covers
+        # jobs created directly in submitting state (fixtures, admin).
+        if self.status == 'submitting' and not self.submit_deadline:
             days = self.submit_deadline_days if self.submit_deadline_days else 7
             self.submit_deadline = timezone.now() + timedelta(days=days)
         
-        # Save the job first
-        super().save(*args, **kwargs)
-        
-        # Auto-transition from recruiting to selecting if conditions are met
-        # Only check after initial save to avoid recursion
-        if self.should_transition_to_selecting():
-            # Use update to avoid recursion
-            Job.objects.filter(pk=self.pk).update(status='selecting')
-            self.status = 'selecting'
+        # Capture what changed before the save resets the snapshot
+        changed_fields = set(self.get_dirty_fields(kwargs.get('update_fields')))
         
-        # Auto-transition from submitting to reviewing if conditions are met
-        if self.should_transition_to_reviewing():
-            # Use update to avoid recursion
-            Job.objects.filter(pk=self.pk).update(status='reviewing')
-            self.status = 'reviewing'
+        super().save(*args, **kwargs)
         
-        # Auto-transition to expired if conditions are met
-        if self.should_expire():
-            # Use update to avoid recursion
-            Job.objects.filter(pk=self.pk).update(status='expired')
-            self.status = 'expired'
+        # Auto-transition (recruiting -> selecting, submitting -> reviewing,
+        # -> expired) if limits or deadlines have been reached. Only
+        # transitions whose inputs changed in this save are evaluated.
+        if changed_fields:
+            self.apply_automatic_transitions(changed_fields=changed_fields)
 
 
-class JobSubmission(models.Model):
+class JobStatusTransition(models.Model):
+    """Audit log of job status changes made through the state machine."""
+    
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='status_transitions',
+        verbose_name=_('Job')
+    )
+    transition = models.CharField(
+        max_length=50,
+        verbose_name=_('Transition')
+    )
+    from_status = models.CharField(
+        max_length=20,
+        choices=Job.STATUS_CHOICES,
+        verbose_name=_('From Status')
+    )
+    to_status = models.CharField(
+        max_length=20,
+        choices=Job.STATUS_CHOICES,
+        verbose_name=_('To Status')
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='job_status_transitions',
+        verbose_name=_('Actor'),
+        help_text=_('User who triggered the transition; empty for automatic transitions')
+    )
+    reason = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('Reason')
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Job Status Transition')
+        verbose_name_plural = _('Job Status Transitions')
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.job_id}: {self.from_status} -> {self.to_status} ({self.transition})"
+
+
+class JobSubmission(DirtyFieldsMixin, models.Model):
     """Submission model for creators to submit work for jobs."""
     
     STATUS_CHOICES = [
@@ -469,6 +526,14 @@ class JobSubmission(models.Model):
         verbose_name = _('Job Submission')
         verbose_name_plural = _('Job Submissions')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['creator', 'status'], name='jobsub_creator_status_idx'),
+            # Review, payout and dashboard counts only ever look at final submissions;
+            # other per-job lookups use the job prefix of the index below
+            models.Index(fields=['job', 'status'], condition=Q(is_draft=False), name='jobsub_final_job_status_idx'),
+            # Submit page: the viewer's draft / final submission for one job
+            models.Index(fields=['job', 'creator', 'is_draft'], name='jobsub_job_creator_draft_idx'),
+        ]
     
     def __str__(self):
         return f"{self.creator.username} - {self.job.title}"
@@ -487,7 +552,7 @@ class JobSubmission(models.Model):
     )
 
 
-class JobApplication(models.Model):
+class JobApplication(DirtyFieldsMixin, models.Model):
     """Application model for workers to submit their profile/interest in a job."""
     
     STATUS_CHOICES = [
@@ -554,6 +619,11 @@ class JobApplication(models.Model):
         verbose_name_plural = _('Job Applications')
         ordering = ['-created_at']
         unique_together = [['job', 'applicant']]
+        indexes = [
+            # Job list: jobs waiting for the viewer's submission (the only
+            # applicant + status lookup; applicant alone uses the FK index)
+            models.Index(fields=['applicant', 'job'], condition=Q(status='selected'), name='jobapp_selected_applicant_idx'),
+        ]
     
     def __str__(self):
         return f"{self.applicant.get_display_name()} - {self.job.title}"
@@ -638,3 +708,147 @@ class PendingPaymentTransaction(models.Model):
     
     def __str__(self):
         return f"PendingTransaction-{self.contract_id}"
+
+
+class LedgerEntry(models.Model):
+    """
+    Append-only record of a money movement for one user.
+    
+    Amounts are signed from the user's point of view: funding a contract is
+    negative, payouts and refunds are positive. Entries are written through
+    ``jobs.ledger`` which also keeps ``MoneyBalance`` in step; ``key`` makes
+    every write idempotent so webhook retries never double count.
+    """
+    
+    KIND_CHOICES = [
+        ('contract_funded', _('Contract funded')),
+        ('payout_sent', _('Payout sent')),
+        ('refund', _('Refund')),
+    ]
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name='ledger_entries',
+        verbose_name=_('User')
+    )
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ledger_entries',
+        verbose_name=_('Job')
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        verbose_name=_('Kind')
+    )
+    amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        verbose_name=_('Amount'),
+        help_text=_('Signed amount in pesos (negative when money leaves the user)')
+    )
+    key = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name=_('Idempotency Key')
+    )
+    reference = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('Reference'),
+        help_text=_('Payment id from the payments service or wallet, if any')
+    )
+    memo = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('Memo')
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Ledger Entry')
+        verbose_name_plural = _('Ledger Entries')
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='ledger_user_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} {self.kind} {self.amount}"
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Ledger entries are append-only")
+        super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        raise ValueError("Ledger entries are append-only")
+
+
+class MoneyBalance(models.Model):
+    """Per-user running totals of ``LedgerEntry`` rows, updated incrementally."""
+    
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='money_balance',
+        verbose_name=_('User')
+    )
+    total_earned = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name=_('Total Earned'))
+    total_spent = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name=_('Total Spent'))
+    total_refunded = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name=_('Total Refunded'))
+    balance = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name=_('Balance'))
+    entries_count = models.PositiveIntegerField(default=0, verbose_name=_('Entries'))
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = _('Money Balance')
+        verbose_name_plural = _('Money Balances')
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.balance}"
+
+
+class RequestProfile(models.Model):
+    """
+    Sampled call stacks of one request, recorded on demand by
+    ``marketplace.profiling.ProfilingMiddleware``.
+    
+    ``stacks`` is in the collapsed ("folded") format read by flamegraph.pl,
+    speedscope and inferno: one ``root;caller;callee count`` line per stack.
+    """
+    
+    method = models.CharField(max_length=10, verbose_name=_('Method'))
+    path = models.CharField(max_length=500, verbose_name=_('URL'))
+    view = models.CharField(max_length=100, verbose_name=_('View'))
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='request_profiles',
+        verbose_name=_('User')
+    )
+    status_code = models.PositiveSmallIntegerField(verbose_name=_('Status Code'))
+    duration_ms = models.FloatField(verbose_name=_('Duration (ms)'))
+    samples = models.PositiveIntegerField(verbose_name=_('Samples'))
+    interval_ms = models.FloatField(verbose_name=_('Sampling Interval (ms)'))
+    stacks = models.TextField(blank=True, verbose_name=_('Stacks'))
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Request Profile')
+        verbose_name_plural = _('Request Profiles')
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+    
+    @property
+    def filename(self):
+        return f"profile-{self.view.replace(':', '-')}-{self.created_at:%Y%m%d-%H%M%S}-{self.pk}.folded"
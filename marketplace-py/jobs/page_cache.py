@@ -0,0 +1,142 @@
+"""
+Full-page cache for anonymous visitors of the public job pages.
+
+``anonymous_page_cache(tags)`` caches a view's rendered HTML for anonymous GET
+requests, keyed by path and query string, UI language, preferred audio
+language and the current version of each of the page's tags. Invalidation is
+a version bump per tag (``invalidate('jobs')``, ``invalidate_job(pk)``), done
+by the signals in ``jobs.signals`` and by bulk updates that bypass them, so
+stale pages simply stop being looked up.
+
+Pages embed a CSRF token (the language selector form), so the cached token is
+swapped for the visitor's own on every hit. Signed-in users are never served
+from this cache; they still get the shared fragment caches in base.html.
+"""
+import hashlib
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from audio.mixins import get_static_ui_version
+from marketplace.config import get_language_preferences
+
+CSRF_INPUT_RE = re.compile(rb'name="csrfmiddlewaretoken" value="([A-Za-z0-9]+)"')
+
+
+def _tag_key(tag):
+    return f'page_tag:{tag}'
+
+
+def tag_version(tag):
+    """Current version of ``tag``, kept in the default cache (created on first use)."""
+    key = _tag_key(tag)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock rather than 1 so a version that was evicted never
+        # comes back at a value whose pages are still cached
+        cache.add(key, time.time_ns() // 1000, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(*tags):
+    """Drop every cached page carrying any of ``tags`` (after the current transaction commits)."""
+    def bump():
+        for tag in tags:
+            key = _tag_key(tag)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns() // 1000, None)
+    transaction.on_commit(bump)
+
+
+def invalidate_job(job_id):
+    """A job, its counts or its audio changed: drop its detail page and the job list."""
+    invalidate('jobs', f'job:{job_id}')
+
+
+def _page_key(request, tags):
+    preferences = get_language_preferences(request)
+    versions = ','.join(f'{tag}={tag_version(tag)}' for tag in tags)
+    raw = '|'.join([
+        request.get_full_path(),
+        getattr(request, 'LANGUAGE_CODE', settings.LANGUAGE_CODE),
+        preferences.preferred_audio_language,
+        f'static_ui={get_static_ui_version()}',
+        versions,
+    ])
+    return 'page:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def _cacheable_request(request):
+    return (
+        request.method in ('GET', 'HEAD') and
+        not request.user.is_authenticated and
+        # Flash messages are rendered into the page and must not be cached or skipped
+        not len(messages.get_messages(request))
+    )
+
+
+def _patch_headers(response, anonymous):
+    patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+    proxy_seconds = getattr(settings, 'PAGE_CACHE_PROXY_SECONDS', 0)
+    if anonymous and proxy_seconds > 0:
+        # Browsers revalidate; a shared proxy (which varies on Cookie) may keep it briefly
+        patch_cache_control(response, public=True, max_age=0, s_maxage=proxy_seconds)
+    else:
+        patch_cache_control(response, private=True, max_age=0)
+
+
+def anonymous_page_cache(tags):
+    """
+    Cache a view's HTML for anonymous visitors.
+
+    Args:
+        tags: Callable ``(request, *args, **kwargs) -> list of tags`` naming
+            what the page shows (e.g. ``['jobs']`` or ``['job:12']``).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 60)
+            anonymous = not request.user.is_authenticated
+            if timeout <= 0 or not _cacheable_request(request):
+                response = view(request, *args, **kwargs)
+                _patch_headers(response, anonymous=False)
+                return response
+
+            key = _page_key(request, tags(request, *args, **kwargs))
+            cached = cache.get(key)
+            if cached is not None:
+                content = cached['content']
+                if cached['csrf_token']:
+                    content = content.replace(cached['csrf_token'], get_token(request).encode())
+                response = HttpResponse(content, content_type=cached['content_type'])
+                response['X-Page-Cache'] = 'hit'
+                _patch_headers(response, anonymous)
+                return response
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                if hasattr(response, 'render') and not response.is_rendered:
+                    response.render()
+                match = CSRF_INPUT_RE.search(response.content)
+                cache.set(key, {
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'csrf_token': match.group(1) if match else b'',
+                }, timeout)
+                response['X-Page-Cache'] = 'miss'
+            _patch_headers(response, anonymous)
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,301 @@
+"""Pooled, fault-tolerant HTTP client for the payments service."""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from marketplace import tracing
+from marketplace.metrics import PAYMENTS_SERVICE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# Only these methods are retried automatically; POSTs may create payments twice.
+# Calls with side effects despite their method (``finish_payment``) opt out
+# with ``replay=False``.
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+
+class PaymentsServiceError(Exception):
+    """Raised when the payments service cannot complete a request."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, payload: Optional[dict] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.payload = payload or {}
+
+
+class PaymentsServiceUnavailable(PaymentsServiceError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Classic closed/open/half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and every
+    call fails fast for ``reset_timeout`` seconds. The first call after that
+    window is let through as a probe: success closes the breaker, failure
+    re-opens it for another window.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        """Return True if a call may proceed (claims the probe slot when half-open)."""
+        with self._lock:
+            state = self._state_locked()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+@dataclass
+class EndpointStats:
+    """Latency and outcome counters for one payments-service endpoint."""
+    calls: int = 0
+    errors: int = 0
+    short_circuited: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+@dataclass
+class PaymentsClientMetrics:
+    """Thread-safe in-process metrics, keyed by ``"<METHOD> <path>"``."""
+    endpoints: Dict[str, EndpointStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def observe(self, endpoint: str, seconds: float, error: bool) -> None:
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if error:
+                stats.errors += 1
+
+    def short_circuit(self, endpoint: str) -> None:
+        with self._lock:
+            self.endpoints.setdefault(endpoint, EndpointStats()).short_circuited += 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                name: {
+                    'calls': s.calls,
+                    'errors': s.errors,
+                    'short_circuited': s.short_circuited,
+                    'avg_seconds': s.avg_seconds,
+                    'max_seconds': s.max_seconds,
+                }
+                for name, s in self.endpoints.items()
+            }
+
+
+class PaymentsServiceClient:
+    """
+    Client for the Node payments service at ``PAYMENTS_SERVICE_URL``.
+
+    A single instance is shared per process (see ``get_payments_client``) so the
+    underlying ``requests.Session`` keeps its keep-alive connection pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff_factor: float = 0.3,
+        pool_size: int = 10,
+        breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[PaymentsClientMetrics] = None,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics or PaymentsClientMetrics()
+        self.session = requests.Session()
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Only failed connections are retried here: the request never reached
+        # the service. A read timeout or 5xx may follow a side effect.
+        self.no_replay_session = requests.Session()
+        no_replay = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=backoff_factor,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=no_replay)
+        self.no_replay_session.mount('http://', adapter)
+        self.no_replay_session.mount('https://', adapter)
+
+    def request(self, method: str, path: str, replay: bool = True, **kwargs) -> Dict[str, Any]:
+        """
+        Send a request and return the decoded JSON body.
+
+        Args:
+            replay: Whether idempotent methods may be retried after read
+                timeouts and 502/503/504. Pass False for calls that change
+                state on the service.
+
+        Raises:
+            PaymentsServiceUnavailable: the breaker is open; no request was sent.
+            PaymentsServiceError: transport failure or non-2xx response.
+        """
+        method = method.upper()
+        endpoint = f"{method} {path}"
+        if not self.breaker.allow_request():
+            self.metrics.short_circuit(endpoint)
+            raise PaymentsServiceUnavailable('Payments service is temporarily unavailable')
+
+        kwargs.setdefault('timeout', self.timeout)
+        # Lets the service continue our trace and send it back on its webhooks
+        kwargs['headers'] = tracing.inject(dict(kwargs.get('headers') or {}))
+        started = time.perf_counter()
+        try:
+            session = self.session if replay else self.no_replay_session
+            response = session.request(method, f"{self.base_url}{path}", **kwargs)
+        except requests.exceptions.RequestException as e:
+            self._finish(endpoint, started, failed=True)
+            logger.error(f"Error connecting to payments service ({endpoint}): {str(e)}")
+            raise PaymentsServiceError(f"Could not connect to payments service: {str(e)}") from e
+
+        # 5xx means the service is unhealthy; 4xx is a caller problem and must
+        # not trip the breaker.
+        self._finish(endpoint, started, failed=response.status_code >= 500)
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if not response.ok:
+            error_msg = data.get('error') if isinstance(data, dict) else None
+            error_msg = error_msg or response.text or f"Payments service returned status {response.status_code}"
+            raise PaymentsServiceError(error_msg, status_code=response.status_code, payload=data)
+        return data
+
+    def _finish(self, endpoint: str, started: float, failed: bool) -> None:
+        elapsed = time.perf_counter() - started
+        self.metrics.observe(endpoint, elapsed, error=failed)
+        PAYMENTS_SERVICE_LATENCY.observe(elapsed, endpoint=endpoint, outcome='error' if failed else 'ok')
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def get(self, path: str, **kwargs) -> Dict[str, Any]:
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> Dict[str, Any]:
+        return self.request('POST', path, **kwargs)
+
+    def create_incoming_payment(self, amount: str, description: str) -> Dict[str, Any]:
+        """Create an incoming payment (escrow). Never retried: POST is not idempotent."""
+        return self.post('/api/payments/incoming', json={'amount': amount, 'description': description})
+
+    def finish_payment(self, pending_id: str, interact_ref: str, hash_value: str) -> Dict[str, Any]:
+        """Finalize the buyer's grant after the wallet redirect. Not replayed: it changes state."""
+        return self.request('GET', '/payments/finish', replay=False, params={
+            'pendingId': pending_id,
+            'interact_ref': interact_ref,
+            'hash': hash_value,
+        })
+
+
+_client: Optional[PaymentsServiceClient] = None
+_client_lock = threading.Lock()
+
+
+def get_payments_client() -> PaymentsServiceClient:
+    """Return the process-wide payments client, creating it from settings on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PaymentsServiceClient(
+                    base_url=settings.PAYMENTS_SERVICE_URL,
+                    connect_timeout=settings.PAYMENTS_SERVICE_CONNECT_TIMEOUT,
+                    read_timeout=settings.PAYMENTS_SERVICE_READ_TIMEOUT,
+                    max_retries=settings.PAYMENTS_SERVICE_MAX_RETRIES,
+                    backoff_factor=settings.PAYMENTS_SERVICE_RETRY_BACKOFF,
+                    pool_size=settings.PAYMENTS_SERVICE_POOL_SIZE,
+                    breaker=CircuitBreaker(
+                        failure_threshold=settings.PAYMENTS_SERVICE_BREAKER_THRESHOLD,
+                        reset_timeout=settings.PAYMENTS_SERVICE_BREAKER_RESET_SECONDS,
+                    ),
+                )
+    return _client
+
+
+def reset_payments_client() -> None:
+    """Drop the shared client (used by tests and after settings changes)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.session.close()
+            _client.no_replay_session.close()
+        _client = None
@@ -0,0 +1,297 @@
+"""
+Submission review (accept/reject) operations.
+
+Acceptance is bounded by ``Job.max_responses``. Instead of counting accepted
+submissions and then saving (which lets two reviewers both pass the check),
+slots are reserved with one conditional UPDATE against ``Job.accepted_count``:
+
+    UPDATE jobs_job SET accepted_count = accepted_count + n
+    WHERE id = <pk> AND accepted_count + n <= max_responses
+
+The database serializes those updates on the job row, so the counter can never
+exceed the limit. Submissions are then flipped with a single
+``UPDATE ... WHERE id IN (...)``, so reviewing a job with hundreds of
+submissions is a handful of statements in one transaction, whatever the
+batch size.
+
+Those bulk UPDATEs keep the counter in step themselves; every other change
+to a submission (``save()``, admin edits, deletes including cascades) goes
+through the signals in ``jobs.signals``, which call ``adjust_accepted``.
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .page_cache import invalidate_job
+
+# Attempts to reserve slots when other reviewers keep changing the counter
+MAX_RESERVE_ATTEMPTS = 3
+
+
+@dataclass
+class ReviewResult:
+    """Outcome of a single or bulk review call."""
+    accepted: List[int] = field(default_factory=list)
+    rejected: List[int] = field(default_factory=list)
+    # Requested ids left untouched (already in that state, draft, or no slot left)
+    skipped: List[int] = field(default_factory=list)
+    accepted_count: int = 0
+    max_responses: int = 0
+
+    @property
+    def limit_reached(self):
+        return self.accepted_count >= self.max_responses
+
+
+def _reserve_slots(job_pk, wanted):
+    """
+    Atomically add up to ``wanted`` to the job's accepted counter.
+
+    Returns:
+        Number of slots actually reserved (0 if the job is full).
+    """
+    from .models import Job
+
+    for _attempt in range(MAX_RESERVE_ATTEMPTS):
+        if wanted <= 0:
+            return 0
+        reserved = Job.objects.filter(
+            pk=job_pk,
+            accepted_count__lte=F('max_responses') - wanted,
+        ).update(accepted_count=F('accepted_count') + wanted)
+        if reserved:
+            return wanted
+        # Not enough room for the whole batch: shrink it to what is left
+        row = Job.objects.filter(pk=job_pk).values('accepted_count', 'max_responses').first()
+        if row is None:
+            return 0
+        wanted = min(wanted, row['max_responses'] - row['accepted_count'])
+    return 0
+
+
+def _release_slots(job_pk, count):
+    from .models import Job
+
+    if count > 0:
+        Job.objects.filter(pk=job_pk, accepted_count__gte=count).update(
+            accepted_count=F('accepted_count') - count
+        )
+
+
+def counts_as_accepted(status, is_draft):
+    """True if a submission in this state holds one of its job's slots."""
+    return status == 'accepted' and not is_draft
+
+
+def adjust_accepted(job_pk, delta):
+    """
+    Move the job's accepted counter by ``delta`` after a submission was saved
+    or deleted outside this module (admin, cascades, ``save()`` calls).
+
+    Unlike ``_reserve_slots`` this is not bounded by ``max_responses``: the
+    submission already changed, and the counter has to reflect it.
+    """
+    from .models import Job
+
+    if delta > 0:
+        Job.objects.filter(pk=job_pk).update(accepted_count=F('accepted_count') + delta)
+    else:
+        _release_slots(job_pk, -delta)
+
+
+def _refresh_counter(job, result):
+    from .models import Job
+
+    row = Job.objects.filter(pk=job.pk).values('accepted_count', 'max_responses').get()
+    job.accepted_count = row['accepted_count']
+    job.max_responses = row['max_responses']
+    job.reset_dirty_fields(['accepted_count', 'max_responses'])
+    result.accepted_count = row['accepted_count']
+    result.max_responses = row['max_responses']
+
+
+def accept_submissions(job, submission_ids, actor=None):
+    """
+    Accept the given submissions of ``job`` in one transaction.
+
+    Submissions are accepted in the order given until ``max_responses`` is
+    reached; the rest are reported as skipped. Accepted submissions are
+    marked complete (submitting work IS completing the work). When the job
+    only needs one response every other submission is rejected, and the
+    first acceptance moves the job to reviewing.
+
+    Args:
+        job: Job instance.
+        submission_ids: Iterable of JobSubmission primary keys.
+        actor: Reviewer, recorded on the status transition.
+
+    Returns:
+        ReviewResult with the ids accepted/skipped and the new accepted count.
+    """
+    from .models import JobSubmission
+
+    requested = list(dict.fromkeys(int(pk) for pk in submission_ids))
+    result = ReviewResult()
+
+    with transaction.atomic():
+        # Row locks make a concurrent review of the same submissions wait here
+        candidate_set = set(
+            JobSubmission.objects.select_for_update()
+            .filter(job=job, pk__in=requested, is_draft=False)
+            .exclude(status='accepted')
+            .order_by()
+            .values_list('pk', flat=True)
+        )
+        candidates = [pk for pk in requested if pk in candidate_set]
+
+        reserved = _reserve_slots(job.pk, len(candidates))
+        chosen = candidates[:reserved]
+        if chosen:
+            now = timezone.now()
+            updated = JobSubmission.objects.filter(pk__in=chosen).exclude(status='accepted').update(
+                status='accepted', is_complete=True, completed_at=now, updated_at=now,
+            )
+            # Defensive: hand back slots for rows that changed under us (backends
+            # without row locks)
+            _release_slots(job.pk, reserved - updated)
+        result.accepted = chosen
+
+        if result.accepted and job.max_responses == 1:
+            result.rejected = list(
+                job.submissions.exclude(pk__in=result.accepted).exclude(status='rejected')
+                .values_list('pk', flat=True)
+            )
+            job.submissions.filter(pk__in=result.rejected).update(
+                status='rejected', updated_at=timezone.now()
+            )
+
+        _refresh_counter(job, result)
+
+    accepted_set = set(result.accepted)
+    result.skipped = [pk for pk in requested if pk not in accepted_set]
+    if result.accepted or result.rejected:
+        # Bulk UPDATEs send no model signals
+        invalidate_job(job.pk)
+
+    if result.accepted:
+        # Job should NEVER automatically jump to complete - it stays in reviewing
+        # until all accepted submissions are complete AND the job owner confirms
+        job.apply_transition('begin_review', actor=actor, reason='submission accepted')
+    return result
+
+
+def reject_submissions(job, submission_ids):
+    """
+    Reject the given submissions of ``job`` in one transaction.
+
+    Rejecting a previously accepted submission frees its slot.
+
+    Returns:
+        ReviewResult with the ids rejected/skipped and the new accepted count.
+    """
+    from .models import JobSubmission
+
+    requested = list(dict.fromkeys(int(pk) for pk in submission_ids))
+    result = ReviewResult()
+
+    with transaction.atomic():
+        targets = JobSubmission.objects.filter(job=job, pk__in=requested).exclude(status='rejected')
+        rows = list(targets.select_for_update().order_by().values_list('pk', 'status', 'is_draft'))
+        if rows:
+            targets.update(status='rejected', updated_at=timezone.now())
+        freed = sum(1 for _pk, status, is_draft in rows if status == 'accepted' and not is_draft)
+        _release_slots(job.pk, freed)
+        _refresh_counter(job, result)
+
+    if rows:
+        invalidate_job(job.pk)
+    rejected_set = {pk for pk, _status, _draft in rows}
+    result.rejected = [pk for pk in requested if pk in rejected_set]
+    result.skipped = [pk for pk in requested if pk not in rejected_set]
+    return result
+
+
+def recount_accepted(job):
+    """Recompute ``accepted_count`` from the submissions table (repair/backfill)."""
+    from .models import Job
+
+    count = job.submissions.filter(status='accepted', is_draft=False).count()
+    Job.objects.filter(pk=job.pk).update(accepted_count=count)
+    invalidate_job(job.pk)
+    job.accepted_count = count
+    job.reset_dirty_fields(['accepted_count'])
+    return count
+
+
+# Application triage: request action -> JobApplication.status
+APPLICATION_ACTIONS = {
+    'approve': 'selected',
+    'select': 'selected',
+    'reject': 'rejected',
+    'pending': 'pending',
+}
+
+
+def triage_applications(job, application_ids, action):
+    """
+    Set the status of many applications of ``job`` with one UPDATE.
+
+    The recruit-limit/deadline transition check runs once at the end instead
+    of once per application.
+
+    Args:
+        job: Job instance.
+        application_ids: Iterable of JobApplication primary keys.
+        action: Key of ``APPLICATION_ACTIONS``.
+
+    Returns:
+        JSON-serialisable diff::
+
+            {
+                'status': 'selected',
+                'changed': [{'id': 3, 'from': 'pending', 'to': 'selected'}],
+                'unchanged': [4],       # already in the target status
+                'missing': [99],        # not an application of this job
+                'counts': {'pending': 2, 'selected': 3, 'rejected': 1},
+                'job_status': 'recruiting',
+                'transition': None,     # automatic transition applied, if any
+            }
+    """
+    from django.db.models import Count, Q
+
+    from .models import JobApplication
+
+    status = APPLICATION_ACTIONS[action]
+    requested = list(dict.fromkeys(int(pk) for pk in application_ids))
+
+    with transaction.atomic():
+        current = dict(
+            JobApplication.objects.select_for_update()
+            .filter(job=job, pk__in=requested)
+            .order_by()
+            .values_list('pk', 'status')
+        )
+        to_change = [pk for pk in requested if pk in current and current[pk] != status]
+        if to_change:
+            JobApplication.objects.filter(pk__in=to_change).update(
+                status=status, updated_at=timezone.now()
+            )
+        counts = job.applications.aggregate(
+            **{key: Count('pk', filter=Q(status=key)) for key, _label in JobApplication.STATUS_CHOICES}
+        )
+
+    if to_change:
+        invalidate_job(job.pk)
+    applied = job.apply_automatic_transitions()
+    return {
+        'status': status,
+        'changed': [{'id': pk, 'from': current[pk], 'to': status} for pk in to_change],
+        'unchanged': [pk for pk in requested if pk in current and current[pk] == status],
+        'missing': [pk for pk in requested if pk not in current],
+        'counts': counts,
+        'job_status': job.status,
+        'transition': applied,
+    }
@@ -0,0 +1,68 @@
+"""
+Signals for the jobs app.
+Invalidate cached anonymous job pages when what they show changes, and keep
+``Job.accepted_count`` in step with submissions saved or deleted outside
+``jobs.reviews``.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from audio.models import AudioSnippet
+from .models import Job, JobApplication, JobStatusTransition, JobSubmission
+from .page_cache import invalidate_job
+from .reviews import adjust_accepted, counts_as_accepted
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_pages(sender, instance, **kwargs):
+    invalidate_job(instance.pk)
+
+
+@receiver(post_save, sender=JobStatusTransition)
+def invalidate_job_pages_on_transition(sender, instance, created, **kwargs):
+    # Transitions update the job with a queryset UPDATE, which sends no signal
+    if created:
+        invalidate_job(instance.job_id)
+
+
+@receiver(post_save, sender=JobApplication)
+@receiver(post_delete, sender=JobApplication)
+@receiver(post_save, sender=JobSubmission)
+@receiver(post_delete, sender=JobSubmission)
+def invalidate_job_pages_on_counts(sender, instance, **kwargs):
+    """Application and submission counts are shown on the job pages."""
+    invalidate_job(instance.job_id)
+
+
+@receiver(post_save, sender=AudioSnippet)
+@receiver(post_delete, sender=AudioSnippet)
+def invalidate_job_pages_on_audio(sender, instance, **kwargs):
+    if instance.content_type.model_class() is Job:
+        invalidate_job(instance.object_id)
+
+
+@receiver(pre_save, sender=JobSubmission)
+def remember_accepted_state(sender, instance, **kwargs):
+    if instance._state.adding:
+        instance._was_accepted = False
+        return
+    original = instance.get_dirty_fields(['status', 'is_draft'])
+    instance._was_accepted = counts_as_accepted(
+        original.get('status', instance.status), original.get('is_draft', instance.is_draft),
+    )
+
+
+@receiver(post_save, sender=JobSubmission)
+def update_accepted_count_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    delta = counts_as_accepted(instance.status, instance.is_draft) - instance._was_accepted
+    if delta:
+        adjust_accepted(instance.job_id, delta)
+
+
+@receiver(post_delete, sender=JobSubmission)
+def update_accepted_count_on_delete(sender, instance, **kwargs):
+    if counts_as_accepted(instance.status, instance.is_draft):
+        adjust_accepted(instance.job_id, -1)
@@ -0,0 +1,194 @@
+"""
+Declarative job status state machine.
+
+Every status change goes through ``transition()``, which issues a single
+guarded ``UPDATE ... WHERE id = <pk> AND status = <from>`` and records a
+``JobStatusTransition`` row in the same transaction. If another request moved
+the job first the UPDATE matches no rows and the transition is reported as not
+applied, so concurrent requests can never both "win" the same transition.
+
+See docs/job-states.md for the lifecycle itself.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, Tuple
+
+from django.db import transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+ACTIVE_STATUSES = ('draft', 'recruiting', 'selecting', 'submitting', 'reviewing')
+
+
+@dataclass(frozen=True)
+class Transition:
+    """A named edge from one or more source statuses to a target status."""
+    name: str
+    sources: Tuple[str, ...]
+    target: str
+    description: str = ''
+    # Names of ``Job`` predicates re-checked by ``apply_automatic_transitions``.
+    automatic_when: Tuple[str, ...] = field(default=())
+    # Job fields those predicates read; saves that touch none of them skip the check.
+    depends_on: Tuple[str, ...] = field(default=())
+
+
+TRANSITIONS: Dict[str, Transition] = {t.name: t for t in (
+    Transition('publish', ('draft',), 'recruiting',
+               'Funder publishes a draft.'),
+    Transition('unpublish', ('recruiting',), 'draft',
+               'Funder saves a recruiting job back as a draft.'),
+    Transition('close_recruiting', ('recruiting',), 'selecting',
+               'Recruit limit or deadline reached.',
+               automatic_when=('should_transition_to_selecting',),
+               depends_on=('status', 'recruit_limit', 'recruit_deadline')),
+    Transition('start_submitting', ('recruiting', 'selecting'), 'submitting',
+               'Funder confirmed approved applicants / authorized the contract.'),
+    Transition('begin_review', ('submitting',), 'reviewing',
+               'Submit limit/deadline reached or first submission accepted.',
+               automatic_when=('should_transition_to_reviewing',),
+               depends_on=('status', 'submit_limit', 'submit_deadline')),
+    Transition('complete', ('submitting', 'reviewing'), 'complete',
+               'Contract paid out and job finished.'),
+    Transition('expire', ('recruiting', 'submitting'), 'expired',
+               'Expired date passed with no applications/submissions.',
+               automatic_when=('should_expire',),
+               depends_on=('status', 'expired_date')),
+    Transition('cancel', ACTIVE_STATUSES, 'canceled',
+               'Funder canceled the contract.'),
+)}
+
+# Order matters: a recruiting job that hit its limit selects rather than expires.
+AUTOMATIC_TRANSITIONS = ('close_recruiting', 'begin_review', 'expire')
+
+
+class TransitionNotAllowed(Exception):
+    """Raised when a transition is requested from a status it does not leave."""
+
+    def __init__(self, job, name):
+        self.job = job
+        self.transition = TRANSITIONS[name]
+        super().__init__(
+            f"Cannot {name} job {job.pk} from status '{job.status}' "
+            f"(allowed from: {', '.join(self.transition.sources)})"
+        )
+
+
+def can_transition(job, name):
+    """Return True if ``name`` leaves the job's current (in-memory) status."""
+    return job.status in TRANSITIONS[name].sources
+
+
+def _extra_updates(job, transition_def, now):
+    """Column updates that accompany entering ``transition_def.target``."""
+    updates = {}
+    if transition_def.target == 'submitting':
+        days = job.submit_deadline_days or 7
+        updates['submit_deadline'] = Coalesce('submit_deadline', Value(now + timedelta(days=days)))
+    return updates
+
+
+def transition(job, name, actor=None, reason='', strict=False, **fields):
+    """
+    Move ``job`` along the named transition.
+
+    Args:
+        job: Job instance; its in-memory ``status`` is the expected source.
+        name: Key in ``TRANSITIONS``.
+        actor: User responsible, recorded on the event (optional).
+        reason: Free-text note recorded on the event (optional).
+        strict: Raise ``TransitionNotAllowed`` instead of returning False when
+            the in-memory status is not a valid source.
+        **fields: Extra Job columns to write in the same UPDATE.
+
+    Returns:
+        True if this call performed the transition, False if the job was not
+        in a source status (or was concurrently moved by someone else).
+    """
+    from .models import Job, JobStatusTransition
+
+    transition_def = TRANSITIONS[name]
+    from_status = job.status
+    if from_status not in transition_def.sources:
+        if strict:
+            raise TransitionNotAllowed(job, name)
+        return False
+
+    now = timezone.now()
+    updates = {'status': transition_def.target, 'updated_at': now, **fields}
+    updates.update(_extra_updates(job, transition_def, now))
+
+    with transaction.atomic():
+        updated = Job.objects.filter(pk=job.pk, status=from_status).update(**updates)
+        if not updated:
+            return False
+        JobStatusTransition.objects.create(
+            job_id=job.pk,
+            transition=name,
+            from_status=from_status,
+            to_status=transition_def.target,
+            actor=actor if actor is not None and actor.is_authenticated else None,
+            reason=reason,
+        )
+
+    job.status = transition_def.target
+    job.updated_at = now
+    for attr, value in fields.items():
+        setattr(job, attr, value)
+    if 'submit_deadline' in updates and not job.submit_deadline:
+        job.submit_deadline = now + timedelta(days=job.submit_deadline_days or 7)
+    job.reset_dirty_fields(list(updates))
+    return True
+
+
+def apply_automatic_transitions(job, changed_fields=None):
+    """
+    Apply limit/deadline driven transitions whose predicate currently holds.
+
+    Args:
+        job: Job instance.
+        changed_fields: If given, only transitions whose ``depends_on`` fields
+            intersect it are evaluated (avoids COUNT queries on unrelated saves).
+
+    Returns:
+        Name of the transition applied, or None.
+    """
+    for name in AUTOMATIC_TRANSITIONS:
+        transition_def = TRANSITIONS[name]
+        if job.status not in transition_def.sources:
+            continue
+        if changed_fields is not None and not set(transition_def.depends_on) & set(changed_fields):
+            continue
+        if all(getattr(job, predicate)() for predicate in transition_def.automatic_when):
+            if transition(job, name, reason='automatic'):
+                return name
+    return None
+
+
+def apply_due_transitions(now=None):
+    """
+    Apply the deadline-driven automatic transitions of every job that is due.
+
+    Limit transitions are applied by the writes that reach the limit; a
+    deadline passes without any write, so this sweep (run periodically by
+    the ``apply_job_transitions`` command) picks those jobs up instead of
+    the pages that display them.
+
+    Returns:
+        Dict of transition name -> number of jobs moved.
+    """
+    from .models import Job
+
+    now = now or timezone.now()
+    due = Job.objects.filter(
+        Q(status='recruiting', recruit_deadline__lte=now)
+        | Q(status='submitting', submit_deadline__lte=now)
+        | Q(status__in=TRANSITIONS['expire'].sources, expired_date__lte=now)
+    ).order_by('pk')
+    applied = {}
+    for job in due.iterator():
+        name = apply_automatic_transitions(job)
+        if name:
+            applied[name] = applied.get(name, 0) + 1
+    return applied
@@ -0,0 +1,351 @@
+import hashlib
+import io
+import json
+import tempfile
+import threading
+import time
+import zipfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.template.loader import render_to_string
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from audio import manifest
+from audio.cache import MISSING, AudioCache, LocalLRUCache, audio_cache
+from audio.mixins import get_audio_for_content, get_static_ui_element
+from audio.models import AudioSnippet, StaticUIElement
+
+
+class LocalLRUCacheTest(SimpleTestCase):
+    def test_evicts_least_recently_used_and_expires(self):
+        now = [0]
+        lru = LocalLRUCache(maxsize=2, ttl=10, clock=lambda: now[0])
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+
+        self.assertIsNone(lru.get('b', None))
+        self.assertEqual(lru.get('a'), 1)
+        now[0] = 11
+        self.assertIsNone(lru.get('c', None))
+
+
+class AudioCacheTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.cache = AudioCache(timeout=60, l1_size=10, l1_ttl=30)
+
+    def test_negative_results_are_cached(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(self.cache.get_or_load('k', loader))
+        self.assertIsNone(self.cache.get_or_load('k', loader))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get('k'), MISSING)
+        self.assertEqual(self.cache.stats()['negative_hits'], 1)
+
+    def test_l2_serves_other_processes_l1(self):
+        self.cache.get_or_load('k', lambda: 'value')
+        other = AudioCache(timeout=60, l1_size=10, l1_ttl=30)
+
+        self.assertEqual(other.get_or_load('k', lambda: 'reloaded'), 'value')
+        self.assertEqual(other.stats()['l2_hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_concurrent_misses_load_once(self):
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_load('k', slow_loader)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 8)
+        self.assertEqual(self.cache.stats()['loads'], 1)
+
+    def test_bump_moves_namespace_to_new_generation(self):
+        first = self.cache.generation('jobs.Job:1')
+        self.assertEqual(self.cache.generation('jobs.Job:1'), first)
+
+        self.assertGreater(self.cache.bump('jobs.Job:1'), first)
+        other = AudioCache(timeout=60, l1_size=10, l1_ttl=30)
+        self.assertEqual(other.generation('jobs.Job:1'), self.cache.generation('jobs.Job:1'))
+        self.assertEqual(self.cache.generation('jobs.Job:2'), other.generation('jobs.Job:2'))
+
+
+class AudioLookupCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        audio_cache.clear_local()
+        self.element = StaticUIElement.objects.create(slug='greeting', label_es='Hola', label_en='Hello')
+
+    def test_new_snippet_replaces_cached_miss(self):
+        self.assertIsNone(get_audio_for_content(self.element, 'label', 'nah'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_audio_for_content(self.element, 'label', 'nah'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet = AudioSnippet.objects.create(
+                content_object=self.element,
+                target_field='label',
+                language_code='nah',
+                status='ready',
+                file=ContentFile(b'audio', name='greeting.mp3'),
+            )
+        self.addCleanup(snippet.file.delete, save=False)
+        self.assertEqual(get_audio_for_content(self.element, 'label', 'nah'), snippet)
+
+    def test_snippet_save_drops_cached_misses_for_every_language(self):
+        self.assertIsNone(get_audio_for_content(self.element, 'label', 'maz'))
+        self.assertIsNone(get_audio_for_content(self.element, 'label', 'nah', status='draft'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet = AudioSnippet.objects.create(
+                content_object=self.element,
+                target_field='label',
+                language_code='nah',
+                status='draft',
+                file=ContentFile(b'audio', name='greeting.mp3'),
+            )
+        self.addCleanup(snippet.file.delete, save=False)
+        self.assertEqual(get_audio_for_content(self.element, 'label', 'nah', status='draft'), snippet)
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_audio_for_content(self.element, 'label', 'maz'))
+
+    def test_invalidation_waits_for_commit_and_covers_a_renamed_slug(self):
+        self.assertEqual(get_static_ui_element('greeting'), self.element)
+        self.assertIsNone(get_static_ui_element('welcome'))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.element.slug = 'welcome'
+            self.element.save()
+        # Nothing is dropped before the transaction commits
+        with self.assertNumQueries(0):
+            self.assertEqual(get_static_ui_element('greeting'), self.element)
+
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(get_static_ui_element('greeting'))
+        self.assertEqual(get_static_ui_element('welcome'), self.element)
+
+
+class AudioCacheBusTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidation_reaches_other_process_l1(self):
+        worker_a = AudioCache(timeout=60, l1_size=10, l1_ttl=300, sync_interval=0)
+        worker_b = AudioCache(timeout=60, l1_size=10, l1_ttl=300, sync_interval=0)
+        worker_a.sync()
+        self.assertEqual(worker_a.get_or_load('k', lambda: 'old'), 'old')
+
+        worker_b.delete('k')
+        cache.set('k', 'new')
+
+        self.assertEqual(worker_a.get_or_load('k', lambda: 'reloaded'), 'new')
+
+    def test_works_on_file_backed_shared_cache(self):
+        with tempfile.TemporaryDirectory() as location:
+            shared = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+            with self.settings(CACHES={'default': shared, 'shared': shared}):
+                worker_a = AudioCache(alias='shared', timeout=60, l1_ttl=300, sync_interval=0)
+                worker_b = AudioCache(alias='shared', timeout=60, l1_ttl=300, sync_interval=0)
+                generation = worker_a.generation('jobs.Job:1')
+
+                worker_b.bump('jobs.Job:1')
+
+                self.assertGreater(worker_a.generation('jobs.Job:1'), generation)
+
+
+class WarmAudioCacheCommandTest(TestCase):
+    def test_preloads_hits_and_misses(self):
+        cache.clear()
+        audio_cache.clear_local()
+        element = StaticUIElement.objects.create(slug='greeting', label_es='Hola', label_en='Hello')
+
+        call_command('warm_audio_cache', languages=['es', 'nah'], stdout=io.StringIO())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_static_ui_element('greeting'), element)
+            self.assertIsNone(get_audio_for_content(element, 'label', 'nah'))
+
+
+class AudioBatchLookupTest(TestCase):
+    def setUp(self):
+        self.elements = [
+            StaticUIElement.objects.create(slug=f'label_{i}', label_es=f'Etiqueta {i}', label_en=f'Label {i}')
+            for i in range(6)
+        ]
+        for element, language_code in zip(self.elements[:3], ['nah', 'es', 'en']):
+            snippet = AudioSnippet.objects.create(
+                content_object=element,
+                target_field='label',
+                language_code=language_code,
+                status='ready',
+                file=ContentFile(b'audio', name=f'{element.slug}.mp3'),
+            )
+            self.addCleanup(snippet.file.delete, save=False)
+
+    def lookup(self, targets):
+        return self.client.post(
+            '/api/audio/snippets/batch/',
+            {'targets': targets, 'languages': ['nah', 'es', 'en']},
+            content_type='application/json',
+        )
+
+    def test_resolves_fallback_chain_per_target(self):
+        targets = [
+            {'content_type_id': 'static_ui', 'object_id': element.slug, 'target_field': 'label'}
+            for element in self.elements
+        ] + [{'content_type_id': 'static_ui', 'object_id': 'missing', 'target_field': 'label'}]
+
+        results = self.lookup(targets).json()['results']
+
+        self.assertEqual([r['available'] for r in results], [True, True, True, False, False, False, False])
+        self.assertEqual([r['language_code'] for r in results[:3]], ['nah', 'es', 'en'])
+        self.assertEqual([r['fallback_used'] for r in results[:3]], [False, True, True])
+        self.assertFalse(results[-1]['found'])
+        self.assertIn('fallback_audio_url', results[-1])
+
+    def test_query_count_does_not_grow_with_targets(self):
+        ContentType.objects.clear_cache()
+        element_type = ContentType.objects.get_for_model(StaticUIElement)
+        few = [{'content_type_id': 'static_ui', 'object_id': 'label_0', 'target_field': 'label'}]
+        many = [
+            {'content_type_id': str(element_type.pk), 'object_id': str(element.pk), 'target_field': 'label'}
+            for element in self.elements
+        ] + [
+            {'content_type_id': 'dashboard', 'object_id': element.slug, 'target_field': 'label'}
+            for element in self.elements
+        ]
+
+        with self.assertNumQueries(2):  # slugs, snippets
+            self.lookup(few)
+        with self.assertNumQueries(4):  # slugs, content types, elements, snippets
+            self.assertEqual(len(self.lookup(many).json()['results']), 12)
+
+    def test_missing_numeric_object_is_not_found(self):
+        element_type = ContentType.objects.get_for_model(StaticUIElement)
+        results = self.lookup([
+            {'content_type_id': str(element_type.pk), 'object_id': str(self.elements[0].pk), 'target_field': 'label'},
+            {'content_type_id': str(element_type.pk), 'object_id': '999999', 'target_field': 'label'},
+        ]).json()['results']
+
+        self.assertTrue(results[0]['available'])
+        self.assertFalse(results[1]['found'])
+
+
+class AudioManifestTest(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = self.settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+        audio_cache.clear_local()
+
+        self.element = StaticUIElement.objects.create(slug='greeting', label_es='Hola', label_en='Hello')
+        self.snippet = AudioSnippet.objects.create(
+            content_object=self.element,
+            target_field='label',
+            language_code='nah',
+            status='ready',
+            file=ContentFile(b'niltze', name='greeting.mp3'),
+        )
+
+    def test_manifest_is_etagged(self):
+        response = self.client.get('/api/audio/manifest/nah/')
+
+        self.assertEqual(response.status_code, 200)
+        clip = response.json()['clips']['greeting']['label']
+        self.assertEqual(clip['hash'], hashlib.sha256(b'niltze').hexdigest())
+        not_modified = self.client.get('/api/audio/manifest/nah/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(self.client.get('/api/audio/manifest/xx/').status_code, 404)
+
+    def test_only_changed_language_is_regenerated(self):
+        nah_etag = manifest.get_manifest('nah')['etag']
+        es_etag = manifest.get_manifest('es')['etag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AudioSnippet.objects.create(
+                content_object=self.element,
+                target_field='label',
+                language_code='es',
+                status='ready',
+                file=ContentFile(b'hola', name='hola.mp3'),
+            )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(manifest.get_manifest('nah')['etag'], nah_etag)
+        self.assertNotEqual(manifest.get_manifest('es')['etag'], es_etag)
+
+    def test_pack_contains_clips_and_manifest(self):
+        response = self.client.get('/api/audio/manifest/nah/pack.zip')
+
+        self.assertEqual(response.status_code, 200)
+        with zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))) as archive:
+            self.assertEqual(archive.read('greeting/label.mp3'), b'niltze')
+            packed = json.loads(archive.read('manifest.json'))
+        self.assertEqual(packed['clips']['greeting']['label']['path'], 'greeting/label.mp3')
+
+
+    def test_file_is_hashed_only_when_it_changes(self):
+        snippet = AudioSnippet.objects.get(pk=self.snippet.pk)
+        snippet.file.storage.delete(snippet.file.name)
+        AudioSnippet.objects.filter(pk=snippet.pk).update(content_hash='')
+
+        snippet = AudioSnippet.objects.get(pk=snippet.pk)
+        with patch('audio.models.compute_file_hash') as compute:
+            snippet.status = 'needs_review'
+            snippet.save()
+        compute.assert_not_called()
+
+        snippet.file = ContentFile(b'niltze 2', name='greeting.mp3')
+        snippet.save()
+        self.assertEqual(snippet.content_hash, hashlib.sha256(b'niltze 2').hexdigest())
+
+class ChromeFragmentCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        audio_cache.clear_local()
+        self.factory = RequestFactory()
+
+    def render_base(self):
+        request = self.factory.get('/')
+        request.user = AnonymousUser()
+        request.LANGUAGE_CODE = 'es'
+        return render_to_string('base.html', request=request)
+
+    def test_static_ui_change_rerenders_navigation(self):
+        self.render_base()
+        with self.assertNumQueries(0):
+            self.render_base()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            element = StaticUIElement.objects.create(slug='nav_login', label_es='Entrar')
+        with self.assertNumQueries(3):  # the element, then its label audio in es and en
+            html = self.render_base()
+        self.assertIn(f'data-object-id="{element.pk}"', html)
@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.urls import reverse
+
+from audio.cache import audio_cache
+from audio.models import AudioSnippet
+from jobs.models import Job
+from users.models import User
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        audio_cache.clear_local()
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('10.00'),
+            funder=self.funder,
+            status='recruiting',
+            max_responses=3,
+        )
+
+    def test_job_detail_answers_304_until_the_job_changes(self):
+        url = reverse('jobs:detail', args=[self.job.pk])
+        self.client.get(url)  # first visit sets the CSRF cookie, which is part of the ETag
+        first = self.client.get(url)
+        etag = first['ETag']
+        self.assertTrue(first.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):  # the validator row only
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Record farewells'
+            self.job.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_viewer_and_language(self):
+        url = reverse('jobs:list')
+        self.client.get(url)
+        anonymous = self.client.get(url)['ETag']
+
+        self.client.force_login(self.funder)
+        signed_in = self.client.get(url)
+        self.assertNotEqual(signed_in['ETag'], anonymous)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=anonymous).status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=signed_in['ETag']).status_code, 304)
+
+        self.client.cookies['preferred_audio_language'] = 'maz'
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=signed_in['ETag']).status_code, 200)
+
+    def test_role_change_invalidates_etag(self):
+        url = reverse('jobs:dashboard')
+        self.client.force_login(self.funder)
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+
+        User.objects.filter(pk=self.funder.pk).update(role='creator')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_owner_dashboard_revalidates(self):
+        self.client.force_login(self.funder)
+        url = reverse('jobs:owner_dashboard')
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.filter(pk=self.job.pk).update(accepted_count=1)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_audio_stream_and_list_answer_304(self):
+        snippet = AudioSnippet(
+            content_object=self.job, target_field='title', language_code='nah', status='ready',
+        )
+        snippet.file.save('greeting.mp3', ContentFile(b'ID3 audio'), save=False)
+        snippet.save()
+        self.addCleanup(snippet.file.delete, save=False)
+
+        for url in ('/api/audio/snippets/', f'/api/audio/snippets/{snippet.pk}/stream/'):
+            etag = self.client.get(url)['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+from django.db.models.signals import post_save
+from django.test import TestCase
+
+from jobs.models import Job
+from users.models import User
+
+
+class DirtyFieldsTest(TestCase):
+    def setUp(self):
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('10.00'),
+            funder=self.funder,
+            status='recruiting',
+        )
+        self.job = Job.objects.get()
+
+    def test_clean_save_writes_nothing_but_sends_signals(self):
+        self.assertEqual(self.job.get_dirty_fields(), {})
+        saved = []
+        receiver = lambda sender, instance, **kwargs: saved.append(instance)
+        post_save.connect(receiver, sender=Job)
+        self.addCleanup(post_save.disconnect, receiver, sender=Job)
+
+        with self.assertNumQueries(0):
+            self.job.save()
+        self.assertEqual(saved, [self.job])
+
+    def test_positional_update_fields_are_respected(self):
+        self.job.title = 'Renamed'
+        self.job.payment_url = 'https://wallet.test/pay'
+        self.job.save(False, False, None, ['title'])
+
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.title, self.job.payment_url), ('Renamed', None))
+
+    def test_clean_save_keeps_concurrent_counter_updates(self):
+        Job.objects.filter(pk=self.job.pk).update(accepted_count=2)
+        self.job.save()
+        self.assertEqual(Job.objects.get(pk=self.job.pk).accepted_count, 2)
+
+    def test_missing_row_is_inserted_again(self):
+        Job.objects.filter(pk=self.job.pk).delete()
+        self.job.title = 'Renamed'
+        self.job.save()
+
+        self.assertEqual(Job.objects.get(pk=self.job.pk).title, 'Renamed')
+
+    def test_unrelated_edit_writes_only_changed_columns_without_transition_checks(self):
+        self.job.payment_url = 'https://wallet.test/pay'
+        self.assertEqual(self.job.get_dirty_fields(), {'payment_url': None})
+
+        with self.assertNumQueries(2) as ctx:  # row check, UPDATE
+            self.job.save()
+        sql = ctx.captured_queries[1]['sql']
+        self.assertIn('"payment_url"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"title"', sql)
+        self.assertFalse(self.job.is_dirty())
+
+    def test_limit_change_re_evaluates_transition(self):
+        self.job.applications.create(applicant=User.objects.create_user(username='worker', password='x'))
+
+        self.job.recruit_limit = 1
+        self.job.save()
+
+        self.assertEqual(self.job.status, 'selecting')
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, 'selecting')
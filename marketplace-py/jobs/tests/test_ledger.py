@@ -0,0 +1,101 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs import ledger
+from jobs.models import Job, JobSubmission, LedgerEntry, PendingPaymentTransaction
+from users.models import User
+
+
+class LedgerTest(TestCase):
+    def setUp(self):
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.workers = [
+            User.objects.create_user(username=f'worker{i}', password='pass1234') for i in range(2)
+        ]
+        self.job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('30.00'),
+            max_responses=3,
+            funder=self.funder,
+            status='reviewing',
+        )
+        for worker in self.workers:
+            JobSubmission.objects.create(job=self.job, creator=worker, status='accepted')
+
+    def test_settlement_pays_per_person_and_refunds_unspent_budget(self):
+        ledger.record_contract_funding(self.job, reference='contract-1')
+        ledger.record_contract_settlement(self.job, reference='pay-1')
+
+        worker_balance = ledger.get_balance(self.workers[0])
+        self.assertEqual(worker_balance.total_earned, Decimal('10.00'))
+        funder_balance = ledger.get_balance(self.funder)
+        self.assertEqual(
+            (funder_balance.total_spent, funder_balance.total_refunded, funder_balance.balance),
+            (Decimal('30.00'), Decimal('10.00'), Decimal('-20.00')),
+        )
+
+    def test_settlement_is_idempotent(self):
+        ledger.record_contract_funding(self.job)
+        ledger.record_contract_settlement(self.job)
+        self.assertIsNone(ledger.record_contract_funding(self.job))
+        self.assertEqual(ledger.record_contract_settlement(self.job), [])
+
+        self.assertEqual(LedgerEntry.objects.count(), 4)
+        self.assertEqual(ledger.get_balance(self.funder).entries_count, 2)
+
+    def test_entries_are_append_only(self):
+        entry = ledger.record(self.funder, 'refund', Decimal('1.00'), key='manual-1')
+        entry.amount = Decimal('100.00')
+        with self.assertRaises(ValueError):
+            entry.save()
+        with self.assertRaises(ValueError):
+            entry.delete()
+
+    def test_totals_between_dates(self):
+        ledger.record_contract_settlement(self.job)
+        LedgerEntry.objects.filter(user=self.workers[0]).update(created_at=timezone.now() - timedelta(days=10))
+
+        recent = ledger.totals_between(self.workers[0], start=timezone.now() - timedelta(days=1))
+        self.assertEqual(recent['earned'], Decimal('0.00'))
+        everything = ledger.totals_between(self.workers[0])
+        self.assertEqual(everything['net'], Decimal('10.00'))
+
+    def test_money_page_reads_materialized_balance(self):
+        ledger.record_contract_settlement(self.job)
+        self.client.force_login(self.workers[0])
+
+        response = self.client.get(reverse('jobs:my_money'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_earned'], Decimal('10.00'))
+        self.assertEqual(response.context['balance'], Decimal('10.00'))
+        self.assertEqual(len(response.context['page_obj'].object_list), 1)
+
+    @patch('utilities.openpayments.paymentsparser.verify_response_hash', return_value=True)
+    @patch('open_payments_sdk.models.wallet.WalletAddress')
+    @patch('schemas.openpayments.open_payments.SellerOpenPaymentAccount')
+    def test_funded_contract_counts_as_spent_before_completion(self, *mocks):
+        User.objects.create_user(
+            username='seller', password='pass1234',
+            wallet_address='https://wallet.test/seller', seller_key_id='key-1', seller_private_key='secret',
+        )
+        Job.objects.filter(pk=self.job.pk).update(status='selecting', contract_id='contract-1')
+        PendingPaymentTransaction.objects.create(
+            contract_id='contract-1', job=self.job, buyer_wallet_data={}, seller_wallet_data={},
+        )
+        self.client.force_login(self.funder)
+
+        self.client.get(reverse('jobs:complete_contract_payment', args=['contract-1']), {'interact_ref': 'ref', 'hash': 'hash'})
+        self.assertEqual(Job.objects.get(pk=self.job.pk).status, 'submitting')
+
+        response = self.client.get(reverse('jobs:my_money'))
+        self.assertEqual(response.context['total_spent'], Decimal('30.00'))
+        self.assertEqual(response.context['balance'], Decimal('-30.00'))
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from httpx import Request
+
+from jobs.models import Job
+from marketplace.metrics import Counter, Registry
+from open_payments.http import endpoint_label
+from users.models import User
+
+
+def sample_value(text, sample):
+    """Value of the exposition line for ``sample`` (name plus labels), or None."""
+    for line in text.splitlines():
+        if line.startswith(f'{sample} '):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+class MetricsEndpointTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('10.00'),
+            funder=self.funder,
+            status='recruiting',
+            max_responses=3,
+        )
+
+    def scrape(self, **headers):
+        response = self.client.get(reverse('metrics'), **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_requests_are_timed_by_url_name(self):
+        self.assertEqual(reverse('metrics'), '/metrics')
+        count = 'marketplace_http_request_duration_seconds_count{view="jobs:list",method="GET",status="200"}'
+        before = sample_value(self.scrape(), count) or 0
+
+        self.client.get(reverse('jobs:list'))
+        text = self.scrape()
+        self.assertEqual(sample_value(text, count), before + 1)
+        self.assertGreater(sample_value(text, 'marketplace_db_queries_total{view="jobs:list"}'), 0)
+        self.assertIsNotNone(sample_value(text, 'marketplace_queue_depth{queue="audio_requests"}'))
+        self.assertIsNotNone(sample_value(text, 'marketplace_audio_cache_hit_ratio'))
+
+    def test_webhook_lag(self):
+        count = 'marketplace_webhook_lag_seconds_count{event="payment.failed"}'
+        before = sample_value(self.scrape(), count) or 0
+        payload = {
+            'type': 'payment.failed', 'pendingId': 'p1', 'offerId': str(self.job.pk), 'status': 'failed',
+            'timestamp': (timezone.now() - timedelta(seconds=30)).isoformat(),
+        }
+        self.client.post(reverse('payment_webhook'), json.dumps(payload), content_type='application/json')
+
+        text = self.scrape()
+        self.assertEqual(sample_value(text, count), before + 1)
+        self.assertEqual(sample_value(text, 'marketplace_webhook_lag_seconds_bucket{event="payment.failed",le="30.0"}'), before)
+
+    def test_workers_are_summed(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_MULTIPROC_DIR=directory):
+            for pid, amount in ((101, 2), (102, 3)):
+                registry = Registry()
+                Counter('marketplace_test_total', 'Test counter', ['kind'], registry=registry).inc(amount, kind='a')
+                with open(os.path.join(directory, f'{pid}.json'), 'w') as fh:
+                    json.dump(registry.snapshot(), fh)
+
+            text = self.scrape()
+            self.assertEqual(sample_value(text, 'marketplace_test_total{kind="a"}'), 5)
+            own = [name for name in os.listdir(directory) if name.startswith(f'{os.getpid()}-')]
+            self.assertEqual(len(own), 1)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.scrape(HTTP_AUTHORIZATION='Bearer s3cret')
+
+    @override_settings(METRICS_TOKEN='', METRICS_ALLOWED_IPS=['127.0.0.1', '10.0.0.0/8'])
+    def test_without_token_only_allowed_ips_scrape(self):
+        self.scrape()
+        self.scrape(REMOTE_ADDR='10.1.2.3')
+        self.assertEqual(self.client.get(reverse('metrics'), REMOTE_ADDR='203.0.113.5').status_code, 403)
+        with override_settings(DEBUG=True):
+            self.scrape(REMOTE_ADDR='203.0.113.5')
+
+    def test_open_payments_endpoint_labels(self):
+        cases = {
+            ('POST', 'https://ilp.example/alice/incoming-payments'): 'incoming-payments',
+            ('POST', 'https://auth.example/continue/4cbd0ee2'): 'continue',
+            ('GET', 'https://ilp.example/alice'): 'wallet-address',
+            ('POST', 'https://auth.example/'): 'grant',
+        }
+        for (method, url), label in cases.items():
+            self.assertEqual(endpoint_label(Request(method, url)), label)
@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from audio.cache import audio_cache
+from jobs.models import Job
+from jobs.page_cache import CSRF_INPUT_RE, invalidate_job
+from users.models import User
+
+
+class AnonymousPageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        audio_cache.clear_local()
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job = Job.objects.create(
+                title='Record greetings',
+                description='Desc',
+                target_language='nah',
+                deliverable_types='audio',
+                amount_per_person=Decimal('10.00'),
+                budget=Decimal('10.00'),
+                funder=self.funder,
+                status='recruiting',
+                max_responses=3,
+            )
+
+    def test_anonymous_hit_skips_the_view(self):
+        url = reverse('jobs:detail', args=[self.job.pk])
+        first = self.client.get(url)
+        self.assertEqual(first['X-Page-Cache'], 'miss')
+
+        with self.assertNumQueries(1):  # the conditional GET validator row
+            second = self.client.get(url)
+        self.assertEqual(second['X-Page-Cache'], 'hit')
+        self.assertIn('Record greetings', second.content.decode())
+        self.assertIn('Cookie', second['Vary'])
+        self.assertIn('private', second['Cache-Control'])
+
+    def test_csrf_token_is_the_visitors_own(self):
+        url = reverse('jobs:list')
+        self.client.get(url)
+
+        visitor = Client(enforce_csrf_checks=True)
+        response = visitor.get(url)
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+        token = CSRF_INPUT_RE.search(response.content).group(1).decode()
+        # The language form on the cached page must post with the visitor's token
+        posted = visitor.post(reverse('set_language_custom'), {
+            'csrfmiddlewaretoken': token, 'language': 'en', 'next': url,
+        })
+        self.assertEqual(posted.status_code, 302)
+
+    def test_job_save_invalidates_list_and_detail(self):
+        list_url = reverse('jobs:list')
+        detail_url = reverse('jobs:detail', args=[self.job.pk])
+        self.client.get(list_url)
+        self.client.get(detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Record farewells'
+            self.job.save()
+
+        for url in (list_url, detail_url):
+            response = self.client.get(url)
+            self.assertEqual(response['X-Page-Cache'], 'miss')
+            self.assertIn('Record farewells', response.content.decode())
+
+    def test_page_tags_stay_out_of_the_audio_cache(self):
+        detail_url = reverse('jobs:detail', args=[self.job.pk])
+        self.client.get(detail_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_job(self.job.pk)
+
+        self.assertEqual(self.client.get(detail_url)['X-Page-Cache'], 'miss')
+        self.assertFalse(any('page:' in key for key in audio_cache.local._data))
+        self.assertIsNotNone(cache.get(f'page_tag:job:{self.job.pk}'))
+
+    def test_signed_in_users_bypass_the_cache(self):
+        self.client.force_login(self.funder)
+        url = reverse('jobs:list')
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertIn('private', response['Cache-Control'])
@@ -0,0 +1,98 @@
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.test import SimpleTestCase
+
+from jobs import payments_utils
+from jobs.payments_client import (
+    CircuitBreaker,
+    PaymentsServiceClient,
+    PaymentsServiceError,
+    PaymentsServiceUnavailable,
+)
+
+
+def _response(status_code, payload):
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = 200 <= status_code < 400
+    response.json.return_value = payload
+    response.text = ''
+    return response
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    def test_opens_after_threshold_and_probes_after_timeout(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        now[0] = 11
+        self.assertTrue(breaker.allow_request())
+        # Only one probe is let through while half-open
+        self.assertFalse(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class PaymentsServiceClientTest(SimpleTestCase):
+    def setUp(self):
+        self.client = PaymentsServiceClient(
+            'http://payments.test/',
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+        )
+
+    def test_uses_split_timeouts_and_records_metrics(self):
+        with patch.object(self.client.session, 'request', return_value=_response(200, {'success': True})) as send:
+            data = self.client.create_incoming_payment('10.00', 'Job funding')
+
+        self.assertEqual(data, {'success': True})
+        send.assert_called_once()
+        self.assertEqual(send.call_args.args[:2], ('POST', 'http://payments.test/api/payments/incoming'))
+        self.assertEqual(send.call_args.kwargs['timeout'], (3.05, 10.0))
+        self.assertEqual(self.client.metrics.snapshot()['POST /api/payments/incoming']['calls'], 1)
+
+    def test_only_idempotent_methods_are_retried(self):
+        retry = self.client.session.get_adapter('http://payments.test').max_retries
+        self.assertTrue(retry.is_retry('GET', 503))
+        self.assertFalse(retry.is_retry('POST', 503))
+
+    def test_finish_payment_is_not_replayed(self):
+        retry = self.client.no_replay_session.get_adapter('http://payments.test').max_retries
+        self.assertFalse(retry.is_retry('GET', 503))
+        self.assertEqual((retry.read, retry.status), (0, 0))
+
+        with patch.object(self.client.no_replay_session, 'request', return_value=_response(200, {'success': True})) as send:
+            self.client.finish_payment('p1', 'ref', 'hash')
+        send.assert_called_once()
+
+    def test_finish_requires_explicit_success(self):
+        for payload in ({}, ['unexpected'], {'success': False, 'error': 'grant rejected'}):
+            with patch.object(payments_utils, 'get_payments_client') as get_client:
+                get_client.return_value.finish_payment.return_value = payload
+                self.assertFalse(payments_utils.finish_payment('p1', 'ref', 'hash')['success'], payload)
+
+    def test_breaker_fails_fast_after_repeated_errors(self):
+        error = requests.exceptions.ConnectionError('refused')
+        with patch.object(self.client.session, 'request', side_effect=error) as send:
+            for _ in range(2):
+                with self.assertRaises(PaymentsServiceError):
+                    self.client.get('/payments/finish')
+            with self.assertRaises(PaymentsServiceUnavailable):
+                self.client.get('/payments/finish')
+
+        self.assertEqual(send.call_count, 2)
+        self.assertEqual(self.client.metrics.snapshot()['GET /payments/finish']['short_circuited'], 1)
+
+    def test_client_errors_do_not_trip_breaker(self):
+        with patch.object(self.client.session, 'request', return_value=_response(400, {'error': 'bad amount'})):
+            for _ in range(3):
+                with self.assertRaisesMessage(PaymentsServiceError, 'bad amount'):
+                    self.client.post('/api/payments/incoming', json={})
+
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.CLOSED)
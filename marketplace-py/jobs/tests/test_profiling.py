@@ -0,0 +1,92 @@
+import sys
+import threading
+import time
+from decimal import Decimal
+
+from django.contrib.auth.models import Permission
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from jobs.models import Job, RequestProfile
+from marketplace.profiling import StackSampler
+from users.models import User
+
+
+def slow_function(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_INTERVAL_MS=1, PROFILING_KEEP=2)
+class ProfilingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='staff', password='pass1234')
+        self.staff.user_permissions.add(Permission.objects.get(codename='add_requestprofile'))
+        # New accounts are promoted to staff and superuser on creation, which
+        # alone does not allow profiling
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('10.00'),
+            funder=self.funder,
+            status='recruiting',
+            max_responses=3,
+        )
+
+    def test_staff_request_is_profiled_and_downloadable(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('jobs:detail', args=[self.job.pk]), {'_profile': '1'})
+
+        profile = RequestProfile.objects.get()
+        self.assertEqual(response['X-Profile-Url'], reverse('admin:jobs_requestprofile_change', args=[profile.pk]))
+        self.assertEqual(profile.view, 'jobs:detail')
+        self.assertEqual(profile.user, self.staff)
+        self.assertEqual(profile.status_code, 200)
+
+        self.assertEqual(self.client.get(reverse('admin:jobs_requestprofile_changelist')).status_code, 200)
+        download = self.client.get(reverse('admin:jobs_requestprofile_download', args=[profile.pk]))
+        self.assertIn(profile.filename, download['Content-Disposition'])
+        self.assertEqual(download.content.decode(), profile.stacks + '\n')
+
+    def test_header_flag_and_retention(self):
+        self.client.force_login(self.staff)
+        for _ in range(3):
+            self.client.get(reverse('jobs:list'), HTTP_X_PROFILE='1')
+        self.assertEqual(RequestProfile.objects.count(), 2)
+
+    def test_users_without_permission_and_unflagged_requests_are_not_profiled(self):
+        self.client.force_login(self.funder)
+        self.assertTrue(self.funder.is_superuser)
+        response = self.client.get(reverse('jobs:list'), HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Url', response)
+
+        self.client.force_login(self.staff)
+        self.client.get(reverse('jobs:list'))
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_middleware_is_not_loaded(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('jobs:list'), HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Url', response)
+        self.assertNotIn('ProfilingMiddleware', repr(self.client.handler._middleware_chain))
+
+
+class StackSamplerTest(TestCase):
+    def test_folded_stacks_start_at_the_root_frame(self):
+        sampler = StackSampler(threading.get_ident(), sys._getframe(), 0.001)
+        sampler.start()
+        slow_function(0.05)
+        sampler.stop()
+
+        self.assertGreater(sampler.samples, 0)
+        stack, count = sampler.folded().splitlines()[0].rsplit(' ', 1)
+        frames = stack.split(';')
+        self.assertTrue(frames[0].startswith('test_folded_stacks_start_at_the_root_frame (jobs/tests/test_profiling.py:'))
+        self.assertTrue(frames[-1].startswith('slow_function ('))
+        self.assertGreater(int(count), 0)
@@ -0,0 +1,100 @@
+import re
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from jobs.models import Job, JobApplication, JobSubmission
+from users.models import User
+
+# "SCAN <table>" without an index is a full table scan; "SCAN <table> USING
+# INDEX ..." walks an index and "SCAN (subquery-1)" / "SCAN CONSTANT ROW" are
+# not table reads
+SQLITE_FULL_SCAN_RE = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+POSTGRES_FULL_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+
+
+def full_scans(sql):
+    """Tables ``sql`` reads with a full table scan, according to EXPLAIN."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            details = [row[-1] for row in cursor.fetchall()]
+            return [match.group(1) for match in map(SQLITE_FULL_SCAN_RE.match, details) if match]
+        # Test tables are tiny, where a sequential scan is always cheapest;
+        # discourage it so the plan shows whether a usable index exists
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute(f'EXPLAIN {sql}')
+        return POSTGRES_FULL_SCAN_RE.findall('\n'.join(row[0] for row in cursor.fetchall()))
+
+
+class HotQueryPlanTest(TestCase):
+    """Every query behind the busiest pages must be served by an index."""
+
+    def setUp(self):
+        cache.clear()
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.creator = User.objects.create_user(username='creator', password='pass1234', role='creator')
+        self.jobs = {}
+        for status in ('recruiting', 'selecting', 'submitting', 'reviewing', 'complete'):
+            job = Job.objects.create(
+                title=f'{status} job',
+                description='Desc',
+                target_language='nah',
+                deliverable_types='audio',
+                amount_per_person=Decimal('10.00'),
+                budget=Decimal('30.00'),
+                funder=self.funder,
+                status=status,
+                max_responses=3,
+            )
+            JobApplication.objects.create(job=job, applicant=self.creator, status='selected')
+            JobSubmission.objects.create(job=job, creator=self.creator, status='pending', is_draft=status == 'submitting')
+            self.jobs[status] = job
+
+    def assertNoFullScans(self, user, urls):
+        if user:
+            self.client.force_login(user)
+        with CaptureQueriesContext(connection) as captured:
+            for url in urls:
+                self.assertIn(self.client.get(url).status_code, (200, 302))
+
+        statements = {query['sql'] for query in captured.captured_queries if query['sql'].startswith('SELECT')}
+        self.assertTrue(statements)
+        for sql in statements:
+            self.assertEqual(full_scans(sql), [], f'Full table scan in: {sql}')
+
+    def test_public_pages(self):
+        self.assertNoFullScans(None, [
+            reverse('jobs:list'),
+            reverse('jobs:list') + '?target_language=nah&search=job',
+            reverse('jobs:detail', args=[self.jobs['recruiting'].pk]),
+        ])
+
+    def test_funder_pages(self):
+        job = self.jobs['reviewing']
+        self.assertNoFullScans(self.funder, [
+            reverse('jobs:my_jobs'),
+            reverse('jobs:owner_dashboard'),
+            reverse('jobs:dashboard'),
+            reverse('jobs:detail', args=[job.pk]),
+            reverse('jobs:view_applications', args=[job.pk]),
+        ])
+
+    def test_creator_pages(self):
+        self.assertNoFullScans(self.creator, [
+            reverse('jobs:list'),
+            reverse('jobs:accepted'),
+            reverse('jobs:pending_jobs'),
+            reverse('jobs:dashboard'),
+            reverse('jobs:submit', args=[self.jobs['submitting'].pk]),
+            reverse('jobs:my_money'),
+        ])
+
+    def test_unindexed_filter_is_reported(self):
+        with CaptureQueriesContext(connection) as captured:
+            list(Job.objects.filter(description='Desc').values('pk'))
+        self.assertEqual(full_scans(captured.captured_queries[0]['sql']), [Job._meta.db_table])
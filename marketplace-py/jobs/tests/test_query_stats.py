@@ -0,0 +1,146 @@
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from audio.cache import audio_cache
+from audio.models import AudioSnippet, StaticUIElement
+from jobs.models import Job, JobApplication, JobSubmission
+from marketplace.query_stats import collect_queries, query_signature
+from marketplace.testing import QueryBudgetMixin
+from users.models import User
+
+
+class QueryStatsTestBase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        audio_cache.clear_local()
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.creator = User.objects.create_user(username='creator', password='pass1234', role='creator')
+        self.jobs = []
+        for i in range(4):
+            for status in ('recruiting', 'submitting', 'reviewing'):
+                job = Job.objects.create(
+                    title=f'Job {i} {status}',
+                    description='Desc',
+                    target_language='nah',
+                    deliverable_types='audio',
+                    amount_per_person=Decimal('10.00'),
+                    budget=Decimal('30.00'),
+                    funder=self.funder,
+                    status=status,
+                    max_responses=3,
+                )
+                JobApplication.objects.create(job=job, applicant=self.creator, status='selected')
+                if status == 'reviewing':
+                    JobSubmission.objects.create(job=job, creator=self.creator, status='accepted', is_draft=False)
+                self.jobs.append(job)
+
+
+class QueryStatsMiddlewareTest(QueryStatsTestBase):
+    def test_signature_ignores_parameters(self):
+        self.assertEqual(
+            query_signature('SELECT * FROM t WHERE id IN (%s, %s)\n  AND x = %s'),
+            query_signature('SELECT * FROM t WHERE id IN (%s) AND x = %s'),
+        )
+
+    @override_settings(SQL_STATS_HEADERS=True)
+    def test_debug_headers(self):
+        self.client.force_login(self.funder)
+        with collect_queries() as stats:
+            response = self.client.get(reverse('jobs:my_jobs'))
+        self.assertEqual(response['X-DB-Query-Count'], str(stats.count))
+        self.assertIn('X-DB-Time-Ms', response)
+        self.assertIn('X-DB-Duplicate-Queries', response)
+
+    @override_settings(SQL_STATS_HEADERS=False)
+    def test_no_headers_outside_debug(self):
+        response = self.client.get(reverse('jobs:list'))
+        self.assertNotIn('X-DB-Query-Count', response)
+
+    @override_settings(SQL_STATS_MAX_QUERIES=1)
+    def test_requests_over_budget_are_logged(self):
+        self.client.force_login(self.funder)
+        with self.assertLogs('marketplace.query_stats', level='WARNING') as logs:
+            self.client.get(reverse('jobs:my_jobs'))
+        self.assertIn('jobs:my_jobs', logs.output[0])
+
+
+class ViewQueryBudgetTest(QueryStatsTestBase):
+    """Budgets for the busiest pages; N+1 loops over the twelve jobs blow them."""
+
+    def assertPageBudget(self, user, url, max_queries):
+        if user is None:
+            self.client.logout()
+        else:
+            self.client.force_login(user)
+        self.client.get(url)  # warm the audio and static UI caches
+        with self.assertQueryBudget(max_queries):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_creator_pages(self):
+        self.assertPageBudget(self.creator, reverse('jobs:list'), 8)
+        self.assertPageBudget(self.creator, reverse('jobs:accepted'), 6)
+
+    def test_funder_pages(self):
+        self.assertPageBudget(self.funder, reverse('jobs:my_jobs'), 5)
+        self.assertPageBudget(self.funder, reverse('jobs:owner_dashboard'), 7)
+        self.assertPageBudget(self.funder, reverse('jobs:detail', args=[self.jobs[2].pk]), 6)
+
+    def test_user_pages(self):
+        self.assertPageBudget(self.creator, reverse('users:profile'), 2)
+        for name in ('users:register', 'users:register_creator', 'users:register_doer', 'users:login'):
+            self.assertPageBudget(None, reverse(name), 0)
+
+
+class AudioQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Budgets for the audio API endpoints the pages call for every label."""
+
+    def setUp(self):
+        cache.clear()
+        audio_cache.clear_local()
+        self.elements = [
+            StaticUIElement.objects.create(slug=f'label_{i}', label_es=f'Etiqueta {i}', label_en=f'Label {i}')
+            for i in range(6)
+        ]
+        for element in self.elements[:3]:
+            snippet = AudioSnippet.objects.create(
+                content_object=element,
+                target_field='label',
+                language_code='nah',
+                status='ready',
+                file=ContentFile(b'audio', name=f'{element.slug}.mp3'),
+            )
+            self.addCleanup(snippet.file.delete, save=False)
+        self.element_type = ContentType.objects.get_for_model(StaticUIElement)
+
+    def test_snippet_lookups(self):
+        element = self.elements[0]
+        # Cold caches; the snippet lookup runs once per language it falls back through
+        for url, max_queries in (
+            (f'/api/audio/snippets/get/static_ui/{element.slug}/label/nah/', 3),
+            (f'/api/audio/snippets/get/{self.element_type.pk}/{element.pk}/label/nah/', 2),
+            (f'/api/audio/snippets/by_content/?content_type_id={self.element_type.pk}&object_id={element.pk}', 4),
+        ):
+            with self.assertQueryBudget(max_queries, max_repeats=2):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_batch(self):
+        targets = [
+            {'content_type_id': 'static_ui', 'object_id': element.slug, 'target_field': 'label'}
+            for element in self.elements
+        ] + [
+            {'content_type_id': str(self.element_type.pk), 'object_id': str(element.pk), 'target_field': 'label'}
+            for element in self.elements
+        ]
+        with self.assertQueryBudget(4):  # slugs, content types, elements, snippets
+            response = self.client.post(
+                '/api/audio/snippets/batch/',
+                {'targets': targets, 'languages': ['nah', 'es', 'en']},
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(result['available'] for result in response.json()['results']), 6)
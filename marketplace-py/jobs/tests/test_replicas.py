@@ -0,0 +1,47 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from jobs.models import Job
+from marketplace.replicas import ReplicaRouter, read_from_replica
+
+router = ReplicaRouter()
+
+
+@read_from_replica
+def probe_view(request, write=False):
+    """Report where reads go before and after an optional write."""
+    before = router.db_for_read(Job)
+    if write:
+        router.db_for_write(Job)
+    return HttpResponse(f'{before}|{router.db_for_read(Job)}')
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_safe_reads_go_to_a_replica(self):
+        self.assertEqual(probe_view(self.factory.get('/')).content, b'replica_0|replica_0')
+        # Outside decorated views everything uses the primary
+        self.assertIsNone(router.db_for_read(Job))
+        self.assertEqual(router.db_for_write(Job), 'default')
+
+    def test_unsafe_methods_and_pinned_viewers_use_the_primary(self):
+        self.assertEqual(probe_view(self.factory.post('/')).content, b'None|None')
+        pinned = self.factory.get('/', HTTP_COOKIE='db_primary_pin=1')
+        self.assertEqual(probe_view(pinned).content, b'None|None')
+
+    def test_write_switches_to_primary_and_pins(self):
+        response = probe_view(self.factory.get('/'), write=True)
+        self.assertEqual(response.content, b'replica_0|None')
+        self.assertEqual(response.cookies['db_primary_pin']['max-age'], 10)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replica_configured(self):
+        self.assertEqual(probe_view(self.factory.get('/')).content, b'None|None')
+
+    def test_middleware_pins_after_post(self):
+        response = self.client.post(reverse('set_language_custom'), {'language': 'en', 'next': '/'})
+        self.assertIn('db_primary_pin', response.cookies)
@@ -0,0 +1,157 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from jobs import reviews
+from jobs.models import Job, JobApplication, JobSubmission
+from users.models import User
+
+
+class SubmissionReviewTest(TestCase):
+    def setUp(self):
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('30.00'),
+            funder=self.funder,
+            status='submitting',
+            max_responses=3,
+        )
+        self.submissions = [
+            JobSubmission.objects.create(
+                job=self.job,
+                creator=User.objects.create_user(username=f'creator{i}', password='pass1234'),
+            )
+            for i in range(5)
+        ]
+        self.ids = [submission.pk for submission in self.submissions]
+
+    def test_counter_follows_saves_and_cascade_deletes(self):
+        reviews.accept_submissions(self.job, self.ids[:2], actor=self.funder)
+
+        submission = JobSubmission.objects.get(pk=self.ids[2])
+        submission.status = 'accepted'
+        submission.save()
+        self.assertEqual(Job.objects.get(pk=self.job.pk).accepted_count, 3)
+
+        # Deleting the creator cascades to their accepted submission
+        self.submissions[0].creator.delete()
+        self.assertEqual(Job.objects.get(pk=self.job.pk).accepted_count, 2)
+        self.assertEqual(Job.objects.get(pk=self.job.pk).get_accepted_submissions_count(), 2)
+
+        submission.is_draft = True
+        submission.save()
+        self.assertEqual(Job.objects.get(pk=self.job.pk).accepted_count, 1)
+
+    def test_bulk_accept_stops_at_max_responses(self):
+        result = reviews.accept_submissions(self.job, self.ids, actor=self.funder)
+
+        self.assertEqual(result.accepted, self.ids[:3])
+        self.assertEqual(result.skipped, self.ids[3:])
+        self.assertEqual(result.accepted_count, 3)
+        self.assertTrue(result.limit_reached)
+        self.assertEqual(self.job.submissions.filter(status='accepted').count(), 3)
+        self.assertEqual(self.job.status, 'reviewing')
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        self.job.status = 'reviewing'
+        self.job.save()
+        with self.assertNumQueries(6):  # savepoint, lock, reserve, accept, counter, release
+            reviews.accept_submissions(self.job, self.ids[:1])
+        with self.assertNumQueries(6):
+            reviews.accept_submissions(self.job, self.ids[1:3])
+
+    def test_stale_reviewer_cannot_exceed_limit(self):
+        # Both reviewers loaded the job before either accepted anything
+        stale = Job.objects.get(pk=self.job.pk)
+        reviews.accept_submissions(self.job, self.ids[:3])
+
+        result = reviews.accept_submissions(stale, self.ids[3:])
+        self.assertEqual(result.accepted, [])
+        self.assertEqual(Job.objects.get(pk=self.job.pk).accepted_count, 3)
+
+    def test_rejecting_accepted_submission_frees_slot(self):
+        reviews.accept_submissions(self.job, self.ids[:3])
+
+        result = reviews.reject_submissions(self.job, self.ids[:1])
+        self.assertEqual(result.rejected, self.ids[:1])
+        self.assertEqual(result.accepted_count, 2)
+        self.assertEqual(reviews.accept_submissions(self.job, self.ids[3:]).accepted, self.ids[3:4])
+
+    def test_accepting_a_draft_reports_the_draft(self):
+        JobSubmission.objects.filter(pk=self.ids[0]).update(is_draft=True)
+        self.client.force_login(self.funder)
+
+        response = self.client.get(
+            reverse('jobs:accept_submission', args=[self.job.pk, self.ids[0]]), follow=True,
+        )
+
+        self.assertEqual(
+            [str(message) for message in response.context['messages']],
+            ['This submission is still a draft and cannot be accepted yet.'],
+        )
+        self.assertEqual(JobSubmission.objects.get(pk=self.ids[0]).status, 'pending')
+
+
+class ApplicationTriageTest(TestCase):
+    def setUp(self):
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('10.00'),
+            funder=self.funder,
+            status='recruiting',
+            recruit_limit=50,
+        )
+        self.applications = [
+            JobApplication.objects.create(
+                job=self.job,
+                applicant=User.objects.create_user(username=f'worker{i}', password='pass1234'),
+            )
+            for i in range(4)
+        ]
+        self.ids = [application.pk for application in self.applications]
+        self.client.force_login(self.funder)
+
+    def test_bulk_approve_returns_json_diff(self):
+        JobApplication.objects.filter(pk=self.ids[0]).update(status='selected')
+
+        response = self.client.post(
+            reverse('jobs:triage_applications', args=[self.job.pk]),
+            {'action': 'approve', 'application_ids': self.ids + [999999]},
+            HTTP_ACCEPT='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        diff = response.json()
+        self.assertEqual(
+            diff['changed'],
+            [{'id': pk, 'from': 'pending', 'to': 'selected'} for pk in self.ids[1:]],
+        )
+        self.assertEqual(diff['unchanged'], self.ids[:1])
+        self.assertEqual(diff['missing'], [999999])
+        self.assertEqual(diff['counts'], {'pending': 0, 'selected': 4, 'rejected': 0})
+        self.assertIsNone(diff['transition'])
+
+    def test_status_update_is_one_statement(self):
+        # savepoint, lock, UPDATE ... WHERE id IN, counts, release, recruit-limit COUNT
+        with self.assertNumQueries(6):
+            reviews.triage_applications(self.job, self.ids, 'reject')
+        self.assertEqual(self.job.applications.filter(status='rejected').count(), 4)
+
+    def test_recruit_limit_checked_once_at_end(self):
+        Job.objects.filter(pk=self.job.pk).update(recruit_limit=4)
+        self.job.refresh_from_db()
+
+        diff = reviews.triage_applications(self.job, self.ids, 'approve')
+        self.assertEqual(diff['transition'], 'close_recruiting')
+        self.assertEqual(diff['job_status'], 'selecting')
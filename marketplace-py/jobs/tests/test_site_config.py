@@ -0,0 +1,44 @@
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from marketplace.config import get_language_preferences, get_site_config
+
+
+class SiteConfigTest(SimpleTestCase):
+    def test_built_once_and_reset_by_settings_override(self):
+        config = get_site_config()
+        self.assertIs(get_site_config(), config)
+
+        with override_settings(FALLBACK_TEXT_LANGUAGE='en', AUDIO_ICON_ACTIVE='on.png'):
+            overridden = get_site_config()
+            self.assertEqual(overridden.language_chain('nah'), ('nah', 'en'))
+            self.assertEqual(overridden.audio_config['icon_active'], '/media/on.png')
+        self.assertEqual(get_site_config().language_chain('nah'), ('nah', 'es', 'en'))
+
+    def test_config_is_read_only(self):
+        with self.assertRaises(TypeError):
+            get_site_config().audio_config['icon_active'] = 'other.png'
+
+
+class LanguagePreferencesTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_cookie_preference_resolved_once_per_request(self):
+        request = self.factory.get('/', HTTP_COOKIE='preferred_audio_language=maz')
+        request.LANGUAGE_CODE = 'es'
+
+        preferences = get_language_preferences(request)
+        self.assertEqual(preferences.preferred_audio_language, 'maz')
+        self.assertEqual(preferences.audio_language_chain, ('maz', 'es', 'en'))
+        self.assertTrue(preferences.audio_text_fallback_active)
+        self.assertIs(get_language_preferences(request), preferences)
+
+    def test_unknown_cookie_falls_back_to_request_language(self):
+        request = self.factory.get('/', HTTP_COOKIE='preferred_audio_language=xx')
+        request.LANGUAGE_CODE = 'es'
+
+        self.assertEqual(get_language_preferences(request).preferred_audio_language, 'es')
+
+    def test_middleware_attaches_preferences(self):
+        response = self.client.get('/api/audio/manifest/xx/')
+        self.assertEqual(response.wsgi_request.language_preferences.preferred_audio_language, 'en')
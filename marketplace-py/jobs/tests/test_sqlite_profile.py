@@ -0,0 +1,36 @@
+import django
+from django.conf import settings
+from django.db import connection, connections
+from django.test import TestCase, override_settings
+
+from marketplace.db import apply_sqlite_pragmas
+
+
+class SqliteProfileTest(TestCase):
+    def pragma(self, name, using=connection):
+        with using.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_new_connection_gets_production_pragmas(self):
+        other = connections.create_connection('default')
+        self.addCleanup(other.close)
+        with override_settings(SQLITE_PRAGMAS=settings.SQLITE_PRODUCTION_PRAGMAS):
+            other.ensure_connection()
+
+        self.assertEqual(self.pragma('synchronous', other), 1)  # NORMAL
+        self.assertEqual(self.pragma('busy_timeout', other), 20000)
+        self.assertEqual(self.pragma('cache_size', other), -65536)
+        if django.VERSION >= (5, 1):
+            self.assertEqual(settings.SQLITE_PRODUCTION_OPTIONS['transaction_mode'], 'IMMEDIATE')
+
+    def test_hook_applies_configured_pragmas(self):
+        self.addCleanup(connection.cursor().execute, f"PRAGMA cache_size = {self.pragma('cache_size')}")
+        with override_settings(SQLITE_PRAGMAS={'cache_size': -1024}):
+            apply_sqlite_pragmas(sender=None, connection=connection)
+        self.assertEqual(self.pragma('cache_size'), -1024)
+
+        # The default profile configures nothing
+        with override_settings(SQLITE_PRAGMAS={}):
+            apply_sqlite_pragmas(sender=None, connection=connection)
+        self.assertEqual(self.pragma('cache_size'), -1024)
@@ -0,0 +1,82 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job, JobStatusTransition
+from jobs.state_machine import TransitionNotAllowed
+from users.models import User
+
+
+class JobStateMachineTest(TestCase):
+    def setUp(self):
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('10.00'),
+            funder=self.funder,
+            status='selecting',
+        )
+
+    def test_transition_updates_status_and_records_event(self):
+        with self.assertNumQueries(4):  # savepoint, UPDATE, INSERT, release
+            self.assertTrue(self.job.apply_transition('start_submitting', actor=self.funder))
+
+        self.assertEqual(self.job.status, 'submitting')
+        self.assertIsNotNone(self.job.submit_deadline)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, 'submitting')
+        self.assertIsNotNone(self.job.submit_deadline)
+        event = JobStatusTransition.objects.get(job=self.job)
+        self.assertEqual(
+            (event.transition, event.from_status, event.to_status, event.actor),
+            ('start_submitting', 'selecting', 'submitting', self.funder),
+        )
+
+    def test_stale_instance_does_not_apply_transition(self):
+        stale = Job.objects.get(pk=self.job.pk)
+        self.assertTrue(self.job.apply_transition('cancel'))
+
+        # The other request still believes the job is selecting
+        self.assertFalse(stale.apply_transition('start_submitting'))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, 'canceled')
+        self.assertEqual(JobStatusTransition.objects.filter(job=self.job).count(), 1)
+
+    def test_invalid_source_is_rejected_without_queries(self):
+        with self.assertNumQueries(0):
+            self.assertFalse(self.job.apply_transition('begin_review'))
+        with self.assertRaises(TransitionNotAllowed):
+            self.job.apply_transition('complete', strict=True)
+
+    def test_saving_recruiting_job_as_draft_records_unpublish(self):
+        Job.objects.filter(pk=self.job.pk).update(status='recruiting')
+        self.client.force_login(self.funder)
+        self.client.post(reverse('jobs:edit', args=[self.job.pk]), {'title': 'Record greetings', 'save_draft': '1'})
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, 'draft')
+        event = JobStatusTransition.objects.get(job=self.job)
+        self.assertEqual((event.transition, event.from_status, event.actor), ('unpublish', 'recruiting', self.funder))
+
+    def test_job_detail_get_does_not_apply_due_transitions(self):
+        past = timezone.now() - timedelta(days=1)
+        Job.objects.filter(pk=self.job.pk).update(status='recruiting', recruit_deadline=past)
+
+        self.client.get(reverse('jobs:detail', args=[self.job.pk]))
+        self.assertEqual(Job.objects.get(pk=self.job.pk).status, 'recruiting')
+
+        out = StringIO()
+        call_command('apply_job_transitions', stdout=out)
+        self.assertEqual(Job.objects.get(pk=self.job.pk).status, 'selecting')
+        self.assertIn('close_recruiting: 1', out.getvalue())
+        call_command('apply_job_transitions', stdout=out)
+        self.assertEqual(JobStatusTransition.objects.filter(job=self.job).count(), 1)
@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import tempfile
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from httpx import Request
+
+from jobs.models import Job
+from jobs.payments_client import PaymentsServiceClient
+from marketplace import tracing
+from open_payments_sdk.gnap_utils.security import SecurityBase
+from open_payments_sdk.instrumentation import validate
+from open_payments_sdk.models.resource import Amount
+from users.models import User
+
+REMOTE_TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+REMOTE_SPAN_ID = '00f067aa0ba902b7'
+
+
+class TracingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.trace_file = os.path.join(directory.name, 'traces.jsonl')
+        settings_override = override_settings(TRACING_EXPORTER='file', TRACING_FILE=self.trace_file)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('10.00'),
+            funder=self.funder,
+            status='recruiting',
+            max_responses=3,
+        )
+
+    def exported_spans(self):
+        with open(self.trace_file) as fh:
+            batches = [json.loads(line) for line in fh]
+        return [
+            span
+            for batch in batches
+            for resource in batch['resourceSpans']
+            for scope in resource['scopeSpans']
+            for span in scope['spans']
+        ]
+
+    def test_request_span_with_query_batches(self):
+        response = self.client.get(reverse('jobs:detail', args=[self.job.pk]))
+
+        spans = self.exported_spans()
+        root = next(span for span in spans if span['kind'] == 'SPAN_KIND_SERVER')
+        self.assertEqual(root['name'], 'GET jobs:detail')
+        self.assertEqual(response['X-Trace-Id'], root['traceId'])
+        queries = [span for span in spans if span['name'] == 'db.query']
+        self.assertTrue(queries)
+        self.assertTrue(all(span['traceId'] == root['traceId'] for span in spans))
+        self.assertTrue(all(span['parentSpanId'] == root['spanId'] for span in queries))
+
+    def test_incoming_traceparent_is_continued(self):
+        self.client.get(reverse('jobs:list'), HTTP_TRACEPARENT=f'00-{REMOTE_TRACE_ID}-{REMOTE_SPAN_ID}-01')
+
+        root = next(span for span in self.exported_spans() if span['kind'] == 'SPAN_KIND_SERVER')
+        self.assertEqual(root['traceId'], REMOTE_TRACE_ID)
+        self.assertEqual(root['parentSpanId'], REMOTE_SPAN_ID)
+
+    def test_sdk_signing_and_validation_spans(self):
+        security = SecurityBase('key-1', 'unused', logging.getLogger(__name__))
+        with tracing.start_span('contract'):
+            security.set_content_digest(Request('POST', 'https://auth.example/', json={'a': 1}))
+            validate(Amount, {'value': '100', 'assetCode': 'MXN', 'assetScale': 2})
+
+        names = [span['name'] for span in self.exported_spans()]
+        self.assertEqual(names, ['open_payments.set_content_digest', 'open_payments.validate', 'contract'])
+
+    def test_payments_service_calls_carry_traceparent(self):
+        client = PaymentsServiceClient('http://payments.test/')
+        response = MagicMock(status_code=200, ok=True)
+        response.json.return_value = {}
+        with patch.object(client.session, 'request', return_value=response) as send:
+            with tracing.start_span('contract') as span:
+                client.get('/payments/finish')
+
+        self.assertEqual(send.call_args.kwargs['headers']['traceparent'], span.traceparent)
+
+    def test_webhook_links_to_the_contract_trace(self):
+        with tracing.start_span('start contract') as contract_span:
+            tracing.remember_trace(f'contract:{self.job.pk}')
+
+        payload = {'type': 'payment.failed', 'pendingId': 'p1', 'offerId': str(self.job.pk), 'status': 'failed'}
+        self.client.post(reverse('payment_webhook'), json.dumps(payload), content_type='application/json')
+
+        webhook = next(span for span in self.exported_spans() if span['name'] == 'POST payment_webhook')
+        self.assertEqual(webhook['links'], [{'traceId': contract_span.trace_id, 'spanId': contract_span.span_id}])
+
+    @override_settings(TRACING_EXPORTER='')
+    def test_disabled_tracing_exports_nothing(self):
+        response = self.client.get(reverse('jobs:list'))
+        self.assertNotIn('X-Trace-Id', response)
+        self.assertFalse(os.path.exists(self.trace_file))
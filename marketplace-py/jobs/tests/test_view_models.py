@@ -0,0 +1,140 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from jobs.models import Job, JobApplication, JobSubmission
+from jobs.view_models import build_owner_dashboard, load_job_detail
+from users.models import User
+
+
+class OwnerDashboardTest(TestCase):
+    def setUp(self):
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.creators = [
+            User.objects.create_user(username=f'creator{i}', password='pass1234') for i in range(3)
+        ]
+
+    def _create_job(self, status='reviewing', accepted=1, pending=1):
+        job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('10.00'),
+            funder=self.funder,
+            status=status,
+            max_responses=3,
+        )
+        statuses = ['accepted'] * accepted + ['pending'] * pending
+        for creator, status in zip(self.creators, statuses):
+            JobSubmission.objects.create(
+                job=job, creator=creator, status=status, is_complete=status == 'accepted',
+            )
+        return job
+
+    def _load(self, **kwargs):
+        dashboard = build_owner_dashboard(self.funder, **kwargs)
+        # Touch every value the template reads
+        for card in dashboard.drafts + dashboard.published_jobs:
+            card.can_complete_contract, card.pending_submissions, card.total_submissions
+            for submission in card.submissions:
+                submission.creator.get_display_name()
+        return dashboard
+
+    def test_query_count_is_constant_in_job_count(self):
+        self._create_job()
+        with self.assertNumQueries(3):  # COUNT, jobs page, submissions + creators
+            self._load()
+
+        for _ in range(5):
+            self._create_job()
+        self._create_job(status='draft', accepted=0, pending=0)
+        with self.assertNumQueries(3):
+            dashboard = self._load()
+        self.assertEqual(len(dashboard.published_jobs), 6)
+        self.assertEqual(len(dashboard.drafts), 1)
+
+    def test_flags_are_derived_from_prefetched_rows(self):
+        ready = self._create_job(accepted=2, pending=1)
+        self._create_job(status='submitting')
+        JobSubmission.objects.create(job=ready, creator=self.funder, status='accepted', is_draft=True)
+
+        cards = {card.job.pk: card for card in self._load().published_jobs}
+        card = cards[ready.pk]
+        self.assertEqual((card.accepted_submissions, card.pending_submissions, card.total_submissions), (2, 1, 3))
+        self.assertTrue(card.can_complete_contract)
+        self.assertEqual(sum(c.can_complete_contract for c in cards.values()), 1)
+
+    def test_dashboard_and_detail_agree_on_incomplete_acceptance(self):
+        job = self._create_job(accepted=2, pending=0)
+        job.submissions.filter(creator=self.creators[0]).update(is_complete=False)
+
+        card = self._load().published_jobs[0]
+        detail = load_job_detail(job.pk, self.funder)
+        self.assertFalse(card.all_accepted_complete)
+        self.assertFalse(detail.all_accepted_complete)
+        self.assertFalse(detail.can_complete_contract)
+
+        job.submissions.update(is_complete=True)
+        self.assertTrue(load_job_detail(job.pk, self.funder).can_complete_contract)
+
+    def test_paginates_by_job(self):
+        for _ in range(3):
+            self._create_job(accepted=0, pending=0)
+
+        dashboard = self._load(page_number=2, per_page=2)
+        self.assertEqual(dashboard.page.number, 2)
+        self.assertEqual(len(dashboard.published_jobs), 1)
+
+
+class JobDetailLoaderTest(TestCase):
+    def setUp(self):
+        self.funder = User.objects.create_user(username='funder', password='pass1234', role='funder')
+        self.job = Job.objects.create(
+            title='Record greetings',
+            description='Desc',
+            target_language='nah',
+            deliverable_types='audio',
+            amount_per_person=Decimal('10.00'),
+            budget=Decimal('10.00'),
+            funder=self.funder,
+            status='recruiting',
+            recruit_limit=100,
+        )
+
+    def _add_applicants(self, count, status='pending'):
+        for _ in range(count):
+            worker = User.objects.create_user(
+                username=f'worker{JobApplication.objects.count()}', password='pass1234'
+            )
+            JobApplication.objects.create(job=self.job, applicant=worker, status=status)
+            JobSubmission.objects.create(job=self.job, creator=worker, is_draft=True)
+        return worker
+
+    def test_owner_queries_do_not_grow_with_applicants(self):
+        self._add_applicants(1, status='selected')
+        with self.assertNumQueries(3):  # job + counts, applications, submissions
+            detail = load_job_detail(self.job.pk, self.funder)
+            detail.get_context()
+
+        self._add_applicants(20)
+        with self.assertNumQueries(3):
+            detail = load_job_detail(self.job.pk, self.funder)
+            context = detail.get_context()
+            [application.applicant.get_display_name() for application in context['applications']]
+        self.assertEqual(len(context['applications']), 21)
+        self.assertEqual(context['selected_count'], 1)
+        self.assertTrue(context['show_start_contract_button'])
+        self.assertEqual(context['submissions'], [])  # drafts are not shown to the owner
+
+    def test_viewer_sees_only_own_rows(self):
+        self._add_applicants(5)
+        worker = self._add_applicants(1, status='selected')
+
+        with self.assertNumQueries(3):
+            detail = load_job_detail(self.job.pk, worker)
+        self.assertFalse(detail.is_owner)
+        self.assertEqual(detail.user_application.applicant, worker)
+        self.assertTrue(detail.user_draft_submission.is_draft)
+        self.assertEqual(detail.applications, [])
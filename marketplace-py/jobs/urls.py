@@ -19,9 +19,11 @@ urlpatterns = [
     path('accepted/', views.accepted_jobs, name='accepted'),
     path('<int:job_pk>/accept/<int:submission_pk>/', views.accept_submission, name='accept_submission'),
     path('<int:job_pk>/decline/<int:submission_pk>/', views.decline_submission, name='decline_submission'),
+    path('<int:pk>/submissions/bulk-review/', views.bulk_review_submissions, name='bulk_review_submissions'),
     path('<int:job_pk>/mark-complete/<int:submission_pk>/', views.mark_submission_complete, name='mark_submission_complete'),
     path('<int:pk>/apply/', views.apply_to_job, name='apply_to_job'),
     path('<int:pk>/applications/', views.view_applications, name='view_applications'),
+    path('<int:pk>/applications/triage/', views.triage_applications, name='triage_applications'),
     path('<int:job_pk>/applications/<int:application_pk>/select/', views.select_application, name='select_application'),
     path('<int:pk>/pre-approve-payments/', views.pre_approve_payments, name='pre_approve_payments'),
     path('<int:pk>/start-contract/', views.start_contract, name='start_contract'),
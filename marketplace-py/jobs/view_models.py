@@ -0,0 +1,269 @@
+"""
+In-memory view models for the job pages.
+
+Each loader fetches everything a page needs in a fixed number of queries
+(one page of jobs plus ``prefetch_related`` for their children) and derives
+the page's counts and flags in Python from the prefetched rows, so the query
+count does not grow with the number of jobs, submissions or applications.
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+from django.core.paginator import Paginator
+from django.db.models import (
+    Count, IntegerField, OuterRef, Prefetch, Subquery, Value, prefetch_related_objects,
+)
+from django.db.models.functions import Coalesce
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+from .models import Job, JobApplication, JobSubmission
+
+OWNER_DASHBOARD_PAGE_SIZE = 10
+
+
+def all_complete(accepted):
+    """True if there are accepted submissions and every one of them is complete."""
+    return bool(accepted) and all(sub.is_complete for sub in accepted)
+
+
+@dataclass
+class OwnerJobCard:
+    """One job on the owner dashboard, with its submissions bucketed by status."""
+    job: object
+    submissions: List[object] = field(default_factory=list)
+    pending: List[object] = field(default_factory=list)
+    accepted: List[object] = field(default_factory=list)
+    rejected: List[object] = field(default_factory=list)
+
+    @classmethod
+    def from_job(cls, job):
+        card = cls(job=job, submissions=list(job.submissions.all()))
+        buckets = {'pending': card.pending, 'accepted': card.accepted, 'rejected': card.rejected}
+        for submission in card.submissions:
+            buckets.get(submission.status, card.pending).append(submission)
+        return card
+
+    @property
+    def total_submissions(self):
+        return len(self.submissions)
+
+    @property
+    def accepted_submissions(self):
+        return len(self.accepted)
+
+    @property
+    def pending_submissions(self):
+        return len(self.pending)
+
+    @property
+    def all_accepted_complete(self):
+        return all_complete(self.accepted)
+
+    @property
+    def can_complete_contract(self):
+        return (
+            self.job.status == 'reviewing' and
+            self.all_accepted_complete and
+            not self.job.contract_completed
+        )
+
+
+@dataclass
+class OwnerDashboard:
+    """One page of a funder's jobs, split into drafts and published jobs."""
+    page: object
+    drafts: List[OwnerJobCard]
+    published_jobs: List[OwnerJobCard]
+
+    @property
+    def has_jobs(self):
+        return self.page.paginator.count > 0
+
+
+def build_owner_dashboard(user, page_number=1, per_page=OWNER_DASHBOARD_PAGE_SIZE):
+    """
+    Load one page of ``user``'s jobs for the owner dashboard.
+
+    Queries: one COUNT for the paginator, one for the page of jobs and one
+    for all of their (non-draft) submissions with creators.
+
+    Returns:
+        OwnerDashboard
+    """
+    jobs_qs = Job.objects.filter(funder=user).prefetch_related(
+        Prefetch(
+            'submissions',
+            queryset=JobSubmission.objects.filter(is_draft=False)
+            .select_related('creator')
+            .order_by('-created_at')
+        )
+    ).order_by('-created_at')
+
+    page = Paginator(jobs_qs, per_page).get_page(page_number)
+    cards = [OwnerJobCard.from_job(job) for job in page.object_list]
+    return OwnerDashboard(
+        page=page,
+        drafts=[card for card in cards if card.job.status == 'draft'],
+        published_jobs=[card for card in cards if card.job.status != 'draft'],
+    )
+
+
+@dataclass
+class JobDetail:
+    """Everything the job detail, applications and preview pages need about one job."""
+    job: object
+    viewer: object
+    is_owner: bool
+    # Owner only: non-draft submissions (with creators) and applications (with applicants)
+    submissions: List[object] = field(default_factory=list)
+    applications: List[object] = field(default_factory=list)
+    # The viewer's own rows (drafts included)
+    user_submissions: List[object] = field(default_factory=list)
+    user_application: object = None
+
+    @property
+    def accepted_submissions(self):
+        return [sub for sub in self.submissions if sub.status == 'accepted']
+
+    @property
+    def accepted_submissions_count(self):
+        return len(self.accepted_submissions)
+
+    @property
+    def all_accepted_complete(self):
+        return all_complete(self.accepted_submissions)
+
+    @property
+    def selected_count(self):
+        return sum(1 for application in self.applications if application.status == 'selected')
+
+    @property
+    def user_draft_submission(self):
+        return next((sub for sub in self.user_submissions if sub.is_draft), None)
+
+    @property
+    def can_complete_contract(self):
+        return (
+            self.is_owner and
+            self.job.status == 'reviewing' and
+            self.all_accepted_complete and
+            not self.job.contract_completed
+        )
+
+    @property
+    def show_complete_contract_button(self):
+        return (
+            self.is_owner and
+            self.job.status == 'reviewing' and
+            self.accepted_submissions_count > 0 and
+            not self.job.contract_completed
+        )
+
+    @property
+    def show_cancel_contract_button(self):
+        return self.is_owner and self.job.status not in ['complete', 'canceled', 'expired']
+
+    @property
+    def can_start_contract(self):
+        return (
+            self.is_owner and
+            self.job.status in ('selecting', 'recruiting') and
+            self.selected_count > 0
+        )
+
+    @property
+    def show_start_contract_button(self):
+        return self.is_owner and (
+            self.job.status == 'selecting' or
+            (self.job.status == 'recruiting' and self.selected_count > 0)
+        )
+
+    def get_context(self):
+        """Template context used by job_detail.html."""
+        return {
+            'job': self.job,
+            'submissions': self.submissions,
+            'user_submissions': self.user_submissions,
+            'user_application': self.user_application,
+            'can_complete_contract': self.can_complete_contract,
+            'applications': self.applications if self.is_owner else None,
+            'selected_count': self.selected_count,
+            'can_start_contract': self.can_start_contract,
+            'show_start_contract_button': self.show_start_contract_button,
+            'show_complete_contract_button': self.show_complete_contract_button,
+            'show_cancel_contract_button': self.show_cancel_contract_button,
+            'accepted_submissions_count': self.accepted_submissions_count,
+            'all_accepted_complete': self.all_accepted_complete,
+        }
+
+
+def load_job_detail(pk, viewer, owner_only=False):
+    """
+    Load a job and the rows its pages show, in at most three queries.
+
+    1. The job with its funder and application/submission counts (the counts
+       feed the limit predicates the templates read, so they never issue
+       extra COUNTs).
+    2./3. For the owner: all applications and non-draft submissions. For
+       any other signed-in viewer: only their own application and
+       submissions.
+
+    Args:
+        pk: Job primary key.
+        viewer: ``request.user`` (may be anonymous).
+        owner_only: Raise Http404 unless ``viewer`` funds the job.
+
+    Loading never changes the job: due deadline transitions are applied by
+    the ``apply_job_transitions`` command, limit transitions by the writes
+    that reach the limit.
+
+    Raises:
+        Http404: Unknown job, a draft viewed by someone else, or
+            ``owner_only`` and the viewer is not the owner.
+    """
+    def count_of(model, **filters):
+        rows = model.objects.filter(job=OuterRef('pk'), **filters).order_by().values('job')
+        return Coalesce(
+            Subquery(rows.annotate(total=Count('pk')).values('total'), output_field=IntegerField()),
+            Value(0),
+        )
+
+    job = get_object_or_404(
+        Job.objects.select_related('funder').annotate(
+            applications_total=count_of(JobApplication),
+            submissions_total=count_of(JobSubmission, is_draft=False),
+        ),
+        pk=pk,
+    )
+
+    is_authenticated = viewer is not None and viewer.is_authenticated
+    is_owner = is_authenticated and viewer.pk == job.funder_id
+    if owner_only and not is_owner:
+        raise Http404("Job not found")
+    if job.status == 'draft' and not is_owner:
+        raise Http404("Job not found")
+
+    detail = JobDetail(job=job, viewer=viewer, is_owner=is_owner)
+    if is_owner:
+        prefetch_related_objects(
+            [job],
+            Prefetch('applications', queryset=JobApplication.objects.select_related('applicant').order_by('-created_at')),
+            Prefetch('submissions', queryset=JobSubmission.objects.select_related('creator')),
+        )
+        detail.applications = list(job.applications.all())
+        all_submissions = list(job.submissions.all())
+        detail.submissions = [sub for sub in all_submissions if not sub.is_draft]
+        detail.user_submissions = [sub for sub in all_submissions if sub.creator_id == viewer.pk]
+        detail.user_application = next(
+            (application for application in detail.applications if application.applicant_id == viewer.pk), None
+        )
+    elif is_authenticated:
+        prefetch_related_objects(
+            [job],
+            Prefetch('applications', queryset=JobApplication.objects.filter(applicant=viewer), to_attr='viewer_applications'),
+            Prefetch('submissions', queryset=JobSubmission.objects.filter(creator=viewer), to_attr='viewer_submissions'),
+        )
+        detail.user_application = next(iter(job.viewer_applications), None)
+        detail.user_submissions = job.viewer_submissions
+    return detail
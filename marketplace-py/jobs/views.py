@@ -1,26 +1,46 @@
+import functools
+import time
 from decimal import Decimal
+from types import MappingProxyType
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.utils.translation import gettext_lazy as _
-from django.db.models import Q, Count, Prefetch
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import get_language, gettext_lazy as _
+from django.db.models import Q, Count, Max, Sum
 from django.urls import reverse
-from django.http import Http404
+from django.http import Http404, JsonResponse
 from django.views.decorators.http import require_POST
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.dateparse import parse_date
+from django.core.paginator import Paginator
+from datetime import datetime, timedelta
 from django.core.files.base import ContentFile
 from audio.forms import AudioContributionForm
+from marketplace import tracing
+from marketplace.conditional import Validators, conditional_view
+from marketplace.replicas import read_from_replica
 from .forms import JobApplicationForm
+from . import ledger, reviews
 from .models import Job, JobSubmission, JobApplication
+from .page_cache import anonymous_page_cache, tag_version
+from .view_models import build_owner_dashboard, load_job_detail
 from users.models import User
 from .audio_support import AUDIO_SUPPORT_OPPORTUNITIES, get_audio_support_opportunity
 
 
 COMMUNITY_FUND_AMOUNT = 10
+MONEY_HISTORY_PAGE_SIZE = 20
+LISTED_JOB_STATUSES = ['recruiting', 'open', 'submitting']
+# "Deadline soon" badges change with time alone, so list ETags expire this often
+JOB_LIST_ETAG_PERIOD = 3600
 
 
-def _build_audio_targets():
+@functools.lru_cache(maxsize=None)
+def _audio_targets_for_language(language_code):
+    # The support URLs only depend on the active language prefix, so they are
+    # reversed once per language instead of on every dashboard request
     targets = {}
     for slug, opportunity in AUDIO_SUPPORT_OPPORTUNITIES.items():
         targets[slug] = {
@@ -31,7 +51,17 @@ def _build_audio_targets():
             'needs_funding': opportunity.needs_funding,
             'support_url': reverse('jobs:audio_support', args=[slug]),
         }
-    return targets
+    return MappingProxyType(targets)
+
+
+@receiver(setting_changed)
+def _reset_audio_targets(setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        _audio_targets_for_language.cache_clear()
+
+
+def _build_audio_targets():
+    return _audio_targets_for_language(get_language())
 
 
 def home(request):
@@ -41,11 +71,59 @@ def home(request):
     return redirect('jobs:list')
 
 
+def _user_activity_parts(user):
+    """Versions of the viewer's own applications and submissions."""
+    applications = JobApplication.objects.filter(applicant=user).aggregate(
+        count=Count('pk'), updated=Max('updated_at'),
+    )
+    submissions = JobSubmission.objects.filter(creator=user).aggregate(
+        count=Count('pk'), updated=Max('updated_at'),
+    )
+    return (*applications.values(), *submissions.values())
+
+
+def _funded_jobs_validators(request):
+    """Validators for pages listing the funder's own jobs and their submissions."""
+    jobs = Job.objects.filter(funder=request.user).aggregate(
+        count=Count('pk'), updated=Max('updated_at'), accepted=Sum('accepted_count'),
+    )
+    submissions = JobSubmission.objects.filter(job__funder=request.user).aggregate(
+        count=Count('pk'), updated=Max('updated_at'),
+    )
+    return Validators(parts=(
+        request.user.role, tag_version('jobs'), *jobs.values(), *submissions.values(),
+    ))
+
+
+def _accepted_jobs_validators(request):
+    return Validators(parts=(tag_version('jobs'), *_user_activity_parts(request.user)))
+
+
+def _dashboard_validators(request):
+    return Validators(parts=(request.user.posted_jobs.exists(),))
+
+
+def _job_list_validators(request):
+    stats = Job.objects.filter(status__in=LISTED_JOB_STATUSES).aggregate(
+        count=Count('pk'), updated=Max('updated_at'), accepted=Sum('accepted_count'),
+    )
+    parts = (
+        tag_version('jobs'), stats['count'], stats['updated'], stats['accepted'],
+        int(time.time()) // JOB_LIST_ETAG_PERIOD,
+    )
+    if request.user.is_authenticated:
+        parts += _user_activity_parts(request.user)
+    return Validators(parts=parts, last_modified=stats['updated'])
+
+
+@read_from_replica
+@conditional_view(_job_list_validators)
+@anonymous_page_cache(lambda request: ['jobs'])
 def job_list(request):
     """List all available jobs."""
     # Show jobs that are recruiting (available for applications) or submitting (in work submission stage)
     # Include both 'recruiting' and legacy 'open' status for backward compatibility
-    jobs = Job.objects.filter(status__in=['recruiting', 'open', 'submitting']).order_by('-created_at')
+    jobs = Job.objects.filter(status__in=LISTED_JOB_STATUSES).order_by('-created_at')
     
     # Annotate with counts for applications and submissions
     # For submissions, count only pending and accepted (not rejected) since those count toward the goal
@@ -78,18 +156,16 @@ def job_list(request):
     # Get jobs waiting for user's submission (if authenticated)
     waiting_for_submission = []
     if request.user.is_authenticated:
-        # Jobs in 'submitting' state where user has selected application but no submission
+        # Jobs in 'submitting' state where user has selected application but no
+        # submission, in one query rather than an .exists() per job
         selected_applications = JobApplication.objects.filter(
             applicant=request.user,
-            status='selected'
+            status='selected',
+            job__status='submitting',
+        ).exclude(
+            job__submissions__creator=request.user
         ).select_related('job')
-        
-        for application in selected_applications:
-            job = application.job
-            if job.status == 'submitting':
-                # Check if user hasn't submitted yet
-                if not job.submissions.filter(creator=request.user).exists():
-                    waiting_for_submission.append(job)
+        waiting_for_submission = [application.job for application in selected_applications]
     
     # Get user's applied job IDs for tag display
     user_applied_job_ids = set()
@@ -135,108 +211,39 @@ def job_list(request):
     return render(request, 'jobs/job_list.html', context)
 
 
+def _job_detail_validators(request, pk):
+    # The page is read-only: deadline transitions come from the
+    # apply_job_transitions command and bump updated_at and the tag version
+    row = Job.objects.filter(pk=pk).values('updated_at', 'status', 'accepted_count').first()
+    if row is None:
+        return None
+    parts = (tag_version(f'job:{pk}'), row['updated_at'], row['status'], row['accepted_count'])
+    return Validators(parts=parts, last_modified=row['updated_at'])
+
+
+@read_from_replica
+@conditional_view(_job_detail_validators)
+@anonymous_page_cache(lambda request, pk: [f'job:{pk}'])
 def job_detail(request, pk):
     """View job details."""
-    job = get_object_or_404(Job, pk=pk)
-    
-    # If job is a draft, only allow the owner to view it
-    if job.status == 'draft' and (not request.user.is_authenticated or request.user != job.funder):
-        raise Http404("Job not found")
-    
-    # Check if job should auto-transition (e.g., deadline passed)
-    if job.should_transition_to_selecting():
-        job.status = 'selecting'
-        job.save(update_fields=['status'])
-    
-    # Check if job should expire
-    if job.should_expire():
-        job.status = 'expired'
-        job.save(update_fields=['status'])
-    
-    user_submissions = None
-    user_application = None
-    
-    if request.user.is_authenticated:
-        user_submissions = job.submissions.filter(creator=request.user)
-        user_application = job.applications.filter(applicant=request.user).first()
-    
-    # Add helper data for contract completion if user is job owner
-    can_complete_contract = False
-    applications = None
-    selected_count = 0
-    can_start_contract = False
-    show_start_contract_button = False
-    show_complete_contract_button = False
-    show_cancel_contract_button = False
-    accepted_submissions_count = 0
-    all_accepted_complete = False
-    
-    if request.user.is_authenticated and request.user == job.funder:
-        accepted_submissions = job.submissions.filter(status='accepted')
-        accepted_submissions_count = accepted_submissions.count()
-        # All accepted submissions are automatically marked as complete when accepted
-        # So if there are accepted submissions, they're all complete
-        all_accepted_complete = accepted_submissions_count > 0
-        can_complete_contract = (
-            job.status == 'reviewing' and
-            accepted_submissions.exists() and
-            all_accepted_complete and
-            not job.contract_completed
-        )
-        
-        # Show complete contract button if job is in reviewing state and has accepted submissions
-        show_complete_contract_button = (
-            job.status == 'reviewing' and
-            accepted_submissions.exists() and
-            not job.contract_completed
-        )
-        
-        # Show cancel contract button if job is in an active state (not completed or canceled)
-        show_cancel_contract_button = (
-            job.status not in ['complete', 'canceled', 'expired']
-        )
-        
-        # Get applications for job owner
-        applications = job.applications.select_related('applicant').order_by('-created_at')
-        selected_count = applications.filter(status='selected').count()
-        
-        # Can start contract if job is in selecting or recruiting state and at least one application is selected
-        can_start_contract = (
-            (job.status == 'selecting' or job.status == 'recruiting') and
-            selected_count > 0
-        )
-        
-        # Show start contract button if job is in selecting state, or in recruiting state with approved applications
-        show_start_contract_button = (
-            job.status == 'selecting' or 
-            (job.status == 'recruiting' and selected_count > 0)
-        )
-    
-    context = {
-        'job': job,
-        'user_submissions': user_submissions,
-        'user_application': user_application,
-        'can_complete_contract': can_complete_contract,
-        'applications': applications,
-        'selected_count': selected_count,
-        'can_start_contract': can_start_contract,
-        'show_start_contract_button': show_start_contract_button,
-        'show_complete_contract_button': show_complete_contract_button,
-        'show_cancel_contract_button': show_cancel_contract_button,
-        'accepted_submissions_count': accepted_submissions_count,
-        'all_accepted_complete': all_accepted_complete,
-    }
-    return render(request, 'jobs/job_detail.html', context)
+    # Drafts are only visible to their owner (Http404 otherwise). Every flag
+    # is derived from rows loaded up front; see jobs.view_models.
+    detail = load_job_detail(pk, request.user)
+    return render(request, 'jobs/job_detail.html', detail.get_context())
 
 
+@read_from_replica
 @login_required
+@conditional_view(_funded_jobs_validators)
 def my_jobs(request):
     """View jobs posted by the current user."""
     if not request.user.is_funder():
         messages.error(request, _('You do not have permission to view this page.'))
         return redirect('jobs:list')
     
-    jobs = Job.objects.filter(funder=request.user).order_by('-created_at')
+    jobs = Job.objects.filter(funder=request.user).annotate(
+        submissions_count=Count('submissions')
+    ).order_by('-created_at')
     
     status_filter = request.GET.get('status')
     if status_filter:
@@ -250,55 +257,35 @@ def my_jobs(request):
 
 
 @login_required
+@conditional_view(_funded_jobs_validators)
 def job_owner_dashboard(request):
     """Dashboard for funders to monitor their jobs and submissions."""
-    jobs_qs = Job.objects.filter(funder=request.user).annotate(
-        total_submissions=Count('submissions', distinct=True),
-        accepted_submissions=Count('submissions', filter=Q(submissions__status='accepted'), distinct=True),
-        pending_submissions=Count('submissions', filter=Q(submissions__status='pending'), distinct=True),
-    ).prefetch_related(
-        Prefetch(
-            'submissions',
-            queryset=JobSubmission.objects.select_related('creator').order_by('-created_at')
-        )
-    ).order_by('-created_at')
-    
-    has_jobs = jobs_qs.exists()
-    jobs = list(jobs_qs)
-    
-    # Add helper data for each job to determine if contract can be completed
-    for job in jobs:
-        accepted_submissions = job.submissions.filter(status='accepted')
-        job.all_accepted_complete = accepted_submissions.exists() and all(
-            sub.is_complete for sub in accepted_submissions
-        )
-        job.can_complete_contract = (
-            job.status == 'reviewing' and
-            accepted_submissions.exists() and
-            job.all_accepted_complete and
-            not job.contract_completed
-        )
+    dashboard = build_owner_dashboard(request.user, request.GET.get('page'))
     
     context = {
-        'jobs': jobs,
-        'has_jobs': has_jobs,
+        'drafts': dashboard.drafts,
+        'published_jobs': dashboard.published_jobs,
+        'has_jobs': dashboard.has_jobs,
+        'page_obj': dashboard.page,
     }
     return render(request, 'jobs/job_owner_dashboard.html', context)
 
 
+@read_from_replica
 @login_required
+@conditional_view(_accepted_jobs_validators)
 def accepted_jobs(request):
     """View all user's job activity: applications and accepted submissions."""
     # Get user's applications (pending, selected, rejected)
     applications = JobApplication.objects.filter(
         applicant=request.user
-    ).select_related('job').order_by('-created_at')
+    ).select_related('job__funder').order_by('-created_at')
     
     # Get user's accepted submissions
     accepted_submissions = JobSubmission.objects.filter(
         creator=request.user,
         status='accepted'
-    ).select_related('job').order_by('-created_at')
+    ).select_related('job__funder').order_by('-created_at')
     
     context = {
         'applications': applications,
@@ -777,7 +764,10 @@ def edit_job(request, pk):
                 if reference_image:
                     job.reference_image = reference_image
                 
-                job.status = 'draft'
+                # Saving a recruiting job as a draft takes it off the listings
+                if job.status != 'draft' and not job.apply_transition('unpublish', actor=request.user, reason='saved as draft'):
+                    messages.warning(request, _('This job cannot be edited in its current state.'))
+                    return redirect('jobs:detail', pk=job.pk)
                 job.save()
                 
                 messages.success(request, _('Draft saved successfully!'))
@@ -898,8 +888,8 @@ def edit_job(request, pk):
                     if reference_image:
                         job.reference_image = reference_image
                     
-                    job.status = 'recruiting'
                     job.save()
+                    job.apply_transition('publish', actor=request.user)
                     
                     messages.success(request, _('Job published successfully! It is now available for recruiting.'))
                     return redirect('jobs:detail', pk=job.pk)
@@ -1203,13 +1193,12 @@ def submit_job(request, pk):
             if profile_updated:
                 user.save()
             
-            # Refresh job to check if it should transition to reviewing
-            # Need to refresh to get updated submission count
+            # Refresh job to check if it should transition to reviewing: the
+            # guarded transition needs the current status as its source
             # Note: should_transition_to_reviewing only counts non-draft submissions
             job.refresh_from_db()
             if job.should_transition_to_reviewing():
-                job.status = 'reviewing'
-                job.save(update_fields=['status'])
+                job.apply_transition('begin_review', reason='submit limit reached')
             
             messages.success(request, _('Submission created successfully!'))
         else:
@@ -1234,16 +1223,17 @@ def submit_job(request, pk):
 @login_required
 def preview_submission(request, pk):
     """Preview a draft submission for a job."""
-    job = get_object_or_404(Job, pk=pk)
+    detail = load_job_detail(pk, request.user)
+    job = detail.job
 
     # Check if user was selected as an applicant
-    user_application = job.applications.filter(applicant=request.user, status='selected').first()
-    if not user_application:
+    user_application = detail.user_application
+    if not user_application or user_application.status != 'selected':
         messages.error(request, _('You must be approved as an applicant before you can preview submissions for this job.'))
         return redirect('jobs:detail', pk=job.pk)
 
     # Get the user's draft submission
-    draft_submission = job.submissions.filter(creator=request.user, is_draft=True).first()
+    draft_submission = detail.user_draft_submission
 
     if not draft_submission:
         messages.warning(request, _('No draft submission found. Please create a draft first.'))
@@ -1267,45 +1257,24 @@ def accept_submission(request, job_pk, submission_pk):
         messages.warning(request, _('This submission is already accepted.'))
         return redirect('jobs:detail', pk=job.pk)
     
-    # Check if job has reached max responses
-    if job.has_reached_max_responses():
-        messages.error(request, _('This job has reached its maximum number of responses ({max}). Cannot accept more submissions.').format(max=job.max_responses))
+    if submission.is_draft:
+        messages.error(request, _('This submission is still a draft and cannot be accepted yet.'))
         return redirect('jobs:detail', pk=job.pk)
     
-    # If max_responses is 1, reject all other submissions (old behavior)
-    # Otherwise, allow multiple accepted submissions
-    if job.max_responses == 1:
-        job.submissions.exclude(pk=submission_pk).update(status='rejected')
-    
-    # Accept this submission
-    submission.status = 'accepted'
-    # Auto-mark as complete when accepted - submitting work IS completing the work
-    from django.utils import timezone
-    submission.is_complete = True
-    submission.completed_at = timezone.now()
-    submission.save()
-    
-    # Update job status based on progress
-    # Transition to reviewing when first submission is received
-    # Job should NEVER automatically jump to complete - it stays in reviewing
-    # until all accepted submissions are marked complete by workers AND job owner confirms
-    new_status = None
-    if job.status == 'submitting':
-        # First submission received, move to reviewing
-        new_status = 'reviewing'
-    elif job.status != 'reviewing' and job.submissions.filter(status='pending', is_draft=False).exists():
-        # If we have pending submissions (non-draft) and job is not already reviewing, move to reviewing
-        new_status = 'reviewing'
-    # Note: We intentionally do NOT transition to 'complete' here, even if max_responses is reached.
-    # The job stays in 'reviewing' until workers mark their work complete and job owner confirms.
-    
-    if new_status and job.status != new_status:
-        job.status = new_status
-        job.save(update_fields=['status'])
+    # Slot reservation and the status change happen in one conditional UPDATE,
+    # so parallel reviewers cannot push the job past max_responses.
+    # If max_responses is 1 all other submissions are rejected (old behavior).
+    result = reviews.accept_submissions(job, [submission.pk], actor=request.user)
+    if not result.accepted:
+        if result.limit_reached:
+            messages.error(request, _('This job has reached its maximum number of responses ({max}). Cannot accept more submissions.').format(max=result.max_responses))
+        else:
+            messages.warning(request, _('This submission is already accepted.'))
+        return redirect('jobs:detail', pk=job.pk)
     
     messages.success(request, _('Submission accepted! ({accepted}/{max} responses)').format(
-        accepted=job.get_accepted_submissions_count(),
-        max=job.max_responses
+        accepted=result.accepted_count,
+        max=result.max_responses
     ))
     return redirect('jobs:detail', pk=job.pk)
 
@@ -1320,14 +1289,53 @@ def decline_submission(request, job_pk, submission_pk):
         messages.warning(request, _('This submission is already declined.'))
         return redirect('jobs:detail', pk=job.pk)
 
-    # Decline this submission
-    submission.status = 'rejected'
-    submission.save()
+    # Decline this submission (frees its slot if it had been accepted)
+    reviews.reject_submissions(job, [submission.pk])
 
     messages.success(request, _('Submission declined.'))
     return redirect('jobs:detail', pk=job.pk)
 
 
+@login_required
+@require_POST
+def bulk_review_submissions(request, pk):
+    """Accept or decline many submissions of a job in one transaction."""
+    job = get_object_or_404(Job, pk=pk, funder=request.user)
+    action = request.POST.get('action')
+    try:
+        submission_ids = [int(value) for value in request.POST.getlist('submission_ids')]
+    except ValueError:
+        submission_ids = []
+    
+    if action not in ('accept', 'decline') or not submission_ids:
+        messages.error(request, _('Select at least one submission and an action.'))
+        return redirect('jobs:owner_dashboard')
+    
+    if action == 'accept':
+        result = reviews.accept_submissions(job, submission_ids, actor=request.user)
+        if result.accepted:
+            messages.success(request, _('{count} submission(s) accepted ({accepted}/{max} responses).').format(
+                count=len(result.accepted),
+                accepted=result.accepted_count,
+                max=result.max_responses
+            ))
+        if result.skipped:
+            if result.limit_reached:
+                messages.warning(request, _('{count} submission(s) were not accepted because the job reached its maximum number of responses ({max}).').format(
+                    count=len(result.skipped),
+                    max=result.max_responses
+                ))
+            else:
+                messages.warning(request, _('{count} submission(s) were already accepted or are drafts.').format(
+                    count=len(result.skipped)
+                ))
+    else:
+        result = reviews.reject_submissions(job, submission_ids)
+        messages.success(request, _('{count} submission(s) declined.').format(count=len(result.rejected)))
+    
+    return redirect('jobs:owner_dashboard')
+
+
 @login_required
 def my_products(request):
     """View user's products/services (placeholder)."""
@@ -1335,35 +1343,52 @@ def my_products(request):
     return render(request, 'jobs/my_products.html', context)
 
 
+def _parse_day(value):
+    """Parse a YYYY-MM-DD query parameter, returning None if missing or invalid."""
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
 @login_required
 def my_money(request):
     """View user's wallet and financial information."""
-    # Get user's accepted jobs and their budgets
-    accepted_submissions = JobSubmission.objects.filter(
-        creator=request.user,
-        status='accepted'
-    ).select_related('job')
-    
-    total_earned = sum(submission.job.budget for submission in accepted_submissions)
-    
-    # Get jobs posted by user (money spent)
-    posted_jobs = Job.objects.filter(funder=request.user)
-    total_spent = sum(
-        job.budget for job in posted_jobs
-        if job.status in ['submitting', 'reviewing', 'complete', 'completed']
-    )
-    
-    balance = total_earned - total_spent
+    # Totals are materialized by jobs.ledger; this is a single row lookup
+    balance = ledger.get_balance(request.user)
+    
+    entries = Paginator(ledger.entries_for(request.user), MONEY_HISTORY_PAGE_SIZE)
+    page_obj = entries.get_page(request.GET.get('page'))
+    
+    # Optional date-range totals (?start=YYYY-MM-DD&end=YYYY-MM-DD, end inclusive)
+    range_start = _parse_day(request.GET.get('start'))
+    range_end = _parse_day(request.GET.get('end'))
+    range_totals = None
+    if range_start or range_end:
+        range_totals = ledger.totals_between(
+            request.user,
+            start=_start_of_day(range_start) if range_start else None,
+            end=_start_of_day(range_end + timedelta(days=1)) if range_end else None,
+        )
     
     context = {
-        'accepted_submissions': accepted_submissions,
-        'total_earned': total_earned,
-        'total_spent': total_spent,
-        'balance': balance,
+        'total_earned': balance.total_earned,
+        'total_spent': balance.total_spent,
+        'total_refunded': balance.total_refunded,
+        'balance': balance.balance,
+        'page_obj': page_obj,
+        'range_start': range_start,
+        'range_end': range_end,
+        'range_totals': range_totals,
     }
     return render(request, 'jobs/my_money.html', context)
 
 
+@read_from_replica
 @login_required
 def pending_jobs(request):
     """View jobs that need to be finished (accepted submissions)."""
@@ -1401,6 +1426,7 @@ def filler_page_2(request):
 
 
 @login_required
+@conditional_view(_dashboard_validators)
 def dashboard(request):
     """Dashboard with main navigation icons - mobile first design."""
     has_posted_jobs = False
@@ -1437,8 +1463,9 @@ def mark_job_completed(request, pk):
     # All accepted submissions are automatically marked as complete when accepted
     # No need to check for incomplete submissions
     
-    job.status = 'complete'
-    job.save(update_fields=['status'])
+    if not job.apply_transition('complete', actor=request.user):
+        messages.warning(request, _('This job cannot be completed in its current state.'))
+        return redirect('jobs:owner_dashboard')
     messages.success(request, _('Job marked as completed.'))
     return redirect('jobs:owner_dashboard')
 
@@ -1482,10 +1509,7 @@ def apply_to_job(request, pk):
             application.save()
             
             # Check if job should auto-transition to selecting
-            job.refresh_from_db()
-            if job.should_transition_to_selecting():
-                job.status = 'selecting'
-                job.save(update_fields=['status'])
+            if job.should_transition_to_selecting() and job.apply_transition('close_recruiting', reason='recruit limit reached'):
                 messages.success(request, _('Your application has been submitted! The job has reached its recruit limit and moved to selection phase.'))
             else:
                 messages.success(request, _('Your application has been submitted! The job owner will review it.'))
@@ -1504,18 +1528,24 @@ def apply_to_job(request, pk):
 @login_required
 def view_applications(request, pk):
     """Job owner view to see all applications for their job."""
-    job = get_object_or_404(Job, pk=pk, funder=request.user)
-    
-    applications = job.applications.select_related('applicant').order_by('-created_at')
+    detail = load_job_detail(pk, request.user, owner_only=True)
     
     context = {
-        'job': job,
-        'applications': applications,
-        'selected_count': applications.filter(status='selected').count(),
+        'job': detail.job,
+        'applications': detail.applications,
+        'selected_count': detail.selected_count,
     }
     return render(request, 'jobs/view_applications.html', context)
 
 
+APPLICATION_ACTION_MESSAGES = {
+    'approve': _('Application approved.'),
+    'select': _('Application approved.'),
+    'reject': _('Application rejected.'),
+    'pending': _('Application status reset to pending.'),
+}
+
+
 @login_required
 @require_POST
 def select_application(request, job_pk, application_pk):
@@ -1524,23 +1554,48 @@ def select_application(request, job_pk, application_pk):
     application = get_object_or_404(JobApplication, pk=application_pk, job=job)
     
     action = request.POST.get('action')
-    if action == 'select' or action == 'approve':
-        application.status = 'selected'
-        application.save()
-        messages.success(request, _('Application approved.'))
-    elif action == 'reject':
-        application.status = 'rejected'
-        application.save()
-        messages.success(request, _('Application rejected.'))
-    elif action == 'pending':
-        application.status = 'pending'
-        application.save()
-        messages.success(request, _('Application status reset to pending.'))
+    if action in reviews.APPLICATION_ACTIONS:
+        reviews.triage_applications(job, [application.pk], action)
+        messages.success(request, APPLICATION_ACTION_MESSAGES[action])
     
     # Redirect to job detail page (where applications are now shown)
     return redirect('jobs:detail', pk=job.pk)
 
 
+@login_required
+@require_POST
+def triage_applications(request, pk):
+    """
+    Approve, reject or reset many applications of a job in one request.
+
+    Expects ``action`` (approve/reject/pending) and one or more
+    ``application_ids``. Returns the diff from ``reviews.triage_applications``
+    as JSON for in-place page updates, or redirects back to the job page for
+    plain form posts.
+    """
+    job = get_object_or_404(Job, pk=pk, funder=request.user)
+    action = request.POST.get('action')
+    try:
+        application_ids = [int(value) for value in request.POST.getlist('application_ids')]
+    except ValueError:
+        application_ids = []
+    wants_json = 'application/json' in request.headers.get('Accept', '')
+    
+    if action not in reviews.APPLICATION_ACTIONS or not application_ids:
+        error = _('Select at least one application and an action.')
+        if wants_json:
+            return JsonResponse({'error': str(error)}, status=400)
+        messages.error(request, error)
+        return redirect('jobs:detail', pk=job.pk)
+    
+    diff = reviews.triage_applications(job, application_ids, action)
+    if wants_json:
+        return JsonResponse(diff)
+    
+    messages.success(request, _('{count} application(s) updated.').format(count=len(diff['changed'])))
+    return redirect('jobs:detail', pk=job.pk)
+
+
 @login_required
 @require_POST
 def pre_approve_payments(request, pk):
@@ -1556,9 +1611,7 @@ def pre_approve_payments(request, pk):
         return redirect('jobs:detail', pk=job.pk)
     
     # Transition job from selecting or recruiting to submitting state
-    if job.status == 'selecting' or job.status == 'recruiting':
-        job.status = 'submitting'
-        job.save(update_fields=['status'])
+    if job.apply_transition('start_submitting', actor=request.user):
         selected_count = selected_applications.count()
         messages.success(request, _('Contract started! The job is now in submitting phase. {count} approved worker(s) can now submit their work. No more applications will be accepted.').format(count=selected_count))
     elif job.status != 'submitting':
@@ -1705,6 +1758,9 @@ def start_contract(request, pk):
             continue_url=str(processor.pending_payment.continue_url) if processor.pending_payment.continue_url else None,
         )
         
+        # The wallet callback and payment webhook link back to this trace
+        tracing.remember_trace(f'contract:{job.pk}')
+        
         # Redirect buyer to wallet for authorization
         return redirect(str(redirect_url))
         
@@ -1750,6 +1806,7 @@ def complete_contract_payment(request, contract_id=None):
     except Job.DoesNotExist:
         messages.error(request, _('Contract not found.'))
         return redirect('jobs:list')
+    tracing.link_trace(f'contract:{job.pk}')
     
     # Verify user is the funder
     if request.user != job.funder:
@@ -1811,8 +1868,10 @@ def complete_contract_payment(request, contract_id=None):
         pending_txn.save(update_fields=['interact_ref', 'hash_value'])
         
         # Update job status to submitting (authorization successful, but payment not yet completed)
-        job.status = 'submitting'
-        job.save(update_fields=['status'])
+        job.apply_transition('start_submitting', actor=request.user, reason='contract authorized')
+        
+        # The funds are committed now: debit the budget (settlement only pays out and refunds)
+        ledger.record_contract_funding(job, reference=contract_id)
         
         messages.success(request, _('Contract authorized! Job is now in submitting phase. Approved workers can now submit their work. You can complete the contract payment after reviewing submissions.'))
         return redirect('jobs:detail', pk=job.pk)
@@ -1824,6 +1883,41 @@ def complete_contract_payment(request, contract_id=None):
         return redirect('jobs:detail', pk=job.pk)
 
 
+def payments_finish(request):
+    """Handle the wallet redirect for payments started through the payments service."""
+    from .payments_utils import finish_payment
+
+    pending_id = request.GET.get('pendingId')
+    interact_ref = request.GET.get('interact_ref')
+    hash_value = request.GET.get('hash')
+
+    if not pending_id or not interact_ref or not hash_value:
+        return render(request, 'jobs/payment_finish.html', {
+            'success': False,
+            'error': _('Invalid callback parameters.'),
+        })
+
+    result = finish_payment(pending_id, interact_ref, hash_value)
+    data = result.get('data') or {}
+    offer_id = data.get('offerId') or request.GET.get('offerId')
+    job = Job.objects.filter(pk=offer_id).first() if offer_id and str(offer_id).isdigit() else None
+
+    if job is not None:
+        if result['success']:
+            messages.success(request, _('Payment completed!'))
+        else:
+            messages.error(request, _('Payment could not be completed: {error}').format(error=result['error']))
+        return redirect('jobs:detail', pk=job.pk)
+
+    return render(request, 'jobs/payment_finish.html', {
+        'success': result['success'],
+        'error': result.get('error'),
+        'outgoing_payment': data.get('outgoingPayment'),
+        'status': data.get('status'),
+        'pending_id': pending_id,
+    })
+
+
 @login_required
 @require_POST
 def mark_submission_complete(request, job_pk, submission_pk):
@@ -1943,9 +2037,10 @@ def complete_contract(request, pk):
         )
         
         # Mark contract as completed and mark job as complete
-        job.contract_completed = True
-        job.status = 'complete'
-        job.save(update_fields=['contract_completed', 'status'])
+        if not job.apply_transition('complete', actor=request.user, reason='contract paid', contract_completed=True):
+            job.contract_completed = True
+            job.save(update_fields=['contract_completed'])
+        ledger.record_contract_settlement(job, reference=str(getattr(outgoing_payment, 'id', '') or ''))
         
         messages.success(request, _('Contract completed! Job has been marked as complete. Payments have been released to workers.'))
         return redirect('jobs:detail', pk=job.pk)
@@ -1973,8 +2068,9 @@ def cancel_contract(request, pk):
         return redirect('jobs:detail', pk=job.pk)
     
     # Cancel the job
-    job.status = 'canceled'
-    job.save(update_fields=['status'])
+    if not job.apply_transition('cancel', actor=request.user):
+        messages.warning(request, _('This job cannot be canceled in its current state.'))
+        return redirect('jobs:detail', pk=job.pk)
     
     messages.success(request, _('Contract has been canceled. No further actions can be taken on this job.'))
     return redirect('jobs:detail', pk=job.pk)
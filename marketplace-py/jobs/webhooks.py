@@ -2,12 +2,33 @@
 import json
 import logging
 from django.http import JsonResponse, HttpResponseBadRequest
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
+from marketplace import tracing
+from marketplace.metrics import WEBHOOK_LAG
+from . import ledger
 from .models import Job
 
 logger = logging.getLogger(__name__)
 
+WEBHOOK_EVENTS = frozenset(['payment.completed', 'payment.failed'])
+
+
+def _observe_lag(event_type, timestamp):
+    """Record how long the event took to reach us, when the payload says when it happened."""
+    try:
+        sent_at = parse_datetime(timestamp or '')
+    except ValueError:
+        sent_at = None
+    if sent_at is None or timezone.is_naive(sent_at):
+        return
+    WEBHOOK_LAG.observe(
+        max((timezone.now() - sent_at).total_seconds(), 0.0),
+        event=event_type if event_type in WEBHOOK_EVENTS else 'other',
+    )
+
 
 @csrf_exempt
 @require_POST
@@ -44,6 +65,7 @@ def payment_webhook(request):
         if not all([event_type, pending_id, offer_id, status]):
             logger.error("[webhook] Missing required fields in payload")
             return HttpResponseBadRequest("Missing required fields")
+        _observe_lag(event_type, timestamp)
         
         # Look up the job by offer_id (which is the job pk)
         try:
@@ -55,17 +77,32 @@ def payment_webhook(request):
                 'error': 'Job not found'
             }, status=404)
         
+        # Requests carrying our traceparent continue the contract's trace;
+        # link it for the ones that do not
+        tracing.link_trace(f'contract:{job.pk}')
+        
         # Handle payment completion
         if event_type == 'payment.completed' and status == 'paid':
             # Update job with payment confirmation
-            job.payment_id = outgoing_payment_id or pending_id
-            job.contract_completed = True
+            payment_fields = {
+                'payment_id': outgoing_payment_id or pending_id,
+                'contract_completed': True,
+            }
             
             # If job is in 'reviewing' state and payment confirmed, mark as complete
-            if job.status == 'reviewing':
-                job.status = 'complete'
+            completed = job.status == 'reviewing' and job.apply_transition(
+                'complete', reason='payment webhook', **payment_fields
+            )
+            if not completed:
+                for attr, value in payment_fields.items():
+                    setattr(job, attr, value)
+                job.save(update_fields=list(payment_fields))
             
-            job.save()
+            # Idempotent: retries and the complete-contract view share keys.
+            # Payments started through the payments service are funded here;
+            # contracts authorized in complete_contract_payment already were.
+            ledger.record_contract_funding(job, reference=payment_fields['payment_id'])
+            ledger.record_contract_settlement(job, reference=payment_fields['payment_id'])
             
             logger.info(
                 f"[webhook] Payment confirmed for job {job.pk} ({job.title}). "
@@ -0,0 +1,94 @@
+"""
+Conditional GET (ETag / Last-Modified) for HTML pages and API endpoints.
+
+``conditional_view(validators)`` answers ``304 Not Modified`` before the view
+runs, so no template or serializer work is done when the client's copy is
+still current. ``validators(request, *args, **kwargs)`` returns a
+``Validators`` built from cheap reads (``updated_at`` maxima, counter
+columns, cache versions) or None to skip validation for that request.
+
+The ETag also covers everything a response varies on besides the data: the
+viewer and their role, UI and audio languages, the static UI version, the CSRF cookie (pages
+embed a token derived from it), the Accept header and
+CONDITIONAL_GET_VERSION, which deployments bump so browsers drop pages
+rendered by older templates.
+"""
+import hashlib
+from calendar import timegm
+from dataclasses import dataclass
+from datetime import datetime
+from functools import wraps
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.contrib import messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from audio.mixins import get_static_ui_version
+from marketplace.config import get_language_preferences
+
+
+@dataclass(frozen=True)
+class Validators:
+    parts: Tuple
+    last_modified: Optional[datetime] = None
+
+
+def request_fingerprint(request):
+    """What a response varies on for this request, apart from its data."""
+    user = request.user
+    return (
+        getattr(settings, 'CONDITIONAL_GET_VERSION', ''),
+        # Pages and the nav branch on the role, which users can change
+        f'user:{user.pk}:{user.role}' if user.is_authenticated else 'anonymous',
+        getattr(request, 'LANGUAGE_CODE', settings.LANGUAGE_CODE),
+        get_language_preferences(request).preferred_audio_language,
+        f'static_ui:{get_static_ui_version()}',
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+        request.META.get('HTTP_ACCEPT', ''),
+    )
+
+
+def make_etag(request, parts):
+    raw = repr((request_fingerprint(request), tuple(parts)))
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+def conditional_view(validators):
+    """
+    Validate GET/HEAD requests with an ETag (and Last-Modified when given).
+
+    Args:
+        validators: Callable ``(request, *args, **kwargs) -> Validators or None``.
+            Works on function views and, through ``method_decorator``, on
+            DRF viewset methods.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            # Flash messages are rendered once, so the page must be rebuilt
+            if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+                return view(request, *args, **kwargs)
+
+            result = validators(request, *args, **kwargs)
+            if result is None:
+                return view(request, *args, **kwargs)
+
+            etag = make_etag(request, result.parts)
+            last_modified = timegm(result.last_modified.utctimetuple()) if result.last_modified else None
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+
+            if response.status_code in (200, 304):
+                response.headers.setdefault('ETag', etag)
+                if last_modified:
+                    response.headers.setdefault('Last-Modified', http_date(last_modified))
+            patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+            if not response.has_header('Cache-Control'):
+                # Browsers keep the copy but must revalidate before reuse
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapped
+    return decorator
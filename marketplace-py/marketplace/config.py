@@ -0,0 +1,132 @@
+"""
+Settings-derived configuration computed once per process.
+
+Language sets, fallback chains and the audio player config used to be rebuilt
+from settings on every request (and again in each audio tag). ``get_site_config()``
+builds them once into a frozen ``SiteConfig``; tests that change settings get
+a fresh one through the ``setting_changed`` signal.
+
+``get_language_preferences(request)`` resolves the viewer's audio language and
+fallback chain once per request (``LanguagePreferencesMiddleware`` calls it
+up front) and stores them on the request.
+"""
+import functools
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+@dataclass(frozen=True)
+class SiteConfig:
+    language_code: str
+    language_codes: frozenset
+    supported_ui_languages: frozenset
+    fallback_text_language: str
+    preferred_audio_cookie: str
+    language_cookie: str
+    fragment_cache_timeout: int
+    # Read-only dicts so the shared instance cannot be mutated by a caller
+    audio_config: Mapping[str, str]
+    fallback_chains: Mapping[str, Tuple[str, ...]]
+
+    def language_chain(self, preferred_language_code=None):
+        """
+        Languages to try for audio: the preferred language,
+        FALLBACK_TEXT_LANGUAGE, then LANGUAGE_CODE (without duplicates).
+        """
+        chain = self.fallback_chains.get(preferred_language_code)
+        if chain is None:
+            chain = _build_chain(preferred_language_code)
+        return chain
+
+
+def _build_chain(preferred_language_code):
+    chain = []
+    for code in (
+        preferred_language_code,
+        getattr(settings, 'FALLBACK_TEXT_LANGUAGE', None),
+        settings.LANGUAGE_CODE,
+    ):
+        if code and code not in chain:
+            chain.append(code)
+    return tuple(chain)
+
+
+def _media_url(filename):
+    return (settings.MEDIA_URL.rstrip('/') + '/' + filename).replace('//', '/')
+
+
+@functools.lru_cache(maxsize=None)
+def get_site_config():
+    """The process-wide SiteConfig (rebuilt after a settings override)."""
+    language_codes = frozenset(code for code, _name in settings.LANGUAGES)
+    return SiteConfig(
+        language_code=settings.LANGUAGE_CODE,
+        language_codes=language_codes,
+        supported_ui_languages=frozenset(getattr(settings, 'SUPPORTED_UI_LANGUAGES', (settings.LANGUAGE_CODE,))),
+        fallback_text_language=getattr(settings, 'FALLBACK_TEXT_LANGUAGE', settings.LANGUAGE_CODE),
+        preferred_audio_cookie=getattr(settings, 'PREFERRED_AUDIO_LANGUAGE_COOKIE_NAME', 'preferred_audio_language'),
+        language_cookie=settings.LANGUAGE_COOKIE_NAME,
+        fragment_cache_timeout=getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 600),
+        audio_config=MappingProxyType({
+            'icon_inactive': _media_url(getattr(settings, 'AUDIO_ICON_INACTIVE', 'listen-inactive.png')),
+            'icon_active': _media_url(getattr(settings, 'AUDIO_ICON_ACTIVE', 'listen-active.png')),
+            'fallback_audio': json.dumps(getattr(settings, 'AUDIO_FALLBACK_BY_LANGUAGE', {})),
+            'fallback_file': getattr(settings, 'AUDIO_FALLBACK_FILE', 'audio/fallback.mp3'),
+            'media_url': settings.MEDIA_URL,
+            'static_url': settings.STATIC_URL,
+        }),
+        fallback_chains=MappingProxyType({
+            code: _build_chain(code) for code in [None, *language_codes]
+        }),
+    )
+
+
+@receiver(setting_changed)
+def _reset_site_config(**kwargs):
+    get_site_config.cache_clear()
+
+
+@dataclass(frozen=True)
+class LanguagePreferences:
+    preferred_audio_language: str
+    audio_language_chain: Tuple[str, ...]
+    audio_text_fallback_active: bool
+
+
+def get_language_preferences(request):
+    """
+    The viewer's audio language preferences, resolved once per request.
+
+    The preferred audio language is the first valid one of: the preferred
+    audio cookie, the UI language cookie, the request language and
+    LANGUAGE_CODE.
+    """
+    preferences = getattr(request, 'language_preferences', None)
+    if preferences is not None:
+        return preferences
+
+    config = get_site_config()
+    request_language = getattr(request, 'LANGUAGE_CODE', config.language_code)
+    candidates = (
+        request.COOKIES.get(config.preferred_audio_cookie),
+        request.COOKIES.get(config.language_cookie),
+        request_language,
+    )
+    preferred_audio = next((code for code in candidates if code in config.language_codes), config.language_code)
+
+    preferences = LanguagePreferences(
+        preferred_audio_language=preferred_audio,
+        audio_language_chain=config.language_chain(preferred_audio),
+        audio_text_fallback_active=(
+            preferred_audio not in config.supported_ui_languages and
+            request_language == config.fallback_text_language
+        ),
+    )
+    request.language_preferences = preferences
+    return preferences
@@ -1,38 +1,35 @@
 """
 Custom context processors for marketplace project.
 """
-import json
-from django.conf import settings
+from audio.mixins import get_static_ui_version
+from .config import get_language_preferences, get_site_config
 
 
 def language_preferences(request):
     """
     Provide audio language preference information to all templates.
     """
-    available_language_codes = {code for code, _ in settings.LANGUAGES}
-    preferred_audio = request.COOKIES.get(settings.PREFERRED_AUDIO_LANGUAGE_COOKIE_NAME)
+    config = get_site_config()
+    preferences = get_language_preferences(request)
 
-    if preferred_audio not in available_language_codes:
-        preferred_audio = request.COOKIES.get(settings.LANGUAGE_COOKIE_NAME)
-
-    request_language = getattr(request, 'LANGUAGE_CODE', settings.LANGUAGE_CODE)
-    if preferred_audio not in available_language_codes:
-        preferred_audio = request_language if request_language in available_language_codes else settings.LANGUAGE_CODE
+    return {
+        'preferred_audio_language': preferences.preferred_audio_language,
+        'audio_language_chain': preferences.audio_language_chain,
+        'audio_text_fallback_active': preferences.audio_text_fallback_active,
+        'fallback_text_language': config.fallback_text_language,
+        'audio_config': config.audio_config,
+    }
 
-    supported_ui = set(getattr(settings, 'SUPPORTED_UI_LANGUAGES', (settings.LANGUAGE_CODE,)))
-    fallback_language = getattr(settings, 'FALLBACK_TEXT_LANGUAGE', settings.LANGUAGE_CODE)
-    audio_text_fallback_active = preferred_audio not in supported_ui and request_language == fallback_language
 
+def fragment_cache(request):
+    """
+    Values the ``{% cache %}`` blocks for shared chrome vary on, besides the
+    UI language (LANGUAGE_CODE) and preferred audio language.
+    """
+    user = getattr(request, 'user', None)
     return {
-        'preferred_audio_language': preferred_audio,
-        'audio_text_fallback_active': audio_text_fallback_active,
-        'fallback_text_language': fallback_language,
-        'audio_config': {
-            'icon_inactive': (settings.MEDIA_URL.rstrip('/') + '/' + getattr(settings, 'AUDIO_ICON_INACTIVE', 'listen-inactive.png')).replace('//', '/'),
-            'icon_active': (settings.MEDIA_URL.rstrip('/') + '/' + getattr(settings, 'AUDIO_ICON_ACTIVE', 'listen-active.png')).replace('//', '/'),
-            'fallback_audio': json.dumps(getattr(settings, 'AUDIO_FALLBACK_BY_LANGUAGE', {})),
-            'fallback_file': getattr(settings, 'AUDIO_FALLBACK_FILE', 'audio/fallback.mp3'),
-            'media_url': settings.MEDIA_URL,
-            'static_url': settings.STATIC_URL,
-        },
+        'fragment_cache_timeout': get_site_config().fragment_cache_timeout,
+        'static_ui_version': get_static_ui_version(),
+        # The navigation differs by role, not by user
+        'nav_auth_state': user.role if user is not None and user.is_authenticated else 'anonymous',
     }
@@ -0,0 +1,79 @@
+"""
+Database helpers shared by settings-driven setup and management commands.
+
+SQLite keeps most tuning per connection, so the pragmas in
+``settings.SQLITE_PRAGMAS`` (the production profile: WAL, synchronous=NORMAL,
+mmap, cache size and busy timeout) are applied whenever Django opens one.
+BEGIN IMMEDIATE comes from the database's ``transaction_mode`` option
+(Django 5.1+).
+
+``scratch_database()`` lets benchmarks and the migration check run against a
+throwaway database of the configured backend (SQLite or PostgreSQL).
+"""
+import tempfile
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.test.utils import override_settings
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@contextmanager
+def scratch_database(options=None, pragmas=None):
+    """
+    Point the default connection at a new, empty database for the duration.
+
+    SQLite gets a file in a temporary directory, with ``options`` and
+    ``pragmas`` replacing the configured SQLite profile when given.
+    PostgreSQL gets ``<NAME>_scratch``, created here and dropped afterwards.
+    Nothing is migrated; callers run the migrations they need.
+    """
+    connection = connections['default']
+    if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+        raise ImproperlyConfigured('A scratch database cannot replace an in-memory SQLite database.')
+
+    settings_dict = connection.settings_dict
+    original = settings_dict['NAME'], settings_dict.get('OPTIONS', {})
+    connections.close_all()
+    with ExitStack() as stack:
+        if connection.vendor == 'sqlite':
+            directory = stack.enter_context(tempfile.TemporaryDirectory())
+            settings_dict['NAME'] = str(Path(directory) / 'scratch.sqlite3')
+            if options is not None:
+                settings_dict['OPTIONS'] = options
+            if pragmas is not None:
+                stack.enter_context(override_settings(SQLITE_PRAGMAS=pragmas))
+        else:
+            name = f'{original[0]}_scratch'
+            _recreate_database(connection, name, create=True)
+            stack.callback(_recreate_database, connection, name, create=False)
+            settings_dict['NAME'] = name
+        try:
+            yield connection
+        finally:
+            connections.close_all()
+            settings_dict['NAME'], settings_dict['OPTIONS'] = original
+
+
+def _recreate_database(connection, name, create):
+    # CREATE/DROP DATABASE cannot run inside the target database
+    with connection._nodb_cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS {connection.ops.quote_name(name)}')
+        if create:
+            cursor.execute(f'CREATE DATABASE {connection.ops.quote_name(name)}')
@@ -0,0 +1,341 @@
+"""
+Prometheus metrics for the Django app, served at ``/metrics``.
+
+Counters and histograms are kept in a per-process registry and rendered in
+the Prometheus text exposition format (no client library needed).
+
+Gunicorn runs several worker processes, each with its own registry. With
+METRICS_MULTIPROC_DIR set, every worker writes a snapshot of its registry to
+``<dir>/<pid>-<uuid>.json`` (at most every METRICS_FLUSH_SECONDS, after a request,
+and at exit) and the worker answering a scrape sums all snapshots. Snapshots
+of exited workers are kept so counters never go backwards (the random part
+of the name keeps a new worker that reuses a PID from overwriting one); empty
+the directory before gunicorn starts.
+
+Queue depths are read from the database at scrape time and the audio cache
+hit ratio is derived from the summed lookup counters.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+KNOWN_METHODS = frozenset(['GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'])
+
+
+class Registry:
+    """The metrics of this process, plus collectors that report process state."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector):
+        """``collector()`` returns snapshot entries (see ``family``) for this process."""
+        self.collectors.append(collector)
+        return collector
+
+    def snapshot(self):
+        data = {name: metric.snapshot() for name, metric in self.metrics.items()}
+        for collector in self.collectors:
+            data.update(collector())
+        return data
+
+
+REGISTRY = Registry()
+
+
+def family(metric_type, documentation, labelnames, values, **extra):
+    """
+    One metric family in snapshot form.
+
+    Args:
+        values: Dict of label values (a tuple, ordered like ``labelnames``)
+            to the sample value; for histograms a list of per-bucket counts
+            (the last bucket is +Inf) followed by the sum of observations.
+    """
+    return {
+        'type': metric_type,
+        'help': documentation,
+        'labels': list(labelnames),
+        'values': {json.dumps([str(v) for v in key]): value for key, value in values.items()},
+        **extra,
+    }
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self):
+        with self._lock:
+            values = {key: list(value) if isinstance(value, list) else value for key, value in self._values.items()}
+        return family(self.type, self.documentation, self.labelnames, values)
+
+
+class Counter(Metric):
+    """Monotonic total; name it ``..._total``."""
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+
+    def snapshot(self):
+        return {**super().snapshot(), 'buckets': list(self.buckets)}
+
+
+def merge(snapshots):
+    """Sum snapshots of several processes, sample by sample."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, 'values': {}})
+            for key, value in metric['values'].items():
+                current = target['values'].get(key)
+                if current is None:
+                    target['values'][key] = value
+                elif isinstance(value, list):
+                    target['values'][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target['values'][key] = current + value
+    return merged
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _sample(name, labels, value):
+    if not labels:
+        return f'{name} {_format_value(value)}'
+    pairs = ','.join(
+        '{}="{}"'.format(label, str(v).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"'))
+        for label, v in labels
+    )
+    return f'{name}{{{pairs}}} {_format_value(value)}'
+
+
+def render(snapshot):
+    """Prometheus text exposition of a (merged) snapshot."""
+    lines = []
+    for name, metric in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for key, value in sorted(metric['values'].items()):
+            labels = list(zip(metric['labels'], json.loads(key)))
+            if metric['type'] != 'histogram':
+                lines.append(_sample(name, labels, value))
+                continue
+            cumulative = 0
+            for bound, count in zip([*metric['buckets'], float('inf')], value[:-1]):
+                cumulative += count
+                lines.append(_sample(f'{name}_bucket', labels + [('le', _format_value(float(bound)))], cumulative))
+            lines.append(_sample(f'{name}_sum', labels, value[-1]))
+            lines.append(_sample(f'{name}_count', labels, cumulative))
+    return '\n'.join(lines) + '\n'
+
+
+_flush_lock = threading.Lock()
+_last_flush = 0.0
+_snapshot_name = None  # (pid, file name), renewed in forked workers
+
+
+def _snapshot_filename():
+    global _snapshot_name
+    pid = os.getpid()
+    if _snapshot_name is None or _snapshot_name[0] != pid:
+        _snapshot_name = (pid, f'{pid}-{uuid.uuid4().hex}.json')
+    return _snapshot_name[1]
+
+
+def flush(force=False):
+    """Write this process's snapshot to METRICS_MULTIPROC_DIR (rate limited unless ``force``)."""
+    global _last_flush
+    directory = settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+    if not force and time.monotonic() - _last_flush < settings.METRICS_FLUSH_SECONDS:
+        return
+    if not _flush_lock.acquire(blocking=force):
+        return
+    try:
+        _last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, _snapshot_filename())
+        with open(f'{path}.tmp', 'w') as fh:
+            json.dump(REGISTRY.snapshot(), fh)
+        # Readers only ever see complete snapshots
+        os.replace(f'{path}.tmp', path)
+    finally:
+        _flush_lock.release()
+
+
+atexit.register(lambda: flush(force=True))
+
+
+def collect():
+    """Snapshot of all workers when METRICS_MULTIPROC_DIR is set, else of this process."""
+    directory = settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return REGISTRY.snapshot()
+    flush(force=True)
+    snapshots = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith('.json'):
+            continue
+        try:
+            with open(entry.path) as fh:
+                snapshots.append(json.load(fh))
+        except (OSError, ValueError):
+            continue
+    return merge(snapshots)
+
+
+def scrape_time_metrics(snapshot):
+    """Queue depths from the database and the audio cache hit ratio of ``snapshot``."""
+    from audio.models import AudioRequest
+    from jobs.models import PendingPaymentTransaction
+
+    depths = {
+        ('audio_requests',): AudioRequest.objects.filter(status__in=['open', 'in_progress']).count(),
+        ('pending_payments',): PendingPaymentTransaction.objects.filter(job__contract_completed=False).count(),
+    }
+    lookups = {
+        json.loads(key)[0]: value
+        for key, value in snapshot.get('marketplace_audio_cache_lookups_total', {}).get('values', {}).items()
+    }
+    total = sum(lookups.values())
+    hits = lookups.get('l1_hit', 0) + lookups.get('l2_hit', 0)
+    return {
+        'marketplace_queue_depth': family(
+            'gauge', 'Work items waiting: open audio requests and unsettled payments', ['queue'], depths,
+        ),
+        'marketplace_audio_cache_hit_ratio': family(
+            'gauge', 'Share of audio cache lookups answered by L1 or L2, all workers', [],
+            {(): round(hits / total, 4) if total else 0.0},
+        ),
+    }
+
+
+@REGISTRY.add_collector
+def _audio_cache_lookups():
+    from audio.cache import audio_cache
+
+    stats = audio_cache.stats()
+    return {
+        'marketplace_audio_cache_lookups_total': family(
+            'counter', 'Audio cache lookups by result', ['result'],
+            {('l1_hit',): stats['l1_hits'], ('l2_hit',): stats['l2_hits'], ('miss',): stats['misses']},
+        ),
+    }
+
+
+def view_label(request):
+    """URL name of the request; never the raw path, which would explode cardinality."""
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unmatched'
+
+
+class MetricsMiddleware:
+    """
+    Time every request and count its SQL queries, by URL name.
+
+    Goes before QueryStatsMiddleware in MIDDLEWARE so it can read
+    ``request.query_stats`` on the way out.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        response = self.get_response(request)
+        view = view_label(request)
+        method = request.method if request.method in KNOWN_METHODS else 'other'
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started, view=view, method=method, status=response.status_code,
+        )
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            DB_QUERIES.inc(stats.count, view=view)
+            DB_TIME.inc(stats.duration, view=view)
+        flush()
+        return response
+
+
+REQUEST_LATENCY = Histogram(
+    'marketplace_http_request_duration_seconds',
+    'Time to produce a response, by URL name',
+    ['view', 'method', 'status'],
+)
+DB_QUERIES = Counter(
+    'marketplace_db_queries_total',
+    'SQL queries run while serving requests, by URL name',
+    ['view'],
+)
+DB_TIME = Counter(
+    'marketplace_db_query_seconds_total',
+    'Time spent in SQL queries while serving requests, by URL name',
+    ['view'],
+)
+OPEN_PAYMENTS_LATENCY = Histogram(
+    'marketplace_open_payments_request_duration_seconds',
+    'Open Payments SDK HTTP calls, by endpoint',
+    ['endpoint', 'method', 'status'],
+)
+PAYMENTS_SERVICE_LATENCY = Histogram(
+    'marketplace_payments_service_request_duration_seconds',
+    'Payments service calls, by endpoint',
+    ['endpoint', 'outcome'],
+)
+WEBHOOK_LAG = Histogram(
+    'marketplace_webhook_lag_seconds',
+    'Delay between a payment event and receipt of its webhook',
+    ['event'],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
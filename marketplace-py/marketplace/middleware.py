@@ -0,0 +1,40 @@
+"""
+Custom middleware for marketplace project.
+"""
+from .config import get_language_preferences
+from .replicas import get_replicas, pin_to_primary
+
+
+class LanguagePreferencesMiddleware:
+    """
+    Resolve the viewer's audio language and fallback chain once per request.
+
+    Sets ``request.language_preferences`` (see ``marketplace.config``) so the
+    context processor, audio template tags and the audio API share one
+    resolution. Must come after LocaleMiddleware, which sets
+    ``request.LANGUAGE_CODE``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        get_language_preferences(request)
+        return self.get_response(request)
+
+
+class ReplicaPinMiddleware:
+    """
+    After an unsafe request (POST, PUT, ...), keep the viewer's reads on the
+    primary database for a short while so replica lag cannot hide their
+    own changes. Does nothing when no read replica is configured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if get_replicas() and request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            pin_to_primary(response)
+        return response
@@ -0,0 +1,176 @@
+"""
+On-demand sampling profiler for requests of trusted users.
+
+With PROFILING_ENABLED on, a user holding the ``jobs.add_requestprofile``
+permission (granted directly or through a group) can profile one request by
+sending an ``X-Profile`` header or adding ``?_profile=1`` to the URL. While the view
+runs, a background thread samples the request thread's call stack every
+PROFILING_INTERVAL_MS. The samples are saved as a ``jobs.RequestProfile`` in
+the collapsed ("folded") format that flamegraph.pl, speedscope and inferno
+read. The response's ``X-Profile-Url`` header links to it in the admin, where
+recent profiles can be browsed and downloaded.
+
+With PROFILING_ENABLED off, the middleware removes itself at startup
+(``MiddlewareNotUsed``), so requests do not pay for it at all.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import reverse
+
+from .metrics import view_label
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_PARAM = '_profile'
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename):
+    """``filename`` relative to the project, or else to the sys.path entry it was imported from."""
+    for prefix in _path_prefixes():
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+@lru_cache(maxsize=1)
+def _path_prefixes():
+    others = sorted((os.path.join(path, '') for path in sys.path if path), key=len, reverse=True)
+    return [os.path.join(str(settings.BASE_DIR), '')] + others
+
+
+def _frame_label(code):
+    # ';' separates frames in the folded format
+    return f'{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class StackSampler:
+    """
+    Sample another thread's call stack at a fixed interval.
+
+    Only frames below ``root`` (a frame of the sampled thread, included) are
+    kept, so the server and middleware above the profiled code do not show up
+    in every stack.
+    """
+
+    def __init__(self, thread_id, root, interval):
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                if frame is self.root:
+                    break
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        """The samples as ``frame;frame;frame count`` lines, most frequent first."""
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common())
+
+
+PROFILE_PERMISSION = ('jobs', 'add_requestprofile')
+
+
+def can_profile(user):
+    """
+    True if ``user`` was granted PROFILE_PERMISSION, directly or by a group.
+
+    ``is_superuser`` is deliberately not enough: ``User.save`` currently
+    promotes every new account to staff and superuser.
+    """
+    from django.contrib.auth.models import Permission
+    from django.db.models import Q
+
+    if not user.is_authenticated or not user.is_active:
+        return False
+    app_label, codename = PROFILE_PERMISSION
+    return Permission.objects.filter(
+        Q(user=user) | Q(group__user=user), content_type__app_label=app_label, codename=codename,
+    ).exists()
+
+
+def profile_requested(request):
+    """True if a user allowed to profile asked for this request to be profiled."""
+    if PROFILE_HEADER not in request.headers and PROFILE_PARAM not in request.GET:
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user and can_profile(user))
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests flagged by allowed users (see module docstring). Goes
+    after AuthenticationMiddleware, which it needs for ``request.user``.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profile_requested(request):
+            return self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), sys._getframe(), settings.PROFILING_INTERVAL_MS / 1000)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+        duration = time.perf_counter() - started
+
+        profile = self.save(request, response, sampler, duration)
+        response['X-Profile-Url'] = reverse('admin:jobs_requestprofile_change', args=[profile.pk])
+        logger.info(f"[profile] {request.method} {request.path}: {duration * 1000:.0f} ms, {sampler.samples} samples")
+        return response
+
+    def save(self, request, response, sampler, duration):
+        from jobs.models import RequestProfile
+
+        profile = RequestProfile.objects.create(
+            method=request.method,
+            path=request.get_full_path()[:500],
+            view=view_label(request)[:100],
+            user=request.user,
+            status_code=response.status_code,
+            duration_ms=duration * 1000,
+            samples=sampler.samples,
+            interval_ms=settings.PROFILING_INTERVAL_MS,
+            stacks=sampler.folded(),
+        )
+        # Keep only the newest PROFILING_KEEP profiles
+        stale = RequestProfile.objects.values_list('pk', flat=True)[settings.PROFILING_KEEP:]
+        RequestProfile.objects.filter(pk__in=list(stale)).delete()
+        return profile
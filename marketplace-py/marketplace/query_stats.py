@@ -0,0 +1,128 @@
+"""
+Per-request SQL statistics: query count, database time and repeated queries.
+
+``collect_queries()`` installs an execute wrapper on every database
+connection for the duration of a block and records each statement in a
+``QueryStats``. Statements are grouped by signature (the SQL with its
+parameters still as placeholders and ``IN (...)`` lists collapsed), so a
+signature that runs many times in one request points at an N+1 loop.
+
+``QueryStatsMiddleware`` does this for every request, logs requests over the
+SQL_STATS_* thresholds and, when SQL_STATS_HEADERS is on (DEBUG by default),
+reports the numbers in ``X-DB-*`` response headers.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def query_signature(sql):
+    """The statement with runs of whitespace and ``IN`` parameter lists collapsed."""
+    return IN_LIST_RE.sub('IN (...)', WHITESPACE_RE.sub(' ', sql).strip())
+
+
+class QueryStats:
+    """Queries recorded for one request (or one ``collect_queries`` block)."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.signatures = Counter()
+
+    def record(self, sql, duration):
+        self.count += 1
+        self.duration += duration
+        self.signatures[query_signature(sql)] += 1
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+    @property
+    def duplicates(self):
+        """Signature -> count for every statement that ran more than once."""
+        return {signature: count for signature, count in self.signatures.most_common() if count > 1}
+
+    @property
+    def duplicate_count(self):
+        """Executions beyond the first of each signature."""
+        return sum(count - 1 for count in self.signatures.values())
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, time.perf_counter() - started)
+
+
+@contextmanager
+def collect_queries():
+    """Record every query run on any database connection inside the block."""
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else request.path
+
+
+class QueryStatsMiddleware:
+    """
+    Record query count, database time and repeated queries for each request.
+
+    Logs a warning when a request runs more than SQL_STATS_MAX_QUERIES
+    queries, spends more than SQL_STATS_MAX_DB_MS in the database or repeats
+    one statement more than SQL_STATS_MAX_REPEATS times. Sets
+    ``request.query_stats``. Should come before the session and
+    authentication middleware so their queries are counted too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SQL_STATS_ENABLED:
+            return self.get_response(request)
+
+        with collect_queries() as stats:
+            request.query_stats = stats
+            response = self.get_response(request)
+
+        self.report(request, stats)
+        if settings.SQL_STATS_HEADERS:
+            response['X-DB-Query-Count'] = str(stats.count)
+            response['X-DB-Time-Ms'] = f'{stats.duration_ms:.1f}'
+            response['X-DB-Duplicate-Queries'] = str(stats.duplicate_count)
+        return response
+
+    def report(self, request, stats):
+        duplicates = stats.duplicates
+        worst_signature, worst_count = next(iter(duplicates.items()), ('', 0))
+        if (
+            stats.count <= settings.SQL_STATS_MAX_QUERIES
+            and stats.duration_ms <= settings.SQL_STATS_MAX_DB_MS
+            and worst_count <= settings.SQL_STATS_MAX_REPEATS
+        ):
+            return
+        message = (
+            f"[sql] {request.method} {_view_name(request)}: {stats.count} queries, "
+            f"{stats.duration_ms:.1f} ms, {stats.duplicate_count} duplicates"
+        )
+        if worst_count > settings.SQL_STATS_MAX_REPEATS:
+            message += f"; possible N+1 ({worst_count}x): {worst_signature[:300]}"
+        logger.warning(message)
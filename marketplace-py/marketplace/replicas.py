@@ -0,0 +1,98 @@
+"""
+Read replicas for read-heavy views.
+
+Views decorated with ``read_from_replica`` send their reads to one of
+``settings.DATABASE_REPLICAS``; everything else, and every write, uses the
+primary (``default``). A viewer who just wrote stays on the primary for
+REPLICA_PIN_SECONDS so they see their own changes despite replication lag:
+``ReplicaPinMiddleware`` sets a short-lived cookie after unsafe requests,
+and a decorated view that writes (e.g. a due status transition) switches
+itself to the primary and sets the same cookie.
+
+With no replica configured the router always answers the primary, so the
+decorator costs nothing.
+"""
+import random
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+# Sessions change on every login and must never be read stale
+PRIMARY_ONLY_APPS = {'sessions'}
+
+_replica_reads = ContextVar('replica_reads', default=None)
+
+
+class _ReplicaReads:
+    def __init__(self, alias):
+        self.alias = alias
+        self.wrote = False
+
+
+def get_replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def is_pinned(request):
+    return bool(request.COOKIES.get(settings.REPLICA_PIN_COOKIE))
+
+
+def pin_to_primary(response):
+    """Keep this viewer's reads on the primary for REPLICA_PIN_SECONDS."""
+    response.set_cookie(
+        settings.REPLICA_PIN_COOKIE, '1',
+        max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+    )
+
+
+class ReplicaRouter:
+    """Route reads inside ``read_from_replica`` views to a replica; all else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        state = _replica_reads.get()
+        if state is None or state.wrote or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        # Reads inside a transaction on the primary must see its writes
+        if connections['default'].in_atomic_block:
+            return None
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _replica_reads.get()
+        if state is not None:
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replicas()
+
+
+def read_from_replica(view):
+    """
+    Serve a view's reads from a replica for safe requests.
+
+    Falls back to the primary when no replica is configured, for unsafe
+    methods and while the viewer is pinned after a recent write.
+    """
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        replicas = get_replicas()
+        if not replicas or request.method not in ('GET', 'HEAD') or is_pinned(request):
+            return view(request, *args, **kwargs)
+
+        state = _ReplicaReads(random.choice(replicas))
+        token = _replica_reads.set(state)
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+        if state.wrote:
+            pin_to_primary(response)
+        return response
+    return wrapped
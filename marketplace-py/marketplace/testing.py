@@ -0,0 +1,42 @@
+"""
+Test helpers shared by the apps' test suites.
+"""
+from contextlib import contextmanager
+
+from .query_stats import collect_queries
+
+
+class QueryBudgetMixin:
+    """
+    ``assertQueryBudget`` for TestCase classes: a ceiling on the queries a
+    block (typically one ``self.client.get``) may run, instead of the exact
+    count ``assertNumQueries`` pins down.
+
+    Usage:
+        class JobListBudgetTest(QueryBudgetMixin, TestCase):
+            def test_list(self):
+                with self.assertQueryBudget(12):
+                    self.client.get(reverse('jobs:list'))
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries, max_repeats=1):
+        """
+        Args:
+            max_queries: Most queries the block may run.
+            max_repeats: Most times any one statement may run (1 forbids
+                repeating a query, which is how N+1 loops show up).
+        """
+        with collect_queries() as stats:
+            yield stats
+
+        details = '\n'.join(f'  {count}x {signature}' for signature, count in stats.signatures.most_common())
+        self.assertLessEqual(
+            stats.count, max_queries,
+            f'{stats.count} queries run, budget is {max_queries}:\n{details}',
+        )
+        repeated = {signature: count for signature, count in stats.duplicates.items() if count > max_repeats}
+        self.assertFalse(
+            repeated,
+            f'Queries repeated more than {max_repeats}x (N+1?):\n{details}',
+        )
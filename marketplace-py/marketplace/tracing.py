@@ -0,0 +1,341 @@
+"""
+OpenTelemetry-style tracing: spans for requests, ORM queries, Open Payments
+SDK calls and anything wrapped in ``start_span`` / ``traced``.
+
+Spans follow the OpenTelemetry data model and are exported as OTLP/JSON, one
+batch per request (or other local root span), by TRACING_EXPORTER:
+
+- '' (default): tracing is off and ``start_span`` yields a no-op span.
+- 'file': append each batch as a line to TRACING_FILE, a stand-in for a
+  collector; ``manage.py show_traces`` prints them as trees.
+- 'otlp': POST batches to an OTLP/HTTP collector (TRACING_OTLP_ENDPOINT)
+  from a background thread.
+
+Trace context travels in the W3C ``traceparent`` header: incoming requests
+continue the caller's trace and calls to the payments service carry ours, so
+webhooks it sends back can continue it. A contract's trace is also
+remembered (``remember_trace``) so the wallet callback and the payment
+webhook can link to it (``link_trace``) even when the header is not echoed.
+"""
+import json
+import logging
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from open_payments_sdk import instrumentation
+
+from .metrics import view_label
+from .query_stats import query_signature
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+SPAN_KINDS = {
+    'internal': 'SPAN_KIND_INTERNAL',
+    'server': 'SPAN_KIND_SERVER',
+    'client': 'SPAN_KIND_CLIENT',
+}
+
+_current_span = ContextVar('current_span', default=None)
+
+
+def parse_traceparent(value):
+    """(trace_id, span_id) from a ``traceparent`` header value, or None."""
+    match = TRACEPARENT_RE.match(value or '')
+    if not match or match.group(1) == '0' * 32 or match.group(2) == '0' * 16:
+        return None
+    return match.group(1), match.group(2)
+
+
+def _attribute(key, value):
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class Span:
+    def __init__(self, name, trace_id, parent_id, batch, kind='internal', attributes=None, start=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.links = []
+        self.error = None
+        self.start = start or time.time_ns()
+        self.end = None
+        # Finished spans of this trace in this process, exported with the local root
+        self.batch = batch
+
+    @property
+    def traceparent(self):
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def add_link(self, traceparent):
+        parsed = parse_traceparent(traceparent)
+        if parsed and parsed[0] != self.trace_id:
+            self.links.append(parsed)
+
+    def record_exception(self, exc):
+        self.error = f'{type(exc).__name__}: {exc}'
+
+    def finish(self, end=None):
+        self.end = end or time.time_ns()
+        self.batch.append(self)
+
+    def to_otlp(self):
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': SPAN_KINDS[self.kind],
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end),
+            'attributes': [_attribute(key, value) for key, value in self.attributes.items()],
+            'links': [{'traceId': trace_id, 'spanId': span_id} for trace_id, span_id in self.links],
+            'status': {'code': 'STATUS_CODE_ERROR', 'message': self.error} if self.error else {},
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    trace_id = span_id = traceparent = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def add_link(self, traceparent):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def tracing_enabled():
+    return bool(settings.TRACING_EXPORTER)
+
+
+@contextmanager
+def start_span(name, kind='internal', remote_parent=None, **attributes):
+    """
+    Run a block inside a span, a child of the current span if there is one.
+
+    Args:
+        name: Span name, e.g. ``'open_payments.sign_request'``.
+        kind: 'internal', 'server' or 'client'.
+        remote_parent: ``traceparent`` header value to continue when there is
+            no current span (incoming requests).
+        **attributes: Span attributes (OpenTelemetry names such as
+            ``http.method`` have to be passed with ``**{...}``).
+    """
+    if not tracing_enabled():
+        yield NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    if parent is not None:
+        span = Span(name, parent.trace_id, parent.span_id, parent.batch, kind, attributes)
+    else:
+        trace_id, parent_id = parse_traceparent(remote_parent) or (secrets.token_hex(16), None)
+        span = Span(name, trace_id, parent_id, [], kind, attributes)
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.finish()
+        if parent is None:
+            export(span.batch)
+
+
+def traced(name=None, **attributes):
+    """Decorator form of ``start_span``; the span is named after the function by default."""
+    def decorator(func):
+        span_name = name or f'{func.__module__}.{func.__qualname__}'
+
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            with start_span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapped
+    return decorator
+
+
+def current_span():
+    return _current_span.get() or NOOP_SPAN
+
+
+def inject(headers):
+    """Add the current ``traceparent`` to an outgoing request's headers."""
+    span = _current_span.get()
+    if span is not None:
+        headers['traceparent'] = span.traceparent
+    return headers
+
+
+def remember_trace(key):
+    """Store the current trace under ``key`` so later requests can link to it."""
+    span = _current_span.get()
+    if span is not None:
+        cache.set(f'trace:{key}', span.traceparent, settings.TRACING_LINK_TTL)
+
+
+def link_trace(key):
+    """Link the current span to the trace remembered under ``key``, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.add_link(cache.get(f'trace:{key}'))
+
+
+class QueryBatchSpans:
+    """
+    Execute wrapper recording ORM queries as ``db.query`` spans.
+
+    Consecutive runs of the same statement under the same parent share one
+    span (``db.query_count`` says how many), so an N+1 loop shows up as one
+    long span instead of hundreds of tiny ones.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        parent = _current_span.get()
+        started = time.time_ns()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if parent is not None:
+                self.record(parent, context['connection'], sql, started, time.time_ns())
+
+    def record(self, parent, connection, sql, started, ended):
+        signature = query_signature(sql)
+        last = parent.batch[-1] if parent.batch else None
+        if (
+            last is not None and last.name == 'db.query' and last.parent_id == parent.span_id
+            and last.attributes['db.statement'] == signature
+        ):
+            last.end = ended
+            last.attributes['db.query_count'] += 1
+            return
+        span = Span('db.query', parent.trace_id, parent.span_id, parent.batch, 'client', {
+            'db.system': connection.vendor,
+            'db.name': connection.alias,
+            'db.statement': signature,
+            'db.query_count': 1,
+        }, start=started)
+        span.finish(ended)
+
+
+QUERY_BATCH_SPANS = QueryBatchSpans()
+
+
+class TracingMiddleware:
+    """
+    Wrap each request in a server span named after its URL, continuing the
+    caller's ``traceparent``, with its ORM queries as child spans. Adds an
+    ``X-Trace-Id`` response header. Should come first in MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not tracing_enabled():
+            return self.get_response(request)
+
+        with start_span(
+            f'HTTP {request.method}', kind='server', remote_parent=request.headers.get('traceparent'),
+            **{'http.method': request.method, 'http.target': request.path},
+        ) as span:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(QUERY_BATCH_SPANS))
+                response = self.get_response(request)
+
+            route = view_label(request)
+            span.name = f'{request.method} {route}'
+            span.set_attribute('http.route', route)
+            span.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                span.error = f'HTTP {response.status_code}'
+            response['X-Trace-Id'] = span.trace_id
+        return response
+
+
+def otlp_payload(spans):
+    """OTLP/JSON ``ExportTraceServiceRequest`` for a batch of finished spans."""
+    return {'resourceSpans': [{
+        'resource': {'attributes': [_attribute('service.name', settings.TRACING_SERVICE_NAME)]},
+        'scopeSpans': [{
+            'scope': {'name': 'marketplace.tracing'},
+            'spans': [span.to_otlp() for span in spans],
+        }],
+    }]}
+
+
+_file_lock = threading.Lock()
+_otlp_queue = queue.Queue(maxsize=1000)
+_otlp_worker = None
+_otlp_worker_lock = threading.Lock()
+
+
+def _post_batches():
+    session = requests.Session()
+    while True:
+        payload = _otlp_queue.get()
+        try:
+            session.post(settings.TRACING_OTLP_ENDPOINT, json=payload, timeout=5)
+        except requests.RequestException as e:
+            logger.warning(f"[tracing] Could not export spans: {e}")
+
+
+def export(spans):
+    """Hand a finished batch to TRACING_EXPORTER; never raises into the request."""
+    exporter = settings.TRACING_EXPORTER
+    payload = otlp_payload(spans)
+    if exporter == 'file':
+        try:
+            with _file_lock, open(settings.TRACING_FILE, 'a') as fh:
+                fh.write(json.dumps(payload) + '\n')
+        except OSError as e:
+            logger.warning(f"[tracing] Could not write {settings.TRACING_FILE}: {e}")
+    elif exporter == 'otlp':
+        global _otlp_worker
+        with _otlp_worker_lock:
+            if _otlp_worker is None:
+                _otlp_worker = threading.Thread(target=_post_batches, name='otlp-exporter', daemon=True)
+                _otlp_worker.start()
+        try:
+            _otlp_queue.put_nowait(payload)
+        except queue.Full:
+            logger.warning("[tracing] Export queue full; dropping spans")
+
+
+# The Open Payments SDK reports signing, HTTP calls and validation through this
+instrumentation.set_span_factory(start_span)
@@ -18,6 +18,8 @@ urlpatterns = [
     path('api/audio/', include(('audio.urls', 'audio'), namespace='audio')),
     # Payment webhook endpoint (must be outside i18n_patterns)
     path('api/webhooks/payments', payment_webhook, name='payment_webhook'),
+    # Prometheus scrape endpoint (outside i18n_patterns: no language prefix)
+    path('metrics', views.metrics, name='metrics'),
 ]
 
 # Add language prefix to URLs
@@ -1,11 +1,18 @@
 """
 Custom views for marketplace.
 """
+import hmac
+import ipaddress
 from urllib.parse import urlparse, urlunparse
 
 from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import redirect
 from django.utils import translation
+from django.views.decorators.http import require_GET
+
+from . import metrics as app_metrics
+from .config import get_site_config
 
 
 def set_language_custom(request):
@@ -16,12 +23,13 @@ def set_language_custom(request):
         language = request.POST.get('language')
         next_url = request.POST.get('next', '/')
 
-        languages = dict(settings.LANGUAGES)
-        if language and language in languages:
+        config = get_site_config()
+        if language and language in config.language_codes:
             preferred_audio_language = language
-            supported_ui = set(getattr(settings, 'SUPPORTED_UI_LANGUAGES', (settings.LANGUAGE_CODE,)))
-            fallback_language = getattr(settings, 'FALLBACK_TEXT_LANGUAGE', settings.LANGUAGE_CODE)
-            text_language = preferred_audio_language if preferred_audio_language in supported_ui else fallback_language
+            text_language = (
+                preferred_audio_language if preferred_audio_language in config.supported_ui_languages
+                else config.fallback_text_language
+            )
 
             # Parse next_url into components
             parsed = urlparse(next_url)
@@ -82,3 +90,37 @@ def set_language_custom(request):
             return response
 
     return redirect('/')
+
+
+@require_GET
+def _metrics_client_allowed(request):
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    for allowed in settings.METRICS_ALLOWED_IPS:
+        try:
+            if address in ipaddress.ip_network(allowed, strict=False):
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint (all gunicorn workers, see ``marketplace.metrics``).
+
+    When METRICS_TOKEN is set the scraper must send it as a bearer token.
+    Without one, only METRICS_ALLOWED_IPS may scrape unless DEBUG is on.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG and not _metrics_client_allowed(request):
+        return HttpResponseForbidden()
+
+    snapshot = app_metrics.collect()
+    snapshot.update(app_metrics.scrape_time_metrics(snapshot))
+    return HttpResponse(app_metrics.render(snapshot), content_type=app_metrics.CONTENT_TYPE)
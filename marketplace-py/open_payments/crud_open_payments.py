@@ -33,7 +33,9 @@ from open_payments_sdk.models.resource import (
     QuoteRequest,
 )
 
+from marketplace.tracing import traced
 from utilities.openpayments import paymentsparser
+from .http import MeteredHttpClient
 from schemas.openpayments.open_payments import SellerOpenPaymentAccount, PendingIncomingPaymentTransaction
 
 
@@ -66,7 +68,7 @@ class OpenPaymentsProcessor:
         redirect_uri: str = None,
     ) -> None:
         if not http_client:
-            http_client = HttpClient(http_timeout=10.0)
+            http_client = MeteredHttpClient(http_timeout=10.0)
         self.http_client = http_client
         self.seller = seller
         self.buyer = paymentsparser.normalise_wallet_address(wallet_address=buyer)
@@ -118,6 +120,7 @@ class OpenPaymentsProcessor:
     # 1. GRANT-MAKING GENERAL UTILITY
     ###################################################################################################
 
+    @traced('open_payments.request_grant')
     def request_grant(self, *, grant: str, actions: list[str], endpoint: AnyUrl) -> Grant:
         request = GrantRequest(
             **{
@@ -138,6 +141,7 @@ class OpenPaymentsProcessor:
     # 2. SELLER INCOMING PAYMENT PROCESS
     ###################################################################################################
 
+    @traced('open_payments.request_incoming_payment')
     def request_incoming_payment(self, *, amount: int | str):
         """TO THE SELLER"""
         if isinstance(amount, int):
@@ -169,6 +173,7 @@ class OpenPaymentsProcessor:
     # 3. BUYER QUOTE REQUEST PROCESS
     ###################################################################################################
 
+    @traced('open_payments.request_quote')
     def request_quote(self, *, incoming_payment_id: str | AnyUrl) -> Quote:
         """TO THE BUYER"""
         # Request a grant
@@ -193,6 +198,7 @@ class OpenPaymentsProcessor:
     # 4. REQUEST BUYER INTERACTIVE GRANT FOR PURCHASE
     ###################################################################################################
 
+    @traced('open_payments.get_purchase_endpoint')
     def get_purchase_endpoint(self, *, amount: int | str) -> str:
         """
         Implements the first half of the purchase process, requesting 'incoming-payment' and 'quote' grants,
@@ -252,6 +258,7 @@ class OpenPaymentsProcessor:
     # 5. COMPLETE OUTGOING PAYMENT
     ###################################################################################################
 
+    @traced('open_payments.complete_payment')
     def complete_payment(
         self, interact_ref: str, received_hash: str, pending_payment: PendingIncomingPaymentTransaction
     ) -> OutgoingPayment:
@@ -0,0 +1,44 @@
+"""
+SDK HTTP client that records call latency in the app's metrics.
+"""
+import time
+
+from httpx import HTTPStatusError, Request, Response
+
+from marketplace.metrics import OPEN_PAYMENTS_LATENCY
+from open_payments_sdk.http import HttpClient
+
+# Path segments naming an Open Payments operation; anything else is a wallet
+# address or resource id and must not become a label value
+OPEN_PAYMENTS_OPERATIONS = frozenset([
+    'incoming-payments', 'outgoing-payments', 'quotes', 'continue', 'token', 'complete', 'jwks.json',
+])
+
+
+def endpoint_label(request: Request) -> str:
+    """Low-cardinality name for the Open Payments endpoint ``request`` calls."""
+    for segment in reversed(request.url.path.split('/')):
+        if segment in OPEN_PAYMENTS_OPERATIONS:
+            return segment
+    # Grants are POSTed to the auth server root; wallet addresses are GET
+    return 'wallet-address' if request.method == 'GET' else 'grant'
+
+
+class MeteredHttpClient(HttpClient):
+    """``HttpClient`` that observes every call in OPEN_PAYMENTS_LATENCY."""
+
+    def send(self, request: Request) -> Response:
+        started = time.perf_counter()
+        status = 'error'
+        try:
+            response = super().send(request)
+            status = response.status_code
+            return response
+        except HTTPStatusError as e:
+            status = e.response.status_code
+            raise
+        finally:
+            OPEN_PAYMENTS_LATENCY.observe(
+                time.perf_counter() - started,
+                endpoint=endpoint_label(request), method=request.method, status=status,
+            )
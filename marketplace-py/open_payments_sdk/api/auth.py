@@ -6,6 +6,7 @@ from logging import Logger
 
 from ..gnap_utils.security import SecurityBase
 from ..http import HttpClient
+from ..instrumentation import validate
 from ..models.auth import AccessToken, Grant
 from ..models.auth import GrantContinueResponse, GrantRequest, InteractRef
 from ..utils.utils import get_default_covered_components, get_default_headers
@@ -40,7 +41,7 @@ class Grants(SecurityBase):
             request, ("content-type", "content-digest", "content-length", *get_default_covered_components())
         )
         response = self.http_client.send(request=request)
-        return Grant.model_validate(response.json())
+        return validate(Grant, response.json())
 
     def post_grant_continuation_request(
         self, interact_ref: InteractRef, continue_uri: str, access_token: str
@@ -57,7 +58,7 @@ class Grants(SecurityBase):
             ("content-type", "content-digest", "content-length", "authorization", *get_default_covered_components()),
         )
         response = self.http_client.send(request=request)
-        return GrantContinueResponse.model_validate(response.json())
+        return validate(GrantContinueResponse, response.json())
 
     def delete_grant(self, req_id: str, auth_server_endpoint: str, access_token: str) -> None:
         """
@@ -90,7 +91,7 @@ class AccessTokens(SecurityBase):
         request = self.http_client.build_request(method="POST", url=url, headers=req_headers)
         request = self.sign_request(request, ("authorization", *get_default_covered_components()))
         response = self.http_client.send(request=request)
-        return AccessToken.model_validate(response.json())
+        return validate(AccessToken, response.json())
 
     def delete_access_token(self, token_id: str, auth_server_endpoint: str, access_token: str) -> None:
         """
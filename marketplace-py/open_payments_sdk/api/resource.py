@@ -5,6 +5,7 @@ Resource Server Module
 from logging import Logger
 from ..gnap_utils.security import SecurityBase
 from ..http import HttpClient
+from ..instrumentation import validate
 from ..models.resource import (
     IncomingPayment,
     IncomingPaymentRequest,
@@ -46,7 +47,7 @@ class IncomingPayments(SecurityBase):
             ("content-type", "content-digest", "content-length", "authorization", *get_default_covered_components()),
         )
         response = self.http_client.send(request=request)
-        return IncomingPayment.model_validate(response.json())
+        return validate(IncomingPayment, response.json())
 
     def get_incoming_payments(
         self, query: PaymentListQuery, resource_server_endpoint: str, access_token: str
@@ -61,7 +62,7 @@ class IncomingPayments(SecurityBase):
         request = self.http_client.build_request(method="GET", url=url, headers=req_headers, params=query_params)
         request = self.sign_request(request, ("authorization", *get_default_covered_components()))
         response = self.http_client.send(request=request)
-        return PaginatedIncomingPayments.model_validate(response.json())
+        return validate(PaginatedIncomingPayments, response.json())
 
     def get_incoming_payment(
         self, payment_id: str, resource_server_endpoint: str, access_token: str
@@ -75,7 +76,7 @@ class IncomingPayments(SecurityBase):
         request = self.http_client.build_request(method="GET", url=url, headers=req_headers)
         request = self.sign_request(request, ("authorization", *get_default_covered_components()))
         response = self.http_client.send(request=request)
-        return IncomingPaymentResponse.model_validate(response.json())
+        return validate(IncomingPaymentResponse, response.json())
 
     def post_complete_incoming_payment(
         self, payment_id: str, resource_server_endpoint: str, access_token: str
@@ -89,7 +90,7 @@ class IncomingPayments(SecurityBase):
         request = self.http_client.build_request(method="POST", url=url, headers=req_headers)
         request = self.sign_request(request, ("authorization", *get_default_covered_components()))
         response = self.http_client.send(request=request)
-        return IncomingPayment.model_validate(response.json())
+        return validate(IncomingPayment, response.json())
 
 
 class OutgoingPayments(SecurityBase):
@@ -118,7 +119,7 @@ class OutgoingPayments(SecurityBase):
             ("content-type", "content-digest", "content-length", "authorization", *get_default_covered_components()),
         )
         response = self.http_client.send(request=request)
-        return OutgoingPayment.model_validate(response.json())
+        return validate(OutgoingPayment, response.json())
 
     def get_outgoing_payments(
         self, query: PaymentListQuery, resource_server_endpoint: str, access_token: str
@@ -133,7 +134,7 @@ class OutgoingPayments(SecurityBase):
         request = self.http_client.build_request(method="GET", url=url, headers=req_headers, params=query_params)
         response = request = self.sign_request(request, ("authorization", *get_default_covered_components()))
         self.http_client.send(request=request)
-        return PaginatedOutgoingPayments.model_validate(response.json())
+        return validate(PaginatedOutgoingPayments, response.json())
 
     def get_outgoing_payment(
         self, payment_id: str, resource_server_endpoint: str, access_token: str
@@ -147,7 +148,7 @@ class OutgoingPayments(SecurityBase):
         request = self.http_client.build_request(method="GET", url=url, headers=req_headers)
         request = self.sign_request(request, ("authorization", *get_default_covered_components()))
         response = self.http_client.send(request=request)
-        return OutgoingPayment.model_validate(response.json())
+        return validate(OutgoingPayment, response.json())
 
 
 class Quotes(SecurityBase):
@@ -174,7 +175,7 @@ class Quotes(SecurityBase):
             ("content-type", "content-digest", "content-length", "authorization", *get_default_covered_components()),
         )
         response = self.http_client.send(request=request)
-        return Quote.model_validate(response.json())
+        return validate(Quote, response.json())
 
     def get_quote(self, quote_id: str, resource_server_endpoint: str, access_token: str) -> Quote:
         """
@@ -186,4 +187,4 @@ class Quotes(SecurityBase):
         request = self.http_client.build_request(method="GET", url=url, headers=req_headers)
         request = self.sign_request(request, ("authorization", *get_default_covered_components()))
         response = self.http_client.send(request=request)
-        return Quote.model_validate(response.json())
+        return validate(Quote, response.json())
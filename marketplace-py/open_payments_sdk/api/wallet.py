@@ -1,4 +1,5 @@
 from ..http import HttpClient
+from ..instrumentation import validate
 from ..models.wallet import JsonWebKeySet, WalletAddress
 
 
@@ -14,7 +15,7 @@ class Wallet:
         """Get wallet address from address server"""
         request = self.http_client.build_request(method="GET", url=wallet_address_server_endpoint)
         response = self.http_client.send(request=request)
-        return WalletAddress.model_validate(response.json())
+        return validate(WalletAddress, response.json())
 
     def get_keys(self, wallet_address_server_endpoint: str) -> JsonWebKeySet:
         """Get keys from address server"""
@@ -22,4 +23,4 @@ class Wallet:
         url = f"{base_url}/jwks.json"
         request = self.http_client.build_request(method="GET", url=url)
         response = self.http_client.send(request=request)
-        return JsonWebKeySet.model_validate(response.json())
+        return validate(JsonWebKeySet, response.json())
@@ -8,6 +8,7 @@ from typing import Sequence
 from http_message_signatures import HTTPMessageSigner, algorithms
 from http_sf import ser
 from httpx import Request
+from ..instrumentation import traced
 from .hash import HashManager
 from .http_signatures import OPKeyResolver, PatchedHTTPSignatureComponentResolver
 from .keys import KeyManager
@@ -36,6 +37,7 @@ class SecurityBase:
         """
         return {"Authorization": f"GNAP {access_token}"}
 
+    @traced("open_payments.sign_request")
     def sign_request(self, message: Request, covered_component_ids: Sequence[str]) -> Request:
         """
         Prepare http signature headers
@@ -45,6 +47,7 @@ class SecurityBase:
         )
         return message
 
+    @traced("open_payments.set_content_digest")
     def set_content_digest(self, request: Request) -> Request:
         """
         Compute Digest
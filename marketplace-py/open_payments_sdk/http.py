@@ -2,6 +2,7 @@
 HTTP Client 
 """
 from httpx import Request, Response, Client
+from .instrumentation import span
 
 class HttpClient:
     """
@@ -37,7 +38,9 @@ class HttpClient:
         """
         Make an http request
         """ 
-        with Client(timeout=self.http_timeout) as client:
-            res = client.send(request=request)
-        res.raise_for_status()
+        attributes = {"http.method": request.method, "http.url": f"{request.url.host}{request.url.path}"}
+        with span("open_payments.http", kind="client", **attributes):
+            with Client(timeout=self.http_timeout) as client:
+                res = client.send(request=request)
+            res.raise_for_status()
         return res
@@ -0,0 +1,45 @@
+"""
+Optional tracing hooks for applications embedding the SDK.
+
+The SDK wraps HTTP calls, request signing and response validation in
+``span(name, **attributes)``, which does nothing until the application
+installs a span factory (a context manager factory with the same signature)
+with ``set_span_factory``.
+"""
+from contextlib import nullcontext
+from functools import wraps
+
+_span_factory = None
+
+
+def set_span_factory(factory):
+    """Install ``factory(name, **attributes)`` as the SDK's span factory (None to remove)."""
+    global _span_factory
+    _span_factory = factory
+
+
+def span(name: str, **attributes):
+    """Context manager timing a block as a span, if the application traces.
+
+    ``kind="client"`` marks spans around outgoing HTTP calls.
+    """
+    if _span_factory is None:
+        return nullcontext()
+    return _span_factory(name, **attributes)
+
+
+def traced(name: str):
+    """Decorator running the function inside ``span(name)``."""
+    def decorator(func):
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapped
+    return decorator
+
+
+def validate(model, data):
+    """``model.model_validate(data)`` inside a span naming the model."""
+    with span("open_payments.validate", model=model.__name__):
+        return model.model_validate(data)
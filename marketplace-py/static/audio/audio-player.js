@@ -12,7 +12,11 @@
     });
     
     function initializeAudioPlayers() {
-        // Auto-inject audio players for elements with data-audio-target attribute
+        // Auto-inject audio players for elements with data-audio-target attribute.
+        // Targets are resolved with one batch request instead of one request
+        // per speaker icon; like the single lookup, the server walks the
+        // viewer's audio language chain.
+        const items = [];
         document.querySelectorAll('[data-audio-target]').forEach(function(element) {
             const targetField = element.dataset.audioTarget;
             const languageCode = element.dataset.language || getCurrentLanguage();
@@ -32,9 +36,61 @@
             
             // Check if audio player already exists
             if (!element.querySelector('.audio-player-wrapper')) {
-                loadAudioPlayer(element, contentTypeId, objectId, targetField, languageCode);
+                items.push({
+                    container: element,
+                    content_type_id: contentTypeId,
+                    object_id: objectId,
+                    target_field: targetField,
+                    language_code: languageCode
+                });
             }
         });
+
+        if (items.length) {
+            loadAudioPlayers(items);
+        }
+    }
+
+    function loadAudioPlayers(items) {
+        fetch('/api/audio/snippets/batch/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            credentials: 'same-origin',
+            body: JSON.stringify({
+                targets: items.map(function(item) {
+                    return {
+                        content_type_id: item.content_type_id,
+                        object_id: item.object_id,
+                        target_field: item.target_field
+                    };
+                })
+            })
+        })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Batch audio lookup failed');
+                }
+                return response.json();
+            })
+            .then(data => {
+                data.results.forEach(function(result, index) {
+                    const item = items[index];
+                    if (result.available && result.audio_url) {
+                        injectAudioPlayer(item.container, result.audio_url, item.target_field, result.language_code);
+                    } else {
+                        injectAudioRequestButton(item.container, item.content_type_id, item.object_id, item.target_field, item.language_code);
+                    }
+                });
+            })
+            .catch(() => {
+                // Fall back to one lookup per target
+                items.forEach(function(item) {
+                    loadAudioPlayer(item.container, item.content_type_id, item.object_id, item.target_field, item.language_code);
+                });
+            });
     }
     
     function loadAudioPlayer(container, contentTypeId, objectId, targetField, languageCode) {
@@ -0,0 +1,122 @@
+/**
+ * Bulk application triage for the job detail page
+ * Posts the selected applications to the triage endpoint and applies the
+ * returned JSON diff in place instead of reloading the whole page
+ */
+
+(function() {
+    'use strict';
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const form = document.getElementById('triage-applications-form');
+        if (!form) {
+            return;
+        }
+
+        const selectAll = document.getElementById('triage-select-all');
+        const statusLine = document.getElementById('triage-status');
+
+        function checkboxes() {
+            return document.querySelectorAll('input[name="application_ids"][form="triage-applications-form"]');
+        }
+
+        if (selectAll) {
+            selectAll.addEventListener('change', function() {
+                checkboxes().forEach(function(box) {
+                    box.checked = selectAll.checked;
+                });
+            });
+        }
+
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+
+            const submitter = e.submitter;
+            const formData = new FormData(form);
+            if (submitter && submitter.name) {
+                formData.set(submitter.name, submitter.value);
+            }
+            if (!formData.getAll('application_ids').length) {
+                return;
+            }
+
+            const buttons = form.querySelectorAll('button[type="submit"]');
+            buttons.forEach(function(button) { button.disabled = true; });
+
+            fetch(form.action, {
+                method: 'POST',
+                headers: {
+                    'Accept': 'application/json',
+                    'X-CSRFToken': formData.get('csrfmiddlewaretoken')
+                },
+                body: formData,
+                credentials: 'same-origin'
+            })
+            .then(function(response) {
+                return response.json().then(function(data) {
+                    return { ok: response.ok, data: data };
+                });
+            })
+            .then(function(result) {
+                if (!result.ok) {
+                    statusLine.textContent = result.data.error || '';
+                    return;
+                }
+                applyDiff(result.data);
+            })
+            .catch(function() {
+                // Fall back to a normal form post (submit() drops the clicked button)
+                const actionInput = document.createElement('input');
+                actionInput.type = 'hidden';
+                actionInput.name = 'action';
+                actionInput.value = formData.get('action');
+                form.appendChild(actionInput);
+                form.submit();
+            })
+            .finally(function() {
+                buttons.forEach(function(button) { button.disabled = false; });
+            });
+        });
+
+        function currentSelectedCount() {
+            const element = document.querySelector('[data-triage-count="selected"]');
+            return element ? parseInt(element.textContent, 10) || 0 : 0;
+        }
+
+        function applyDiff(diff) {
+            // A phase change, or gaining/losing the first approved applicant,
+            // changes which sections (e.g. Start Contract) the page shows
+            const hadSelected = currentSelectedCount() > 0;
+            if (diff.transition || hadSelected !== (diff.counts.selected > 0)) {
+                window.location.reload();
+                return;
+            }
+
+            const label = form.dataset['label' + diff.status.charAt(0).toUpperCase() + diff.status.slice(1)];
+            diff.changed.forEach(function(change) {
+                const card = document.querySelector('.application-card[data-application-id="' + change.id + '"]');
+                if (!card) {
+                    return;
+                }
+                card.dataset.status = change.to;
+                const pill = card.querySelector('[data-application-status]');
+                if (pill) {
+                    pill.className = 'status-pill status-' + change.to;
+                    pill.textContent = label || change.to;
+                }
+            });
+
+            Object.keys(diff.counts).forEach(function(status) {
+                document.querySelectorAll('[data-triage-count="' + status + '"]').forEach(function(element) {
+                    element.textContent = diff.counts[status];
+                });
+            });
+
+            checkboxes().forEach(function(box) { box.checked = false; });
+            if (selectAll) {
+                selectAll.checked = false;
+            }
+            statusLine.textContent = diff.changed.length + ' ✓';
+        }
+    });
+})();
@@ -1,9 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
+from utilities.dirty_fields import DirtyFieldsMixin
 
 
-class User(AbstractUser):
+class User(DirtyFieldsMixin, AbstractUser):
     """Custom user model with wallet and language support."""
     
     ROLE_CHOICES = [
@@ -0,0 +1,132 @@
+"""
+Snapshot-based dirty field tracking for Django models.
+
+Usage:
+    class MyModel(DirtyFieldsMixin, models.Model):
+        ...
+
+    obj = MyModel.objects.get(pk=1)
+    obj.title = 'New'
+    obj.get_dirty_fields()   # {'title': 'Old'}
+    obj.save()               # UPDATE ... SET title, updated_at only
+"""
+from copy import deepcopy
+
+from django.db import router
+from django.db.models.signals import post_save, pre_save
+from django.db.models.fields.files import FieldFile
+
+
+class DirtyFieldsMixin:
+    """
+    Track which concrete fields changed since the instance was loaded or saved.
+
+    A snapshot of every loaded column is taken in ``from_db`` and refreshed
+    after each ``save``/``refresh_from_db``. ``save()`` without explicit
+    ``update_fields`` then writes only the changed columns (plus ``auto_now``
+    fields). A save with nothing changed writes nothing but still sends
+    ``pre_save``/``post_save``; if the row has been deleted meanwhile, the
+    save inserts it again like ``Model.save``. Saves of new instances or with
+    explicit ``update_fields`` are plain ``Model.save`` calls.
+    """
+
+    _dirty_snapshot = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.reset_dirty_fields()
+        return instance
+
+    def _tracked_value(self, field):
+        value = self.__dict__.get(field.attname)
+        if isinstance(value, FieldFile):
+            # Uncommitted uploads always count as a change
+            return value.name if value._committed else object()
+        if isinstance(value, (dict, list)):
+            return deepcopy(value)
+        return value
+
+    def reset_dirty_fields(self, fields=None):
+        """Mark ``fields`` (names or attnames; default: all loaded fields) as clean."""
+        if self._dirty_snapshot is None or fields is None:
+            self._dirty_snapshot = {}
+            fields = None
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue  # deferred
+            if fields is None or field.name in fields or field.attname in fields:
+                self._dirty_snapshot[field.attname] = self._tracked_value(field)
+
+    def get_dirty_fields(self, fields=None):
+        """
+        Return ``{field_name: original_value}`` for changed fields.
+
+        Unsaved instances report every loaded field as dirty. ``fields``
+        restricts the check (e.g. to a save's ``update_fields``).
+        """
+        dirty = {}
+        snapshot = self._dirty_snapshot
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue
+            if fields is not None and field.name not in fields and field.attname not in fields:
+                continue
+            if self._state.adding or snapshot is None or field.attname not in snapshot:
+                dirty[field.name] = None
+                continue
+            original = snapshot[field.attname]
+            if self._tracked_value(field) != original:
+                dirty[field.name] = original
+        return dirty
+
+    def is_dirty(self, *fields):
+        """True if any of ``fields`` (default: any field) changed."""
+        return bool(self.get_dirty_fields(fields or None))
+
+    def save(self, *args, **kwargs):
+        # Model.save(force_insert, force_update, using, update_fields) may
+        # still be called positionally
+        update_fields = kwargs.get('update_fields', args[3] if len(args) > 3 else None)
+        force_insert = kwargs.get('force_insert', args[0] if args else False)
+        if (
+            update_fields is not None
+            or force_insert
+            or self._state.adding
+            or self._dirty_snapshot is None
+        ):
+            super().save(*args, **kwargs)
+            self.reset_dirty_fields(update_fields)
+            return
+
+        using = kwargs.get('using', args[2] if len(args) > 2 else None) or router.db_for_write(type(self), instance=self)
+        dirty = self.get_dirty_fields()
+        if not dirty:
+            # Nothing to write, but receivers (e.g. cache invalidation) still
+            # hear about the save
+            self._send_save_signals(using)
+            return
+
+        if not type(self)._base_manager.using(using).filter(pk=self.pk).exists():
+            # The row is gone: a plain save inserts it again
+            super().save(*args, **kwargs)
+            self.reset_dirty_fields()
+            return
+
+        auto_now = [
+            f.name for f in self._meta.concrete_fields
+            if getattr(f, 'auto_now', False) and f.name not in dirty
+        ]
+        super().save(*args[:3], **{**kwargs, 'update_fields': [*dirty, *auto_now]})
+        self.reset_dirty_fields()
+
+    def _send_save_signals(self, using):
+        """The signals ``Model.save`` would send for a save that wrote nothing."""
+        sender = type(self)
+        pre_save.send(sender=sender, instance=self, raw=False, using=using, update_fields=frozenset())
+        post_save.send(sender=sender, instance=self, created=False, raw=False, using=using, update_fields=frozenset())
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        fields = kwargs.get('fields') or (args[1] if len(args) > 1 else None)
+        self.reset_dirty_fields(fields)